@@ -2,6 +2,7 @@
 
 # Built-in imports
 import json
+import multiprocessing as mp
 import shutil
 from pathlib import Path
 import time
@@ -13,6 +14,13 @@ import sys
 from ad_miner.sources.modules import logger, utils, generic_formating, main_page
 from ad_miner.sources.modules.neo4j_class import Neo4j, pre_request
 from ad_miner.sources.modules import controls
+from ad_miner.sources.modules.assets import ASSET_FOLDERS, sync_assets
+from ad_miner.sources.modules.profiler_class import profiler
+from ad_miner.sources.modules.graph_class import Graph
+from ad_miner.sources.modules.graph_store_class import graph_store
+from ad_miner.sources.modules.grid_class import Grid
+from ad_miner.sources.modules.page_writer_class import page_writer
+from ad_miner.sources.modules.report_bundle_class import report_bundle
 from ad_miner.sources.modules.common_analysis import (
     rating_color,
     generateDomainMapTrust,
@@ -35,6 +43,8 @@ from ad_miner.sources.modules.common_analysis import (
 
 # Constants
 SOURCES_DIRECTORY = Path(__file__).parent / "sources"
+# Results of the controls, saved in the render folder for --only_controls
+CONTROLS_STATE_FILE = "controls_state.json"
 
 
 # Catch ctrl-c correctly
@@ -79,6 +89,12 @@ def populate_data_and_cache(neo4j: Neo4j) -> dict:
         requests_count = requests_count + 1
         print(f"[{requests_count}/{nb_requests}] ", end="")
         req = neo4j.all_requests[request_key]
+        if is_selective(neo4j.arguments):
+            # Only the selected requests are run again, the others come from
+            # the cache of the previous run
+            neo4j.cache_enabled = request_key not in (
+                neo4j.arguments.only_requests or []
+            )
         if not config_data.get(request_key) or config_data[request_key] == "true":
             try:
                 neo4j.process_request(neo4j, request_key)
@@ -92,6 +108,14 @@ def populate_data_and_cache(neo4j: Neo4j) -> dict:
 
     logger.print_success("Requests finished !")
 
+    # Free the neo4j memory used by the shared GDS projections
+    neo4j.dropGdsProjections()
+
+    # Execution statistics of every request and chunk
+    neo4j.telemetry.write(
+        Path(f"render_{neo4j.arguments.cache_prefix}") / "perf.json"
+    )
+
     requests_results = {}
     for request_key, value in neo4j.all_requests.items():
         try:
@@ -106,17 +130,43 @@ def populate_data_and_cache(neo4j: Neo4j) -> dict:
     return requests_results
 
 
+def is_selective(arguments) -> bool:
+    """Whether only some requests and controls of an existing report are
+    generated again (--only_controls / --only_requests)."""
+    return arguments.only_controls is not None or arguments.only_requests is not None
+
+
 def prepare_render(arguments) -> None:
     """Prepares the render folder by copying necessary assets.
 
+    The assets already up to date in the render folder are left as they
+    are (see assets.sync_assets).
+
     Args:
         arguments: Parsed command line arguments.
     """
 
     folder_name = Path(f"render_{arguments.cache_prefix}")
 
+    if is_selective(arguments):
+        # The report is updated in place
+        if not (folder_name / CONTROLS_STATE_FILE).exists():
+            logger.print_error(
+                f"No complete report found in {folder_name}: run AD Miner without "
+                "--only_controls and --only_requests first."
+            )
+            sys.exit(-1)
+        # The main page appends the hexagons to main_circle.js
+        sync_assets(folder_name, arguments.assets_dir, arguments.assets_link)
+        return
+
+    # Files of the previous report, except its assets
     if folder_name.exists():
-        shutil.rmtree(folder_name)
+        for entry in folder_name.iterdir():
+            if entry.is_symlink() or not entry.is_dir():
+                entry.unlink()
+            elif entry.name not in ASSET_FOLDERS:
+                shutil.rmtree(entry)
 
     folder_name.mkdir(parents=True, exist_ok=True)
     (folder_name / "csv").mkdir()
@@ -127,19 +177,250 @@ def prepare_render(arguments) -> None:
         "<script>window.location.href = './html/index.html'</script>"
     )
 
-    # Copy assets
-    subpaths = {
-        "css": SOURCES_DIRECTORY / "html" / "bootstrap" / "css",
-        "js": SOURCES_DIRECTORY / "html" / "bootstrap" / "js",
-        "icons": SOURCES_DIRECTORY / "html" / "bootstrap" / "icons",
-        "assets": SOURCES_DIRECTORY / "html" / "assets",
+    sync_assets(folder_name, arguments.assets_dir, arguments.assets_link)
+
+
+def run_control(control_class, arguments, requests_results) -> dict:
+    """Runs a control and returns what the main page needs from it.
+
+    Args:
+        control_class: Control class registered in controls.control_list.
+        arguments: Parsed command line arguments.
+        requests_results (dict): Results of the requests.
+
+    Returns:
+        dict: Key, category, descriptions, rating and data of the control,
+        or the traceback of its error.
+    """
+    t_start = time.time()
+    result = {"name": control_class.__name__, "error": None}
+    control = None
+    requests_view = controls.RequestsView(
+        requests_results, control_class.consumed_requests
+    )
+    if arguments.check_controls:
+        checked_requests = control_class.consumed_requests or list(requests_results)
+        fingerprints = controls.requests_fingerprints(requests_results, checked_requests)
+    try:
+        with profiler.phase("control." + control_class.__name__ + ".__init__"):
+            control = control_class(arguments, requests_view)
+        logger.print_debug(str("Generating control " + control.control_key))
+        with profiler.phase("control." + control_class.__name__ + ".run"):
+            control.run()
+
+        result["name_description"] = control.name_description
+        result["rating"] = control.get_rating()
+        result["data"] = control.data
+    except Exception:
+        result["error"] = traceback.format_exc()
+
+    if arguments.check_controls:
+        after = controls.requests_fingerprints(requests_results, fingerprints)
+        result["mutated_requests"] = sorted(
+            key for key in fingerprints if after.get(key) != fingerprints[key]
+        )
+        result["undeclared_requests"] = sorted(requests_view.undeclared)
+
+    if control is not None:
+        try:
+            result["control_key"] = control.control_key
+            result["category"] = control.category
+            result["azure_or_onprem"] = control.azure_or_onprem
+            result["description"] = {
+                "title": control.title,
+                "description": control.description,
+                "interpretation": control.interpretation,
+                "risk": control.risk,
+                "poa": control.poa,
+            }
+        except AttributeError:
+            result["error"] = (result["error"] or "") + traceback.format_exc()
+            result.pop("control_key", None)
+
+    result["time"] = round(time.time() - t_start, 2)
+    return result
+
+
+# Requests results and arguments inherited by the forked control workers
+_control_workers_context = {}
+
+
+def run_control_in_worker(index: int) -> dict:
+    result = run_control(
+        _control_workers_context["control_classes"][index],
+        _control_workers_context["arguments"],
+        _control_workers_context["requests_results"],
+    )
+    # The worker can be stopped once the results are returned
+    page_writer.join()
+    # Pages written by the worker (--single_page)
+    result["report_pages"] = report_bundle.flush()
+    return result
+
+
+def run_controls(arguments, requests_results, control_classes):
+    """Runs the controls, in a pool of forked processes if --control_workers
+    is greater than 1. Controls only read the requests results and write
+    their own pages, so the workers share the requests results with the
+    main process (copy-on-write) instead of receiving a copy of them.
+
+    Yields:
+        dict: Result of each control (see run_control), in the order
+        of control_classes.
+    """
+    workers = arguments.control_workers
+    if workers > 1 and arguments.profile:
+        logger.print_warning("Controls are run serially to be profiled.")
+        workers = 1
+    if workers > 1 and "fork" not in mp.get_all_start_methods():
+        logger.print_warning(
+            "Controls are run serially: parallel controls need the fork start method."
+        )
+        workers = 1
+
+    if workers <= 1:
+        for control_class in control_classes:
+            yield run_control(control_class, arguments, requests_results)
+        return
+
+    _control_workers_context["arguments"] = arguments
+    _control_workers_context["requests_results"] = requests_results
+    _control_workers_context["control_classes"] = control_classes
+    # The workers must not inherit a data file or a page being written
+    report_bundle.flush()
+    page_writer.join()
+    with mp.get_context("fork").Pool(workers) as pool:
+        for result in pool.imap(
+            run_control_in_worker, range(len(control_classes)), chunksize=1
+        ):
+            report_bundle.index.update(result.pop("report_pages"))
+            yield result
+    _control_workers_context.clear()
+
+
+def register_control(
+    result,
+    dico_category,
+    DESCRIPTION_MAP,
+    dico_name_description,
+    data_rating,
+    dico_data,
+) -> None:
+    """Adds the result of a control to the legacy dicts used by the main page."""
+    if result.get("mutated_requests"):
+        logger.print_error(
+            f"Control {result['name']} modified the results of the requests "
+            + ", ".join(result["mutated_requests"])
+        )
+    if result.get("undeclared_requests"):
+        logger.print_warning(
+            f"Control {result['name']} read requests missing in its consumed_requests: "
+            + ", ".join(result["undeclared_requests"])
+        )
+    if result["error"] is None:
+        control_key = result["control_key"]
+        dico_category[result["category"]].append(control_key)
+        DESCRIPTION_MAP[control_key] = result["description"]
+        dico_name_description[control_key] = result["name_description"]
+        data_rating[result["azure_or_onprem"]][result["rating"]].append(control_key)
+        dico_data["value"][control_key] = result["data"]
+        logger.print_warning(str("Done in " + str(result["time"]) + "s"))
+        return
+
+    logger.print_error("Error while running the following control: ")
+    logger.print_error(result.get("control_key", result["name"]))
+    logger.print_error(result["error"])
+
+    if "control_key" not in result:
+        logger.print_error("Error while trying to add the control as disabled.")
+        return
+    control_key = result["control_key"]
+    dico_category[result["category"]].append(control_key)
+    dico_name_description[control_key] = (
+        f"{result['description']['title']} analysis failed (control crashed)."
+    )
+    data_rating[result["azure_or_onprem"]][-1].append(control_key)
+    DESCRIPTION_MAP[control_key] = result["description"]
+
+
+def selected_controls(arguments, state, request_keys) -> list:
+    """Returns the controls to run again in selective mode: the controls of
+    --only_controls, and the controls consuming the requests of
+    --only_requests or the results derived from them by compute_common_cache.
+
+    Args:
+        arguments: Parsed command line arguments.
+        state (dict): Controls state of the previous run.
+        request_keys: Keys of the requests of requests.json.
+
+    Returns:
+        list: Control classes, in the order of controls.control_list.
+    """
+    only_controls = set(arguments.only_controls or [])
+    only_requests = set(arguments.only_requests or [])
+
+    unknown_controls = only_controls - set(state["control_keys"].values())
+    if unknown_controls:
+        logger.print_warning(
+            "Controls not found in the previous report: " + ", ".join(unknown_controls)
+        )
+
+    unknown_requests = only_requests - set(request_keys)
+    if unknown_requests:
+        logger.print_warning(
+            "Requests not found in requests.json: " + ", ".join(unknown_requests)
+        )
+
+    selection = []
+    for control_class in controls.control_list:
+        control_key = state["control_keys"].get(
+            control_class.__name__, control_class.__module__.split(".")[-1]
+        )
+        consumed_requests = control_class.consumed_requests
+        if control_key in only_controls:
+            selection.append(control_class)
+        elif only_requests and (
+            consumed_requests is None
+            or any(
+                key in only_requests or key not in request_keys
+                for key in consumed_requests
+            )
+        ):
+            selection.append(control_class)
+    return selection
+
+
+def load_controls_state(arguments) -> dict:
+    """Loads the results of the controls of the previous run, saved by
+    save_controls_state in the render folder."""
+    state_file = Path(f"render_{arguments.cache_prefix}") / CONTROLS_STATE_FILE
+    state = json.loads(state_file.read_text(encoding="utf-8"))
+    # JSON keys are strings
+    state["data_rating"] = {
+        location: {int(rating): keys for rating, keys in ratings.items()}
+        for location, ratings in state["data_rating"].items()
     }
+    return state
+
+
+def save_controls_state(arguments, state) -> None:
+    state_file = Path(f"render_{arguments.cache_prefix}") / CONTROLS_STATE_FILE
+    state_file.write_text(json.dumps(state), encoding="utf-8")
 
-    for sub, src_path in subpaths.items():
-        shutil.copytree(src_path, folder_name / sub)
 
-    for js_file in (SOURCES_DIRECTORY / "js").iterdir():
-        shutil.copy2(js_file, folder_name / "js")
+def forget_control(control_key, state) -> None:
+    """Removes a control from the legacy dicts, before it is registered
+    again with its new result."""
+    for category in state["dico_category"].values():
+        if control_key in category:
+            category.remove(control_key)
+    for ratings in state["data_rating"].values():
+        for rating in ratings.values():
+            if control_key in rating:
+                rating.remove(control_key)
+    state["DESCRIPTION_MAP"].pop(control_key, None)
+    state["dico_name_description"].pop(control_key, None)
+    state["dico_data"]["value"].pop(control_key, None)
 
 
 def main() -> None:
@@ -163,6 +444,19 @@ def main() -> None:
 
     prepare_render(arguments)
 
+    if arguments.profile:
+        profiler.start(Path(f"render_{arguments.cache_prefix}") / "profile")
+
+    if arguments.graph_store:
+        graph_store.start(Path(f"render_{arguments.cache_prefix}") / "store")
+
+    if arguments.single_page:
+        report_bundle.start(Path(f"render_{arguments.cache_prefix}") / "pages")
+
+    Grid.chunk_rows = arguments.grid_chunk_rows
+    Graph.summary_nodes = arguments.graph_summary_nodes
+    Graph.compute_layout = arguments.graph_layout
+
     neo4j_version, extract_date, total_objects, number_relations, boolean_azure = pre_request(
         arguments
     )
@@ -247,88 +541,95 @@ def main() -> None:
 
     DESCRIPTION_MAP: dict[str, dict[str, str]] = {}
 
-    # Generate general pages: map trusts, users, computers, dc
+    # Control class name -> control key, to select controls in the next runs
+    control_keys: dict[str, str] = {}
+    control_classes = controls.control_list
+
+    if is_selective(arguments):
+        # Update the report of the previous run
+        state = load_controls_state(arguments)
+        dico_name_description = state["dico_name_description"]
+        data_rating = state["data_rating"]
+        dico_data = state["dico_data"]
+        dico_category = state["dico_category"]
+        DESCRIPTION_MAP = state["DESCRIPTION_MAP"]
+        control_keys = state["control_keys"]
+        control_classes = selected_controls(arguments, state, neo4j.all_requests)
+        logger.print_magenta(f"{len(control_classes)} controls to generate again")
 
-    generateDomainMapTrust(requests_results, arguments)
-    genNumberOfDCPage(requests_results, arguments)
-    genUsersListPage(requests_results, arguments)
-    genAllGroupsPage(requests_results, arguments)
-    generateComputersListPage(requests_results, arguments)
-    generateADCSListPage(requests_results, arguments)
-    genAzureTenants(requests_results, arguments)
-    genAzureUsers(requests_results, arguments)
-    genAzureAdmin(requests_results, arguments)
-    genAzureGroups(requests_results, arguments)
-    genAzureVM(requests_results, arguments)
-    genAzureDevices(requests_results, arguments)
-    genAzureApps(requests_results, arguments)
+    # Generate general pages: map trusts, users, computers, dc
+    # (they only depend on the requests)
+    if not is_selective(arguments) or arguments.only_requests:
+        with profiler.phase("general_pages"):
+            generateDomainMapTrust(requests_results, arguments)
+            genNumberOfDCPage(requests_results, arguments)
+            genUsersListPage(requests_results, arguments)
+            genAllGroupsPage(requests_results, arguments)
+            generateComputersListPage(requests_results, arguments)
+            generateADCSListPage(requests_results, arguments)
+            genAzureTenants(requests_results, arguments)
+            genAzureUsers(requests_results, arguments)
+            genAzureAdmin(requests_results, arguments)
+            genAzureGroups(requests_results, arguments)
+            genAzureVM(requests_results, arguments)
+            genAzureDevices(requests_results, arguments)
+            genAzureApps(requests_results, arguments)
 
     # Run controls, generate secondary pages, and populate legacy dicts
-    for c in controls.control_list:
-        t_start = time.time()
-        try:
-            control = c(arguments, requests_results)
-            logger.print_debug(str("Generating control " + control.control_key))
-            control.run()
-
-            dico_category[control.category].append(control.control_key)
-
-            DESCRIPTION_MAP[control.control_key] = {
-                "title": control.title,
-                "description": control.description,
-                "interpretation": control.interpretation,
-                "risk": control.risk,
-                "poa": control.poa,
-            }
-
-            dico_name_description[control.control_key] = control.name_description
-
-            data_rating[control.azure_or_onprem][control.get_rating()].append(
-                control.control_key
-            )
-
-            dico_data["value"][control.control_key] = control.data
+    for result in run_controls(arguments, requests_results, control_classes):
+        if "control_key" in result:
+            control_keys[result["name"]] = result["control_key"]
+            if is_selective(arguments):
+                forget_control(result["control_key"], state)
+        register_control(
+            result,
+            dico_category,
+            DESCRIPTION_MAP,
+            dico_name_description,
+            data_rating,
+            dico_data,
+        )
 
-            d = round(time.time() - t_start, 2)
-            logger.print_warning(str("Done in " + str(d) + "s"))
-        except Exception as e:
-            logger.print_error("Error while running the following control: ")
-            logger.print_error(control.control_key)
-            logger.print_error(e)
-            logger.print_error(traceback.format_exc())
-
-            try:
-                dico_category[control.category].append(control.control_key)
-                dico_name_description[control.control_key] = (
-                    f"{control.title} analysis failed (control crashed)."
-                )
-                data_rating[control.azure_or_onprem][-1].append(control.control_key)
-                DESCRIPTION_MAP[control.control_key] = {
-                    "title": control.title,
-                    "description": control.description,
-                    "interpretation": control.interpretation,
-                    "risk": control.risk,
-                    "poa": control.poa,
-                }
-            except Exception as e:
-                logger.print_error("Error while trying to add the control as disabled.")
-                logger.print_error(e)
-                logger.print_error(traceback.format_exc())
+    if is_selective(arguments):
+        # Keep the order of the hexagons of the previous run
+        order = {key: i for i, key in enumerate(control_keys.values())}
+        for keys in list(dico_category.values()) + [
+            keys for ratings in data_rating.values() for keys in ratings.values()
+        ]:
+            keys.sort(key=lambda key: order.get(key, len(order)))
 
     dico_rating_color = rating_color(data_rating)
 
-    main_page.render(
+    with profiler.phase("main_page.render"):
+        main_page.render(
+            arguments,
+            requests_results,
+            dico_data,
+            data_rating,
+            dico_name_description,
+            dico_rating_color,
+            dico_category,
+            DESCRIPTION_MAP,
+        )
+    report_bundle.stop()
+    page_writer.join()
+    save_controls_state(
         arguments,
-        requests_results,
-        dico_data,
-        data_rating,
-        dico_name_description,
-        dico_rating_color,
-        dico_category,
-        DESCRIPTION_MAP,
+        {
+            "control_keys": control_keys,
+            "dico_category": dico_category,
+            "DESCRIPTION_MAP": DESCRIPTION_MAP,
+            "dico_name_description": dico_name_description,
+            "data_rating": data_rating,
+            "dico_data": dico_data,
+        },
     )
     neo4j.close()
 
+    profiler.stop()
+
+    neo4j.telemetry.summary()
+
     logger.print_success(
         f"{utils.timer_format(time.time() - start)}! Program finished. Report generated in render_{arguments.cache_prefix}"
     )
@@ -1,39 +1,165 @@
-// This object is used by vis.js to retrieve node icon
-var icon_group_options = {};
+// Graph data written by Graph.render (graph_class.py), with one array per
+// attribute of the nodes and edges
+function decode_columns(columns) {
+  var keys = Object.keys(columns);
+  var rows = [];
+  var length = keys.length > 0 ? columns[keys[0]].length : 0;
+  for (var i = 0; i < length; i++) {
+    var row = {};
+    for (var j = 0; j < keys.length; j++) {
+      row[keys[j]] = columns[keys[j]][i];
+    }
+    rows.push(row);
+  }
+  return rows;
+}
+
+// Summary nodes of large graphs (see Graph.summarize), each standing for
+// start nodes with the same icon and the same edges, expanded on demand
+window.graph_summaries = {};
 
-var existing_attribute_strings = []
+if (window.graph_data !== undefined) {
+  window.data_nodes = decode_columns(window.graph_data.nodes);
+  window.data_edges = decode_columns(window.graph_data.edges);
+  for (var i = 0; i < window.data_nodes.length; i++) {
+    window.data_nodes[i].shape = 'image';
+  }
+  var summaries = window.graph_data.summaries || [];
+  for (var i = 0; i < summaries.length; i++) {
+    window.graph_summaries[summaries[i].id] = summaries[i];
+    window.data_nodes.find((node) => node.id == summaries[i].id).summary = true;
+  }
+  delete window.graph_data;
+
+  // The node of the link to the page is displayed with its own paths
+  var linked_node = parseInt(new URL(window.location.href).searchParams.get('node'));
+  for (var summary_id in window.graph_summaries) {
+    if (window.graph_summaries[summary_id].nodes.id.includes(linked_node)) {
+      expandSummaryData(parseInt(summary_id));
+    }
+  }
+}
+
+// Replaces a summary node by its nodes in data_nodes and data_edges,
+// and returns its nodes
+function expandSummaryData(summaryId) {
+  var summary = window.graph_summaries[summaryId];
+  delete window.graph_summaries[summaryId];
+  var members = decode_columns(summary.nodes);
+  var summary_node = data_nodes.find((node) => node.id == summaryId);
+
+  data_nodes = data_nodes.filter((node) => node.id != summaryId);
+  data_edges = data_edges.filter((edge) => edge.from != summaryId);
+  for (var i = 0; i < members.length; i++) {
+    members[i].shape = 'image';
+    if (summary_node.layer !== undefined) {
+      // Placed where the summary node was (see layeredPositioning)
+      members[i].layer = summary_node.layer;
+      members[i].order = summary_node.order + i / members.length;
+    }
+    data_nodes.push(members[i]);
+    for (var j = 0; j < summary.edges.to.length; j++) {
+      data_edges.push({
+        from: members[i].id,
+        to: summary.edges.to[j],
+        label: summary.edges.label[j],
+      });
+    }
+  }
+  return members;
+}
+
+// With --graph_store, the page only contains the keys of its paths
+// (graph_query), resolved with the records of the data files of the
+// report-wide store (graph_store_class.py):
+// nodes are [key, id, label, domain, instance, attributes]
+// and paths [key, node key, relation, key of the rest of the path]
+if (window.graph_query !== undefined) {
+  var store_nodes = {};
+  var store_paths = {};
+  for (var i = 0; i < window.graph_store_chunks.length; i++) {
+    var chunk = window.graph_store_chunks[i];
+    for (var j = 0; j < chunk[0].length; j++) {
+      store_nodes[chunk[0][j][0]] = chunk[0][j];
+    }
+    for (var j = 0; j < chunk[1].length; j++) {
+      store_paths[chunk[1][j][0]] = chunk[1][j];
+    }
+  }
+  delete window.graph_store_chunks;
+
+  window.data_nodes = [];
+  window.data_edges = [];
+  var store_node_ids = {};
+  var store_edges = {};
+  for (var i = 0; i < window.graph_query.length; i++) {
+    var cells = [];
+    var path_key = window.graph_query[i];
+    while (path_key !== null) {
+      cells.push(store_paths[path_key]);
+      path_key = cells[cells.length - 1][3];
+    }
+    for (var j = 0; j < cells.length; j++) {
+      var node = store_nodes[cells[j][1]];
+      if (store_node_ids[node[1]] === undefined) {
+        store_node_ids[node[1]] = true;
+        window.data_nodes.push({
+          id: node[1],
+          label: node[2],
+          domain: node[3],
+          instance: node[4],
+          position: j == 0 ? 'start' : j == cells.length - 1 ? 'end' : 'intermediate',
+          attributes: node[5].slice(),
+          shape: 'image',
+        });
+      }
+      if (j > 0) {
+        var from_id = store_nodes[cells[j - 1][1]][1];
+        var edge_key = from_id + '|' + node[1] + '|' + cells[j - 1][2];
+        if (store_edges[edge_key] === undefined) {
+          store_edges[edge_key] = true;
+          window.data_edges.push({ from: from_id, to: node[1], label: cells[j - 1][2] });
+        }
+      }
+    }
+  }
+}
 
-for (var i = 0; i < window.data_nodes.length; i++) {
+// This object is used by vis.js to retrieve node icon
+var icon_group_options = {};
 
-  // Creates a string to describe each nodes and its attribute
-  // to create the object that will contain each icon for vis.js
-  var node_attribute_string = "";
+// Sets the group of the nodes, and the icon of the new groups
+function setNodeGroups(group_nodes) {
+  for (var i = 0; i < group_nodes.length; i++) {
 
-  node_attribute_string = node_attribute_string.concat(window.data_nodes[i].instance);
+    // Creates a string to describe each nodes and its attribute
+    // to create the object that will contain each icon for vis.js
+    var node_attribute_string = "";
 
-  node_attribute_string = node_attribute_string.concat('_');
-  node_attribute_string = node_attribute_string.concat(window.data_nodes[i].position);
+    node_attribute_string = node_attribute_string.concat(group_nodes[i].instance);
 
-  window.data_nodes[i].attributes.sort();
-  for (var j = 0; j < window.data_nodes[i].attributes.length; j++) {
     node_attribute_string = node_attribute_string.concat('_');
-    node_attribute_string = node_attribute_string.concat(window.data_nodes[i].attributes[j]);
-  }
+    node_attribute_string = node_attribute_string.concat(group_nodes[i].position);
 
-  window.data_nodes[i].group = node_attribute_string;
+    group_nodes[i].attributes.sort();
+    for (var j = 0; j < group_nodes[i].attributes.length; j++) {
+      node_attribute_string = node_attribute_string.concat('_');
+      node_attribute_string = node_attribute_string.concat(group_nodes[i].attributes[j]);
+    }
 
-  if (!existing_attribute_strings.includes(node_attribute_string)) {
-    existing_attribute_strings.push(node_attribute_string);
-  }
-}
+    group_nodes[i].group = node_attribute_string;
 
-for (var i = 0; i < existing_attribute_strings.length; i++) {
-  icon_group_options[existing_attribute_strings[i]] = {
-    image: get_image(existing_attribute_strings[i]),
-    shadow: { enabled: true }
+    if (icon_group_options[node_attribute_string] === undefined) {
+      icon_group_options[node_attribute_string] = {
+        image: get_image(node_attribute_string),
+        shadow: { enabled: true }
+      }
+    }
   }
 }
 
+setNodeGroups(window.data_nodes);
+
 //hierarchical_options
 var options = {
   layout: {
@@ -71,27 +197,33 @@ window.highlightActive = false;
 // In the copy variables, we store the data of the full graph
 // while the other variables (allNodes, allEdges) will only store the data of the current view.
 
-dico_edges_children = {};
-dico_edges_children_inverted = {};
+// Sets the children and the parents of the nodes, and the nodes by id
+function setNodeIndexes() {
+  dico_edges_children = {};
+  dico_edges_children_inverted = {};
 
-for (var i = 0; i < data_edges.length; i++) {
-  if (dico_edges_children[data_edges[i].from] === undefined) {
-    dico_edges_children[data_edges[i].from] = [data_edges[i].to];
-  } else {
-    dico_edges_children[data_edges[i].from].push(data_edges[i].to);
+  for (var i = 0; i < data_edges.length; i++) {
+    if (dico_edges_children[data_edges[i].from] === undefined) {
+      dico_edges_children[data_edges[i].from] = [data_edges[i].to];
+    } else {
+      dico_edges_children[data_edges[i].from].push(data_edges[i].to);
+    }
+
+    if (dico_edges_children_inverted[data_edges[i].to] === undefined) {
+      dico_edges_children_inverted[data_edges[i].to] = [data_edges[i].from];
+    } else {
+      dico_edges_children_inverted[data_edges[i].to].push(data_edges[i].from);
+    }
   }
 
-  if (dico_edges_children_inverted[data_edges[i].to] === undefined) {
-    dico_edges_children_inverted[data_edges[i].to] = [data_edges[i].from];
-  } else {
-    dico_edges_children_inverted[data_edges[i].to].push(data_edges[i].from);
+  dico_nodes = {};
+  for (var i = 0; i < data_nodes.length; i++) {
+    dico_nodes[data_nodes[i].id] = data_nodes[i];
   }
 }
 
 var dico_nodes = {};
-for (var i = 0; i < data_nodes.length; i++) {
-  dico_nodes[data_nodes[i].id] = data_nodes[i];
-}
+setNodeIndexes();
 
 var url = new URL(window.location.href);
 var node_parameter = url.searchParams.get('node');
@@ -189,6 +321,11 @@ function startNetwork(data, opts) {
 
   network.on('click', neighbourhoodHighlight);
   network.on('click', hideSearchResults);
+  network.on('doubleClick', function (params) {
+    if (params.nodes.length > 0 && window.graph_summaries[params.nodes[0]] !== undefined) {
+      expandSummary(params.nodes[0]);
+    }
+  });
   //bindEvents(); // attach context menu to new network object
 
   // let array_position = percentage_path_passing_through_nodes();
@@ -467,7 +604,39 @@ function selection_end_node(data_nodes) {
   return 0;
 }
 
+// With --graph_layout, the layer of the nodes and their order in their
+// layer are computed when the report is generated (graph_layout.py): the
+// nodes of the view are placed layer by layer, in that order
+function layeredPositioning(allNodes, horizontalMode) {
+  var layers = {};
+  for (nodeId in allNodes) {
+    if (allNodes[nodeId].layer === undefined) {
+      return false;
+    }
+    if (layers[allNodes[nodeId].layer] === undefined) {
+      layers[allNodes[nodeId].layer] = [];
+    }
+    layers[allNodes[nodeId].layer].push(allNodes[nodeId]);
+  }
+  // Same spacing as dagre (node size and 50px between nodes and ranks)
+  var rank_size = horizontalMode ? -150 : 300;
+  var node_size = 70;
+  for (var layer in layers) {
+    var layer_nodes = layers[layer].sort((a, b) => a.order - b.order);
+    for (var i = 0; i < layer_nodes.length; i++) {
+      var rank = layer * rank_size;
+      var offset = (i - (layer_nodes.length - 1) / 2) * node_size;
+      layer_nodes[i].x = horizontalMode ? offset : rank;
+      layer_nodes[i].y = horizontalMode ? rank : offset;
+    }
+  }
+  return true;
+}
+
 function dagrePositioning(allNodes, horizontalMode) {
+  if (layeredPositioning(allNodes, horizontalMode)) {
+    return allNodes;
+  }
   if (window.computedHorizGraph && horizontalMode) {
     //restore the positions of the nodes and edges from the hidden attributes
     for (nodeId in allNodes) {
@@ -1598,6 +1767,20 @@ function openCluster(nodeId) {
   updateGraph(nodeId);
 }
 
+// Displays the nodes of a summary node instead of the summary node
+function expandSummary(nodeId) {
+  // Remove context menu
+  if (typeof ctxmenu !== 'undefined') {
+    ctxmenu.outerHTML = '';
+  }
+
+  setNodeGroups(expandSummaryData(nodeId));
+  setNodeIndexes();
+  window.computedHorizGraph = false;
+  window.computedVertGraph = false;
+  initNetwork(data_nodes, data_edges);
+}
+
 function closeClusterComplete(nodeId) {
   // Remove context menu
   if (typeof ctxmenu !== 'undefined') {
@@ -1754,6 +1937,13 @@ function bindRightClick() {
         menu.innerHTML = `<div class="list-group">
                 <a class='list-group-item list-group-item-action disabled'>No Action</a>
                 </div>`;
+      } else if (allNodescopy[lastSelectedNode].summary) {
+        menu.innerHTML =
+          `<div class="list-group">
+                  <a class='list-group-item list-group-item-action' onclick=expandSummary(` +
+          lastSelectedNode +
+          `)>Expand nodes</a>
+                  </div>`;
       } else {
         if (
           allNodescopy[lastSelectedNode].clusterType == 'complete' ||
@@ -0,0 +1,74 @@
+// Pages of the report generated with --single_page: report.html?page=<name>
+// loads the data file of the page (../pages/<hash>.js, see index.js) and
+// writes it, as if <name>.html had been opened.
+
+var report_page_name = new URL(window.location.href).searchParams.get('page');
+
+// Returns the link to report.html for the links to the pages of the report
+function reportLink(href) {
+  if (!href || href.startsWith('#') || typeof report_index === 'undefined') {
+    return href;
+  }
+  var url = new URL(href, window.location.href);
+  var directory = new URL('.', window.location.href);
+  if (url.origin !== directory.origin || !url.pathname.startsWith(directory.pathname)) {
+    return href;
+  }
+  var file_name = decodeURIComponent(url.pathname.slice(directory.pathname.length));
+  var name = file_name.slice(0, -'.html'.length);
+  if (!file_name.endsWith('.html') || !(name in report_index.pages)) {
+    return href;
+  }
+  var query = url.search ? '&' + url.search.slice(1) : '';
+  return 'report.html?page=' + encodeURIComponent(name) + query + url.hash;
+}
+
+// Links are rewritten when they are followed, as grids and graphs
+// create them after the page is loaded
+function reportFollowLink(event) {
+  if (!event.target.closest) {
+    return;
+  }
+  var link = event.target.closest('a[href]');
+  if (link === null) {
+    return;
+  }
+  var href = link.getAttribute('href');
+  var report_href = reportLink(href);
+  if (report_href !== href) {
+    link.setAttribute('href', report_href);
+  }
+}
+
+['click', 'auxclick', 'contextmenu'].forEach((type) => {
+  document.addEventListener(type, reportFollowLink, true);
+});
+
+function reportLoadPage() {
+  if (report_page_name === null || !(report_page_name in report_index.pages)) {
+    return;
+  }
+  document.write(
+    '<script type="text/javascript" src="../pages/' +
+      report_index.pages[report_page_name] +
+      '"></scr' +
+      'ipt>',
+  );
+}
+
+// Writes the template of the page filled with its descriptions (see
+// Page.renderPage), then its components
+function reportWritePage() {
+  if (typeof report_pages === 'undefined' || !(report_page_name in report_pages)) {
+    document.write('<p>Page not found in the report.</p>');
+    return;
+  }
+  var page = report_pages[report_page_name];
+  var template = report_index.templates[page.template];
+  var values = [page.title, page.description, page.risk, page.poa];
+  var i = 0;
+  var header = template[0].replace(/%([s%])/g, (match, format) => {
+    return format === '%' ? '%' : values[i++];
+  });
+  document.write(header + page.body + template[1]);
+}
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from ad_miner.sources.modules import logger
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, JS_DIRECTORY
+
+# Folders of the render folder holding the assets of the report, and the
+# folders they come from (the js files of JS_DIRECTORY are added to js)
+ASSET_FOLDERS = {
+    "css": HTML_DIRECTORY / "bootstrap" / "css",
+    "js": HTML_DIRECTORY / "bootstrap" / "js",
+    "icons": HTML_DIRECTORY / "bootstrap" / "icons",
+    "assets": HTML_DIRECTORY / "assets",
+}
+
+# Assets modified in the render folder, always copied: the main page
+# appends the hexagons to main_circle.js
+COPIED_ASSETS = {Path("js") / "main_circle.js"}
+
+
+def asset_files() -> dict:
+    """Assets of the report: {path in the render folder: source file}"""
+    files = {}
+    for folder, source_folder in ASSET_FOLDERS.items():
+        for source in sorted(source_folder.rglob("*")):
+            if source.is_file():
+                files[Path(folder) / source.relative_to(source_folder)] = source
+    for source in sorted(JS_DIRECTORY.iterdir()):
+        if source.is_file():
+            files[Path("js") / source.name] = source
+    return files
+
+
+def assets_version(files: dict) -> str:
+    """Hash of the paths and the contents of the assets"""
+    assets_hash = hashlib.md5()
+    for path, source in sorted(files.items()):
+        assets_hash.update(path.as_posix().encode("utf-8") + b"\0")
+        assets_hash.update(source.read_bytes())
+    return assets_hash.hexdigest()[:16]
+
+
+def shared_assets(files: dict, assets_directory: Path) -> Path:
+    """Copy of the assets in assets_directory, in a folder named after
+    their hash: reports generated with the same assets share it"""
+    version = assets_version(files)
+    directory = assets_directory / version
+    if directory.exists():
+        return directory
+
+    # Written in a temporary folder, as other reports may be generated
+    # with the same shared directory at the same time
+    temporary = assets_directory / f".{version}.{os.getpid()}.tmp"
+    for path, source in files.items():
+        (temporary / path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, temporary / path)
+    try:
+        os.rename(temporary, directory)
+    except OSError:
+        # Created by another report in the meantime
+        shutil.rmtree(temporary)
+    return directory
+
+
+def is_up_to_date(target: Path, source: Path, link: str) -> bool:
+    if link == "symlink":
+        return target.is_symlink() and os.readlink(target) == str(source)
+    if target.is_symlink() or not target.is_file():
+        return False
+    if link == "hardlink":
+        return os.path.samefile(target, source)
+    # Copied with its modification time, and not linked to a shared asset
+    target_stat = target.stat()
+    source_stat = source.stat()
+    return (
+        target_stat.st_nlink == 1
+        and target_stat.st_size == source_stat.st_size
+        and target_stat.st_mtime_ns == source_stat.st_mtime_ns
+    )
+
+
+def install_asset(target: Path, source: Path, link: str) -> bool:
+    """Replaces target by a copy of source or a link to it. The content of
+    target is never written, as it may be a link to a shared asset.
+    Returns False if the link could not be created (the asset is copied)."""
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    linked = True
+    try:
+        if link == "symlink":
+            os.symlink(source, temporary)
+        elif link == "hardlink":
+            os.link(source, temporary)
+        else:
+            shutil.copy2(source, temporary)
+    except OSError:
+        # e.g. hard link to another file system, symbolic links not allowed
+        shutil.copy2(source, temporary)
+        linked = False
+    os.replace(temporary, target)
+    return linked
+
+
+def sync_assets(folder_name: Path, assets_directory=None, link="copy") -> None:
+    """Puts the assets of the report in the render folder, leaving the
+    assets that are already up to date, and removes the other files of
+    the asset folders (assets of previous versions).
+
+    Args:
+        folder_name (Path): Render folder.
+        assets_directory: Shared directory the assets are copied in once and
+            taken from (--assets_dir), None to take them from AD Miner.
+        link (str): copy, hardlink or symlink (--assets_link).
+    """
+    files = asset_files()
+    sources = files
+    if assets_directory is not None:
+        directory = shared_assets(files, Path(assets_directory).resolve())
+        sources = {path: directory / path for path in files}
+
+    failed_links = 0
+    for path, source in sources.items():
+        target = folder_name / path
+        mode = "copy" if path in COPIED_ASSETS else link
+        if path not in COPIED_ASSETS and is_up_to_date(target, source, mode):
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not install_asset(target, source, mode):
+            failed_links += 1
+    if failed_links > 0:
+        logger.print_warning(
+            f"{failed_links} assets could not be linked ({link}) and were copied"
+        )
+
+    for folder in ASSET_FOLDERS:
+        for target in (folder_name / folder).rglob("*"):
+            if target.is_symlink() or target.is_file():
+                if target.relative_to(folder_name) not in sources:
+                    target.unlink()
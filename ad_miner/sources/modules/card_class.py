@@ -1,6 +1,6 @@
 from ad_miner.sources.modules.line_class import Line
 from ad_miner.sources.modules.table_class import Table
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, read_template
 
 
 class Card:
@@ -32,11 +32,10 @@ class Card:
     def render(self, page_f):
 
         # write header
-        with open(
-            self.template_base_path / (self.template + "_header.html"), "r"
-        ) as header_f:
-            html_header = header_f.read()
-            page_f.write(html_header % (self.color, self.title, self.icon))
+        html_header = read_template(
+            self.template_base_path / (self.template + "_header.html")
+        )
+        page_f.write(html_header % (self.color, self.title, self.icon))
 
         for line in self.lines:
             line.render(page_f)
@@ -45,7 +44,6 @@ class Card:
             page_f.write("\n</div>\n")
             self.table.render(page_f)
 
-        with open(
-            self.template_base_path / (self.template + "_footer.html"), "r"
-        ) as footer_f:
-            page_f.write(footer_f.read())
+        page_f.write(
+            read_template(self.template_base_path / (self.template + "_footer.html"))
+        )
@@ -268,17 +268,36 @@ def createGraphPage(
     page.render()
 
 
+def pathsToDaFromComputers(
+    requests_results, computers, start_name, start_label, relation_type
+) -> list:
+    """
+    Returns the paths to DA of the computers, with a new start node
+    (start_name, linked to the computers by relation_type) added before them
+    """
+    dico_paths_computers_to_DA = requests_results["dico_paths_computers_to_DA"]
+    paths = []
+    # Unique computers, in order
+    for computer in dict.fromkeys(computers):
+        for path in dico_paths_computers_to_DA.get(computer, []):
+            node_to_add = Node(
+                id=42424243,
+                labels=start_label,
+                name=start_name,
+                domain="start",
+                tenant_id=None,
+                relation_type=relation_type,
+            )
+            paths.append(Path([node_to_add] + path.nodes))
+    return paths
+
+
 def findAndCreatePathToDaFromUsersList(
     requests_results, arguments, admin_user, computers
 ):
     users_to_domain_admin = requests_results["users_to_domain_admin"]
-    computers_to_domain_admin = requests_results["computers_to_domain_admin"]
     if users_to_domain_admin is None:
         return 0, 0
-    path_to_generate = []
-    # node_to_add = Node(id=42424243, labels="User",
-    #                    name=admin_user, domain="start")
-    list_domain = []
 
     dico_description_computers_path_to_da = {
         "description": "All compromission paths from computers to domain administrators.",
@@ -286,27 +305,10 @@ def findAndCreatePathToDaFromUsersList(
         "poa": "Review these paths and make sure that they are not exploitable. Cut some of the links between the Active Directory objects by changing configuration in order to reduce the number of possible paths.",
     }
 
-    for paths in computers_to_domain_admin.values():
-        for path in paths:
-            if path.nodes[0].name in computers:
-                # if path.start_node.name in computers:
-                node_to_add = Node(
-                    id=42424243,
-                    labels="User",
-                    name=admin_user,
-                    domain="start",
-                    tenant_id=None,
-                    relation_type="AdminTo",
-                )
-                # relation = Relation(
-                #     id=88888, nodes=[node_to_add, path.start_node], type="AdminTo"
-                # )
-                new_nodes = path.nodes.copy()
-                new_nodes.insert(0, node_to_add)
-                new_path = Path(new_nodes)
-                path_to_generate.append(new_path)
-                if new_path.nodes[-1].domain not in list_domain:
-                    list_domain.append(path.nodes[-1].domain)
+    path_to_generate = pathsToDaFromComputers(
+        requests_results, computers, admin_user, "User", "AdminTo"
+    )
+    list_domain = {path.nodes[-1].domain for path in path_to_generate}
     if len(path_to_generate):
         createGraphPage(
             arguments.cache_prefix,
@@ -355,30 +357,11 @@ def findAndCreatePathToDaFromComputersList(
     if computers_to_domain_admin is None:
         logger.print_error(" self.computers_to_domain_admin is None")
         return 0, 0
-    path_to_generate = []
-
-    domains = []
-
-    for paths in computers_to_domain_admin.values():
-        for path in paths:
-            domains.append(path.nodes[-1].domain)
-
-            if path.nodes[0].name in computers:
-                # relation = Relation(
-                #     id=88888, nodes=[node_to_add, path.nodes[0]], type="Relay"
-                # )
-                node_to_add = Node(
-                    id=42424243,
-                    labels="Computer",
-                    name=admin_computer,
-                    domain="start",
-                    tenant_id=None,
-                    relation_type="Relay",
-                )
-                new_nodes = path.nodes.copy()
-                new_nodes.insert(0, node_to_add)
-                new_path = Path(new_nodes)
-                path_to_generate.append(new_path)
+
+    path_to_generate = pathsToDaFromComputers(
+        requests_results, computers, admin_computer, "Computer", "Relay"
+    )
+    domains = {path.nodes[-1].domain for path in path_to_generate}
     if len(path_to_generate):
         createGraphPage(
             arguments.cache_prefix,
@@ -388,7 +371,7 @@ def findAndCreatePathToDaFromComputersList(
             path_to_generate,
             requests_results,
         )
-    return len(path_to_generate), len(list(set(domains)))
+    return len(path_to_generate), len(domains)
 
 
 def get_dico_admin_of_computer_id(requests_results):
@@ -1,5 +1,8 @@
 import os
 import importlib
+import hashlib
+import pickle
+from collections.abc import Mapping
 
 control_list = []
 
@@ -10,12 +13,70 @@ def register_control(cls):
     return cls
 
 
+class RequestsView(Mapping):
+    """Read-only view of the requests results given to a control.
+
+    Only the mapping is read-only: the results themselves (lists, dicts,
+    paths) are returned as is, to avoid copying them, and must not be
+    modified (see Control). Accesses to keys that the control did not
+    declare in consumed_requests still work, but are recorded in
+    undeclared."""
+
+    def __init__(self, requests_results, consumed_requests=None) -> None:
+        self._requests_results = requests_results
+        self._consumed_requests = (
+            None if consumed_requests is None else frozenset(consumed_requests)
+        )
+        self.undeclared = set()
+
+    def __getitem__(self, key):
+        if self._consumed_requests is not None and key not in self._consumed_requests:
+            self.undeclared.add(key)
+        return self._requests_results[key]
+
+    def __contains__(self, key):
+        return key in self._requests_results
+
+    def __iter__(self):
+        return iter(self._requests_results)
+
+    def __len__(self):
+        return len(self._requests_results)
+
+
+def requests_fingerprints(requests_results, keys) -> dict:
+    """Returns a hash of the results of the given requests keys,
+    used to detect the controls modifying the results they consume"""
+    fingerprints = {}
+    for key in keys:
+        if key not in requests_results:
+            continue
+        try:
+            value = pickle.dumps(requests_results[key], pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        fingerprints[key] = hashlib.md5(value).hexdigest()
+    return fingerprints
+
+
 class Control:
     """Every control should inheritate from this class.
-    It contains requests results and define essential structure."""
+    It contains requests results and define essential structure.
+
+    consumed_requests lists the keys of requests_results read by the control
+    (directly or through common_analysis), None if it was not declared.
+    Controls must not modify these results, nor the lists and dicts they
+    contain (copy them first): they are shared with the other controls,
+    which may run before, after, or in parallel, and only some controls
+    are run again by --only_controls / --only_requests. Modifications are
+    reported with --check_controls."""
+
+    consumed_requests = None
 
     def __init__(self, arguments, requests_results) -> None:
         self.arguments = arguments
+        if not isinstance(requests_results, RequestsView):
+            requests_results = RequestsView(requests_results, self.consumed_requests)
         self.requests_results = requests_results
         self.title = ""
         self.description = ""
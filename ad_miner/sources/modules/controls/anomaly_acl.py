@@ -19,6 +19,33 @@ from tqdm import tqdm
 class my_control_class_name(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "admin_list",
+        "anomaly_acl_1",
+        "anomaly_acl_2",
+        "computers_admin_on_computers",
+        "computers_admin_to_count",
+        "dico_computers_to_da",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_gpo_to_da",
+        "dico_groups_to_da",
+        "dico_is_kerberoastable",
+        "dico_is_user_admin_on_computer",
+        "dico_ou_to_da",
+        "dico_paths_computers_to_DA",
+        "dico_user_da",
+        "dico_users_to_da",
+        "domains_to_domain_admin",
+        "get_computers_linked_admin_group",
+        "get_groups_linked_admin_group",
+        "get_users_direct_admin",
+        "get_users_linked_admin_group",
+        "users_admin_on_computers",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -102,10 +129,10 @@ class my_control_class_name(Control):
             page.render()
             return 0
 
-        for each in range(len(self.anomaly_acl_1)):
-            self.anomaly_acl_1[each]["g.members_count"] = "-"
-
-        self.anomaly_acl = self.anomaly_acl_1 + self.anomaly_acl_2
+        # Copies, the request results must not be modified
+        self.anomaly_acl = [
+            {**acl, "g.members_count": "-"} for acl in self.anomaly_acl_1
+        ] + self.anomaly_acl_2
 
         formated_data_details = []
         formated_data = {}
@@ -12,6 +12,8 @@ import json
 class as_rep(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_as-rep_roastable_accounts"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
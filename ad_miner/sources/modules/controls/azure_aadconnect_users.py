@@ -9,6 +9,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class azure_aadconnect_users(Control):
     "Legacy control"
 
+    consumed_requests = ["azure_aadconnect_users"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
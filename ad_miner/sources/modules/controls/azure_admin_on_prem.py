@@ -10,6 +10,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class azure_admin_on_prem(Control):
     "Legacy control"
 
+    consumed_requests = ["azure_admin_on_prem"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -11,6 +11,18 @@ from hashlib import md5
 class azure_cross_ga_da(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "azure_cross_ga_da",
+        "azure_tenants",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+        "nb_domain_collected",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -12,6 +12,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class azure_dormant_accounts(Control):
     "Legacy control"
 
+    consumed_requests = ["azure_dormant_accounts"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -11,6 +11,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class azure_last_passwd_change(Control):
     "Legacy control"
 
+    consumed_requests = ["azure_last_passwd_change"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
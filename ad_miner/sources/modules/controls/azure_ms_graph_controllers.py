@@ -8,6 +8,16 @@ from ad_miner.sources.modules.common_analysis import presence_of, createGraphPag
 class azure_ms_graph_controllers(Control):  # TODO change the class name
     "Legacy control"  # TODO small documentation here
 
+    consumed_requests = [
+        "azure_ms_graph_controllers",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -12,6 +12,8 @@ from hashlib import md5
 class azure_reset_passwd(Control):
     "Legacy control"
 
+    consumed_requests = ["azure_reset_passwd"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
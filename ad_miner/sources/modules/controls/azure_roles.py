@@ -13,6 +13,17 @@ from hashlib import md5
 class azure_roles(Control):  # TODO change the class name
     "Docstring of my control"  # TODO small documentation here
 
+    consumed_requests = [
+        "azure_role_listing",
+        "azure_role_paths",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -7,6 +7,16 @@ from ad_miner.sources.modules.common_analysis import presence_of, createGraphPag
 class azure_users_paths_high_target(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "azure_users_paths_high_target",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -14,6 +14,15 @@ from urllib.parse import quote
 class can_dcsync(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "dcsync_list",
+        "index",
+        "nb_domain_admins",
+        "objects_to_dcsync",
+        "set_dcsync1",
+        "set_dcsync2",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -34,11 +43,8 @@ class can_dcsync(Control):
 
         self.objects_to_dcsync = requests_results["objects_to_dcsync"]
         self.dcsync_list = requests_results["dcsync_list"]
-        self.users_nb_domain_admins = requests_results["nb_domain_admins"]
+        self.index = requests_results["index"]
 
-        self.dcsync_paths = (
-            requests_results["set_dcsync1"] + requests_results["set_dcsync2"]
-        )
         end_nodes = []
 
         # Check if dcsync path is activated or not
@@ -63,6 +69,10 @@ class can_dcsync(Control):
         self.name_description = f"{self.data} non DA/DC objects have DCSync privileges"
 
     def genFullDCSync(self):
+        paths_to_dcsync = self.index.byEndNode("objects_to_dcsync")
+        dcsync_paths_1 = self.index.byStartNode("set_dcsync1")
+        dcsync_paths_2 = self.index.byStartNode("set_dcsync2")
+        domain_admins = self.index.byName("nb_domain_admins")
 
         data = []
         for n in self.can_dcsync_nodes:
@@ -75,10 +85,7 @@ class can_dcsync(Control):
             )
             graph = Graph()
 
-            paths_left = []
-            for path in self.objects_to_dcsync:
-                if path.nodes[-1].name == n.name:
-                    paths_left.append(path)
+            paths_left = paths_to_dcsync.get(n.name, [])
 
             graph.setPaths(paths_left)
             page.addComponent(graph)
@@ -93,10 +100,10 @@ class can_dcsync(Control):
             )
             graph = Graph()
 
-            paths_right = []
-            for path in self.dcsync_paths:
-                if path.nodes[0].name == n.name:
-                    paths_right.append(path)
+            paths_right = [
+                *dcsync_paths_1.get(n.name, []),
+                *dcsync_paths_2.get(n.name, []),
+            ]
 
             graph.setPaths(paths_right)
             page.addComponent(graph)
@@ -109,7 +116,7 @@ class can_dcsync(Control):
             else:
                 type_icon = '<i class="bi bi-question-circle-fill"></i>'
 
-            if n.name in self.users_nb_domain_admins:
+            if n.name in domain_admins:
                 name_icon = '<i class="bi bi-gem stats-icon"></i>'
             else:
                 name_icon = type_icon
@@ -150,30 +157,26 @@ class can_dcsync(Control):
         page.addComponent(grid)
         page.render()
 
-    def genNodesDCsyncLightPage(self, neo4j):
+    def genNodesDCsyncLightPage(self):
         page = Page(
             self.arguments.cache_prefix,
             "can_dcsync",
             "Inadequate access to DCSync privileges",
             self.get_dico_description(),
         )
-        paths = (
-            neo4j.all_requests["set_dcsync1"]["result"]
-            + neo4j.all_requests["set_dcsync2"]["result"]
-        )
+        dcsync_paths_1 = self.index.byStartNode("set_dcsync1")
+        dcsync_paths_2 = self.index.byStartNode("set_dcsync2")
         raw_data = {}
         for e in self.dcsync_list:
             raw_data[e["name"]] = {
                 "domain": e["domain"],
                 "name": e["name"],
                 "target graph": {},
-                "paths": [],
+                "paths": [
+                    *dcsync_paths_1.get(e["name"], []),
+                    *dcsync_paths_2.get(e["name"], []),
+                ],
             }
-        for path in paths:
-            try:
-                raw_data[path.nodes[0].name]["paths"].append(path)
-            except KeyError:
-                continue
         data = []
         # print(raw_data)
         for k in raw_data.keys():
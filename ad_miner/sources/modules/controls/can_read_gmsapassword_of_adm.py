@@ -14,6 +14,8 @@ from urllib.parse import quote
 class can_read_gmsapassword_of_adm(Control):
     "Legacy control"
 
+    consumed_requests = ["can_read_gmsapassword_of_adm"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -9,6 +9,8 @@ from ad_miner.sources.modules.grid_class import Grid
 class can_read_laps(Control):
     "Legacy control"
 
+    consumed_requests = ["can_read_laps", "nb_domain_admins"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -17,6 +17,18 @@ from urllib.parse import quote
 class computers_admin_of_computers(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "computers_admin_on_computers",
+        "computers_to_domain_admin",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_paths_computers_to_DA",
+        "dico_user_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -11,6 +11,8 @@ from ad_miner.sources.modules.common_analysis import percentage_superior
 class computers_last_connexion(Control):
     "Legacy control"
 
+    consumed_requests = ["computers_not_connected_since", "nb_computers"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -13,6 +13,8 @@ from urllib.parse import quote
 class computers_list_of_rdp_users(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_enabled_accounts", "rdp_access"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
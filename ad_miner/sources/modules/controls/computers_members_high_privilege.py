@@ -10,6 +10,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class computers_members_high_privilege(Control):
     "Legacy control"
 
+    consumed_requests = ["computers_members_high_privilege"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -44,12 +46,17 @@ class computers_members_high_privilege(Control):
             self.get_dico_description(),
         )
         grid = Grid("List of computer admins")
+        data = []
         for d in self.computers_members_high_privilege:
-            d["domain"] = '<i class="bi bi-globe2"></i> ' + d["domain"]
-            d["computer"] = '<i class="bi bi-pc-display"></i> ' + d["computer"]
-            d["group"] = '<i class="bi bi-people-fill"></i> ' + d["group"]
+            data.append(
+                {
+                    "domain": '<i class="bi bi-globe2"></i> ' + d["domain"],
+                    "computer": '<i class="bi bi-pc-display"></i> ' + d["computer"],
+                    "group": '<i class="bi bi-people-fill"></i> ' + d["group"],
+                }
+            )
         grid.setheaders(["domain", "computer", "group"])
-        grid.setData(self.computers_members_high_privilege)
+        grid.setData(data)
         page.addComponent(grid)
         page.render()
 
@@ -11,6 +11,8 @@ from ad_miner.sources.modules.common_analysis import manageComputersOs, presence
 class computers_os_obsolete(Control):
     "Legacy control"
 
+    consumed_requests = ["os"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -40,6 +42,8 @@ class computers_os_obsolete(Control):
         cleaned_data = []
         for computer in self.list_computers_os_obsolete:
             if computer["Last logon in days"] < 90:  # remove ghost computers
+                # Rows are copied before adding the icons
+                computer = dict(computer)
                 computer["Domain"] = (
                     '<i class="bi bi-globe2"></i> ' + computer["Domain"]
                 )
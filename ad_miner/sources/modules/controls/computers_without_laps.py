@@ -11,6 +11,8 @@ from ad_miner.sources.modules.utils import days_format
 class computers_without_laps(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_computers", "nb_computers_laps"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
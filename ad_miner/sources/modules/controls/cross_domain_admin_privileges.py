@@ -12,6 +12,17 @@ import copy
 class cross_domain_admin_privileges(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "cross_domain_domain_admins",
+        "cross_domain_local_admins",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
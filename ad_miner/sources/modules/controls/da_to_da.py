@@ -13,6 +13,8 @@ from urllib.parse import quote
 class da_to_da(Control):
     "Legacy control"
 
+    consumed_requests = ["da_to_da", "nb_domain_collected"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
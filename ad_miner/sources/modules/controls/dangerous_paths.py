@@ -11,6 +11,8 @@ from ad_miner.sources.modules.utils import grid_data_stringify
 class dangerous_paths(Control):
     "Legacy control"
 
+    consumed_requests = ["da_to_da", "objects_to_dcsync", "objects_to_domain_admin"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -8,6 +8,16 @@ from ad_miner.sources.modules.common_analysis import createGraphPage, presence_o
 class dc_impersonation(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "dc_impersonation",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
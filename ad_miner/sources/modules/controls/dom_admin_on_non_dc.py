@@ -13,6 +13,16 @@ from urllib.parse import quote
 class dom_admin_on_non_dc(Control):
     "Docstring of my control"
 
+    consumed_requests = [
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+        "dom_admin_on_non_dc",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
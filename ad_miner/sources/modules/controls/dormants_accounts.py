@@ -11,6 +11,8 @@ from ad_miner.sources.modules.common_analysis import percentage_superior
 class dormants_accounts(Control):
     "Legacy control"
 
+    consumed_requests = ["admin_list", "dormant_accounts", "nb_enabled_accounts"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -9,6 +9,8 @@ from ad_miner.sources.modules.grid_class import Grid
 class empty_groups(Control):
     "Legacy control"
 
+    consumed_requests = ["get_empty_groups", "nb_groups"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -34,11 +36,14 @@ class empty_groups(Control):
         grid = Grid("Groups without any object in it")
         headers = ["Empty group", "Full Reference"]
 
+        data = []
         for d in self.empty_groups:
+            d = dict(d)
             d["Empty group"] = '<i class="bi bi-people-fill"></i> ' + d["Empty group"]
+            data.append(d)
 
         grid.setheaders(headers)
-        grid.setData(self.empty_groups)
+        grid.setData(data)
 
         page.addComponent(grid)
         page.render()
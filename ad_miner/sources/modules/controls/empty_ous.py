@@ -9,6 +9,8 @@ from ad_miner.sources.modules.grid_class import Grid
 class empty_ous(Control):  # TODO change the class name
     "Docstring of my control"  # TODO small documentation here
 
+    consumed_requests = ["get_empty_ous", "nb_groups"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -34,13 +36,16 @@ class empty_ous(Control):  # TODO change the class name
         grid = Grid("OUs without any object in it")
         headers = ["Empty Organizational Unit", "Full Reference"]
 
+        data = []
         for d in self.empty_ous:
+            d = dict(d)
             d["Empty Organizational Unit"] = (
                 '<i class="bi bi-building"></i> ' + d["Empty Organizational Unit"]
             )
+            data.append(d)
 
         grid.setheaders(headers)
-        grid.setData(self.empty_ous)
+        grid.setData(data)
 
         page.addComponent(grid)
         page.render()
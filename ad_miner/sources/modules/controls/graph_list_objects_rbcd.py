@@ -15,6 +15,17 @@ from tqdm import tqdm
 class graph_list_objects_rbcd(Control):  # TODO change the class name
     "Docstring of my control"  # TODO small documentation here
 
+    consumed_requests = [
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+        "graph_rbcd",
+        "graph_rbcd_to_da",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -14,6 +14,22 @@ from urllib.parse import quote
 class graph_path_objects_to_da(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "computers_to_domain_admin",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+        "domains",
+        "domains_to_domain_admin",
+        "groups_to_domain_admin",
+        "nb_domain_collected",
+        "objects_to_domain_admin",
+        "users_to_domain_admin",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -19,6 +19,27 @@ from tqdm import tqdm
 class graph_path_objects_to_ou_handlers(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "admin_list",
+        "compromise_paths_of_OUs",
+        "computers_admin_to_count",
+        "dico_computers_to_da",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_gpo_to_da",
+        "dico_groups_to_da",
+        "dico_is_kerberoastable",
+        "dico_is_user_admin_on_computer",
+        "dico_ou_to_da",
+        "dico_user_da",
+        "dico_users_to_da",
+        "set_containsda",
+        "set_containsdc",
+        "vulnerable_OU_impact",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
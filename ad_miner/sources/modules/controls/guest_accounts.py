@@ -9,6 +9,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class guest_accounts(Control):
     "Legacy control"
 
+    consumed_requests = ["guest_accounts"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -13,6 +13,8 @@ from urllib.parse import quote
 class has_sid_history(Control):
     "Legacy control"
 
+    consumed_requests = ["has_sid_history", "users_admin_on_computers"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -44,7 +46,11 @@ class has_sid_history(Control):
 
         # add icons for type of object
         star_icon = "<i class='bi bi-star-fill' style='color:gold; text-shadow: 0px 0px 1px black, 0px 0px 1px black, 0px 0px 1px black, 0px 0px 1px black;' title='This SID history allows for access to more computers'></i>"
+        data = []
         for row in self.has_sid_history:
+            # Copy of the row, the request results must not be modified
+            row = dict(row)
+            data.append(row)
             # add admin of columns
             row["Admin of"] = "-"
             row["admin of"] = "-"
@@ -81,7 +87,7 @@ class has_sid_history(Control):
                 row["Target"] = star_icon + " " + row["Target"]
 
         grid.setheaders(headers)
-        grid.setData(self.has_sid_history)
+        grid.setData(data)
 
         page.addComponent(grid)
         page.render()
@@ -13,6 +13,8 @@ from urllib.parse import quote
 class kerberoastables(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_kerberoastable_accounts"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -38,6 +40,8 @@ class kerberoastables(Control):
             return
 
         SPNs = []
+        # SPN cells of the users, the request results must not be modified
+        SPN_cells = {}
         child_headers = ["Account", "SPN"]
         for user in self.users_kerberoastable_users:
             n = 0
@@ -52,7 +56,7 @@ class kerberoastables(Control):
             sortClass = str(n).zfill(
                 6
             )  # used to make the sorting feature work with icons
-            user["SPN"] = grid_data_stringify(
+            SPN_cells[user["name"]] = grid_data_stringify(
                 {
                     "link": "%s.html?parameter=%s"
                     % ("kerberoastables_SPN", quote(str(user["name"]))),
@@ -84,25 +88,17 @@ class kerberoastables(Control):
             ["domain", "name", "Last password change", "Account Creation Date", "SPN"]
         )
 
-        for elem in range(len(self.users_kerberoastable_users)):
-            if self.users_kerberoastable_users[elem]["is_Domain_Admin"] == True:
-                self.users_kerberoastable_users[elem]["name"] = (
-                    '<i class="bi bi-gem" title="This user is domain admin"></i> '
-                    + self.users_kerberoastable_users[elem]["name"]
-                )
-            else:
-                self.users_kerberoastable_users[elem]["name"] = (
-                    '<i class="bi bi-person-fill"></i> '
-                    + self.users_kerberoastable_users[elem]["name"]
-                )
-
         data = []
-        for dict in self.users_kerberoastable_users:
-            tmp_data = {"domain": '<i class="bi bi-globe2"></i> ' + dict["domain"]}
-            tmp_data["name"] = dict["name"]
-            tmp_data["Last password change"] = days_format(dict["pass_last_change"])
-            tmp_data["Account Creation Date"] = days_format(dict["accountCreationDate"])
-            tmp_data["SPN"] = dict["SPN"]
+        for user in self.users_kerberoastable_users:
+            if user["is_Domain_Admin"] == True:
+                icon = '<i class="bi bi-gem" title="This user is domain admin"></i> '
+            else:
+                icon = '<i class="bi bi-person-fill"></i> '
+            tmp_data = {"domain": '<i class="bi bi-globe2"></i> ' + user["domain"]}
+            tmp_data["name"] = icon + user["name"]
+            tmp_data["Last password change"] = days_format(user["pass_last_change"])
+            tmp_data["Account Creation Date"] = days_format(user["accountCreationDate"])
+            tmp_data["SPN"] = SPN_cells.get(user["name"], user.get("SPN"))
             data.append(tmp_data)
 
         # print("users_kerberoastable_users : ", json.dumps(self.users_kerberoastable_users))
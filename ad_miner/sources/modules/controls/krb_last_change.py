@@ -11,6 +11,8 @@ from ad_miner.sources.modules.common_analysis import time_since
 class krb_last_change(Control):  # TODO change the class name
     "Docstring of my control"  # TODO small documentation here
 
+    consumed_requests = ["krb_pwd_last_change"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -11,6 +11,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class nb_domain_admins(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_domain_admins"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
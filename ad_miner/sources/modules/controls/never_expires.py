@@ -12,6 +12,12 @@ from ad_miner.sources.modules.common_analysis import percentage_superior
 class never_expires(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "nb_domain_admins",
+        "nb_enabled_accounts",
+        "user_password_never_expires",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -37,15 +43,6 @@ class never_expires(Control):
     def run(self):
         if self.users_password_never_expires is None:
             return
-        for user in self.users_password_never_expires:
-            # Add admin icon
-            if user["name"] in self.admin_list:
-                user["name"] = (
-                    '<i class="bi bi-gem" title="This user is domain admin"></i> '
-                    + user["name"]
-                )
-            else:
-                user["name"] = '<i class="bi bi-person-fill"></i> ' + user["name"]
         page = Page(
             self.arguments.cache_prefix,
             "never_expires",
@@ -65,9 +62,14 @@ class never_expires(Control):
 
         data = []
         for dict in self.users_password_never_expires:
+            # Add admin icon
+            if dict["name"] in self.admin_list:
+                icon = '<i class="bi bi-gem" title="This user is domain admin"></i> '
+            else:
+                icon = '<i class="bi bi-person-fill"></i> '
             tmp_data = {
                 "domain": '<i class="bi bi-globe2"></i> ' + dict["domain"],
-                "name": dict["name"],
+                "name": icon + dict["name"],
             }
             tmp_data["Last login"] = days_format(dict["LastLogin"])
             tmp_data["Last password change"] = days_format(dict["LastPasswChange"])
@@ -16,6 +16,16 @@ from urllib.parse import quote
 class non_dc_with_unconstrained_delegations(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+        "kud",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
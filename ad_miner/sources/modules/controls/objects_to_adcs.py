@@ -15,6 +15,8 @@ from urllib.parse import quote
 class objects_to_adcs(Control):
     "Legacy control"
 
+    consumed_requests = ["objects_to_adcs"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -14,6 +14,8 @@ from urllib.parse import quote
 class objects_to_operators_member(Control):
     "Legacy control"
 
+    consumed_requests = ["objects_to_operators_groups", "objects_to_operators_member"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -10,6 +10,8 @@ from ad_miner.sources.modules import generic_formating
 class pre_windows_2000_compatible_access_group(Control):
     "Docstring of my control"
 
+    consumed_requests = ["pre_windows_2000_compatible_access_group"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
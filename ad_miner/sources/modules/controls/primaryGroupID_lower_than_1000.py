@@ -12,6 +12,8 @@ import json
 class primaryGroupID_lower_than_1000(Control):
     "Legacy control"
 
+    consumed_requests = ["primaryGroupID_lower_than_1000"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
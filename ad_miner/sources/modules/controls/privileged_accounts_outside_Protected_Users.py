@@ -9,6 +9,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class privileged_accounts_outside_Protected_Users(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_domain_admins"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
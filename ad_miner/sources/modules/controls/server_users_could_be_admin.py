@@ -13,6 +13,13 @@ import json
 class server_users_could_be_admin(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "servers_with_most_paths",
+        "users_admin_on_servers",
+        "users_admin_on_servers_all_data",
+        "users_admin_on_servers_list",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
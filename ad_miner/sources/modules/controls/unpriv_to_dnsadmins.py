@@ -8,6 +8,16 @@ from ad_miner.sources.modules.common_analysis import presence_of, createGraphPag
 class unpriv_to_dnsadmins(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_user_da",
+        "unpriv_to_dnsadmins",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -8,6 +8,8 @@ from ad_miner.sources.modules.grid_class import Grid
 class up_to_date_admincount(Control):
     "Docstring of my control"
 
+    consumed_requests = ["nb_domain_admins", "unpriviledged_users_with_admincount"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
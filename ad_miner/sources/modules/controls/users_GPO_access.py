@@ -18,6 +18,16 @@ import json
 class users_GPO_access(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "admin_list",
+        "unpriv_users_to_GPO",
+        "unpriv_users_to_GPO_computer_not_enforced",
+        "unpriv_users_to_GPO_init",
+        "unpriv_users_to_GPO_user_enforced",
+        "unpriv_users_to_GPO_user_not_enforced",
+        "users_admin_on_computers",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
         self.azure_or_onprem = "on_premise"
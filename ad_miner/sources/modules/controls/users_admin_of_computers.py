@@ -25,6 +25,27 @@ from tqdm import tqdm
 class users_admin_of_computers(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "admin_list",
+        "dico_da_group",
+        "dico_dc_computer",
+        "dico_ghost_computer",
+        "dico_ghost_user",
+        "dico_is_kerberoastable",
+        "dico_paths_computers_to_DA",
+        "dico_user_da",
+        "get_computers_linked_admin_group",
+        "get_groups_linked_admin_group",
+        "get_users_direct_admin",
+        "get_users_linked_admin_group",
+        "index",
+        "nb_enabled_accounts",
+        "nb_kerberoastable_accounts",
+        "password_last_change",
+        "users_admin_on_computers",
+        "users_to_domain_admin",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -59,6 +80,7 @@ class users_admin_of_computers(Control):
         self.get_users_direct_admin = requests_results["get_users_direct_admin"]
         self.admin_list = requests_results["admin_list"]
         self.users = requests_results["nb_enabled_accounts"]
+        self.index = requests_results["index"]
         self.users_to_computer_admin = {}
 
         self.users_admin_computer_count = generic_computing.getCountValueFromKey(
@@ -186,16 +208,17 @@ class users_admin_of_computers(Control):
             page.addComponent(graph)
             page.render()
 
+        kerberoastable_users = self.index.byName("nb_kerberoastable_accounts")
+        password_last_changes = self.index.byField("password_last_change", "user")
+
         def check_kerberoastable(account):
-            for elem in self.users_kerberoastable_users:
-                if elem["name"] == account:
-                    return "<i class='bi bi-ticket-perforated-fill' style='color: #b00404;' title='This account is vulnerable to Kerberoasting'></i> YES"
+            if account in kerberoastable_users:
+                return "<i class='bi bi-ticket-perforated-fill' style='color: #b00404;' title='This account is vulnerable to Kerberoasting'></i> YES"
             return "-"
 
         def get_last_pass_change(account):
-            for elem in self.users_pwd_not_changed_since:
-                if elem["user"] == account:
-                    return days_format(elem["days"])
+            if account in password_last_changes:
+                return days_format(password_last_changes[account][0]["days"])
             return "<i class='bi bi-calendar3'></i> Unknown"
 
         generateGraphPathToAdmin(self)
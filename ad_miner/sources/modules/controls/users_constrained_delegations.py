@@ -13,6 +13,8 @@ import json
 class users_constrained_delegations(Control):
     "Legacy control"
 
+    consumed_requests = ["users_constrained_delegations"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
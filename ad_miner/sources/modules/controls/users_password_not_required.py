@@ -12,6 +12,8 @@ from ad_miner.sources.modules.common_analysis import presence_of
 class users_password_not_required(Control):
     "Legacy control"
 
+    consumed_requests = ["get_users_password_not_required"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
@@ -12,6 +12,8 @@ import json
 class users_pwd_cleartext(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_user_password_cleartext"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
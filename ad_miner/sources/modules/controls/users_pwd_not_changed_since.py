@@ -12,6 +12,12 @@ from ad_miner.sources.modules.common_analysis import percentage_superior
 class users_pwd_not_changed_since(Control):
     "Legacy control"
 
+    consumed_requests = [
+        "nb_domain_admins",
+        "nb_enabled_accounts",
+        "password_last_change",
+    ]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
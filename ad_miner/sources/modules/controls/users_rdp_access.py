@@ -13,6 +13,8 @@ from urllib.parse import quote
 class users_rdp_access(Control):
     "Legacy control"
 
+    consumed_requests = ["nb_enabled_accounts", "rdp_access"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
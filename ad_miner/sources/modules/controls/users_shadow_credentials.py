@@ -15,6 +15,8 @@ from urllib.parse import quote
 class users_shadow_credentials(Control):  # TODO change the class name
     "Legacy control"  # TODO small documentation here
 
+    consumed_requests = ["users_shadow_credentials"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
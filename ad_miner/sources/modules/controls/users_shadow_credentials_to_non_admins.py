@@ -15,6 +15,8 @@ from urllib.parse import quote
 class TestControle1(Control):
     "This is my control"
 
+    consumed_requests = ["users_shadow_credentials_to_non_admins"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
         self.azure_or_onprem = "on_premise"
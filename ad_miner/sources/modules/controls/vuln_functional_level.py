@@ -9,6 +9,8 @@ from ad_miner.sources.modules.grid_class import Grid
 class vuln_functional_level(Control):
     "Legacy control"
 
+    consumed_requests = ["vuln_functional_level"]
+
     def __init__(self, arguments, requests_results) -> None:
         super().__init__(arguments, requests_results)
 
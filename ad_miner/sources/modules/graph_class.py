@@ -1,7 +1,30 @@
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+from pathlib import Path
+from urllib.parse import quote
+
+from ad_miner.sources.modules import logger
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, json_bytes, read_template
+from ad_miner.sources.modules.graph_layout import layered_layout
+from ad_miner.sources.modules.graph_store_class import graph_store
+from ad_miner.sources.modules.page_writer_class import page_writer
+
+# Attributes of the nodes and edges written in the graph data files
+NODE_COLUMNS = ["id", "label", "domain", "instance", "position", "attributes"]
+EDGE_COLUMNS = ["from", "to", "label"]
+
+# Start nodes summarized in a single node come in groups of at least this size
+MIN_SUMMARY_SIZE = 10
 
 
 class Graph:
+    # Graphs with more nodes have their equivalent start nodes summarized
+    # (--graph_summary_nodes, 0 to disable). Not supported with --graph_store,
+    # whose graphs are built by graph.js
+    summary_nodes = 1000
+    summary_warning = False
+    # Layout of the graphs computed when the report is generated, instead
+    # of dagre in the browser (--graph_layout)
+    compute_layout = False
+
     def __init__(self, template="graph", path_limit=80000):
         self.template_base_path = HTML_DIRECTORY / "components/graph/"
         self.template = template
@@ -48,16 +71,189 @@ class Graph:
     def addKerberoastableUsers(self, kerberoastable_users):
         self.kerberoastable_users = kerberoastable_users
 
+    def nodeStyle(self, node):
+        """Returns the icon (instance) and the attributes of a node"""
+        # Add new labels here. A corresponding svg icon should be defined
+        # dico_icon in the icon.js file.
+        list_labels = [
+            "User",
+            "Foreignsecurityprincipal",
+            "GPO",
+            "Computer",
+            "OU",
+            "Group",
+            "Domain",
+            "ADLocalGroup",
+            "Container",
+            "Unknown",
+            "Group_cluster",
+            "Device",
+            "AZTenant",
+            "AZRole",
+        ]
+
+        if node.labels in list_labels:
+            label_instance = node.labels
+        elif node.labels[2:] in list_labels:
+            label_instance = node.labels[2:]
+        else:
+            label_instance = "Unknown"
+
+        node_attributes = []
+
+        # Add DA icon if node is DC, DA or Domain
+        if (
+            (label_instance == "Computer" and self.dc_computer.get(node.name, False))
+            or (label_instance == "User" and self.user_da.get(node.name, False))
+            or (label_instance == "Group" and self.group_da.get(node.name, False))
+            or label_instance == "Domain"
+        ):
+            node_attributes.append("da")
+
+        # Add ghost icon if ghost
+        if (label_instance == "User" and self.ghost_user.get(node.name, False)) or (
+            label_instance == "Computer" and self.ghost_computer.get(node.name, False)
+        ):
+            node_attributes.append("ghost")
+
+        if label_instance == "User" and self.disabled_users_dict.get(node.name, False):
+            node_attributes.append("disabled")
+
+        if label_instance == "User" and self.kerberoastable_users.get(node.name, False):
+            node_attributes.append("kerberoastable")
+
+        # New nodes attributes that should be added to the node icon
+        # should be added here to the node_attributes list.
+        # A corresponding svg icon should the be added to the
+        # dico_icon in icon.js
+
+        return label_instance, node_attributes
+
+    def samplePaths(self):
+        """Paths of the graph, at most path_limit of them: the sample is
+        spread evenly over the paths, and is the same on every run"""
+        count = len(self.paths)
+        if count <= self.path_limit:
+            return self.paths
+        return [self.paths[i * count // self.path_limit] for i in range(self.path_limit)]
+
+    def summarize(self, nodes, relations):
+        """Replaces the start nodes with the same icon, the same domain and
+        the same edges (the same next hops) by a summary node, in groups of at least
+        MIN_SUMMARY_SIZE nodes. Returns the nodes, the relations and the
+        summaries, expanded on demand by graph.js."""
+        targets = set(relation["to"] for relation in relations)
+        out_edges = {}
+        for relation in relations:
+            if relation["from"] not in targets:
+                out_edges.setdefault(relation["from"], []).append(
+                    (relation["to"], relation["label"])
+                )
+
+        groups = {}
+        for node in nodes:
+            if node["id"] in out_edges:
+                signature = (
+                    node["instance"],
+                    node["domain"],
+                    frozenset(out_edges[node["id"]]),
+                )
+                groups.setdefault(signature, []).append(node)
+
+        # node id -> summary node replacing it
+        summary_nodes = {}
+        summaries = []
+        for (instance, domain, edges), members in groups.items():
+            if len(members) < MIN_SUMMARY_SIZE:
+                continue
+            summary_node = {
+                "id": -1 - len(summaries),
+                "label": f"{len(members)} {instance} nodes",
+                "domain": domain,
+                "instance": instance,
+                "position": "start",
+                "attributes": [],
+            }
+            edges = sorted(edges, key=str)
+            summaries.append(
+                {
+                    "id": summary_node["id"],
+                    "nodes": {
+                        key: [node[key] for node in members] for key in NODE_COLUMNS
+                    },
+                    "edges": {
+                        "to": [edge[0] for edge in edges],
+                        "label": [edge[1] for edge in edges],
+                    },
+                }
+            )
+            for node in members:
+                summary_nodes[node["id"]] = summary_node
+        if not summaries:
+            return nodes, relations, summaries
+
+        summarized_nodes = []
+        written = set()
+        for node in nodes:
+            node = summary_nodes.get(node["id"], node)
+            if node["id"] not in written:
+                written.add(node["id"])
+                summarized_nodes.append(node)
+
+        summarized_relations = []
+        written = set()
+        for relation in relations:
+            if relation["from"] in summary_nodes:
+                summary_id = summary_nodes[relation["from"]]["id"]
+                key = (summary_id, relation["to"], relation["label"])
+                if key in written:
+                    continue
+                written.add(key)
+                relation = dict(relation)
+                relation["from"] = summary_id
+            summarized_relations.append(relation)
+
+        return summarized_nodes, summarized_relations, summaries
+
+    def layout(self, nodes, relations):
+        """Layer of each node and its order in its layer (see
+        graph_layout.py), positioned by graph.js"""
+        index = {node["id"]: i for i, node in enumerate(nodes)}
+        layers, orders = layered_layout(
+            len(nodes),
+            [index[relation["from"]] for relation in relations],
+            [index[relation["to"]] for relation in relations],
+        )
+        return layers.tolist(), orders.tolist()
+
     def render(self, page_f):
 
         # Write header
-        with open(
-            self.template_base_path / (self.template + "_header.html"), "r"
-        ) as header_f:
-            html_header = header_f.read()
-            page_f.write(html_header)
+        page_f.write(
+            read_template(self.template_base_path / (self.template + "_header.html"))
+        )
 
-        for index, path in enumerate(self.paths):
+        paths = self.samplePaths()
+        if len(paths) < len(self.paths):
+            page_f.write(
+                '<div class="alert alert-warning" style="max-width: 60rem; margin: auto">'
+                f"This graph only shows {len(paths)} of its {len(self.paths)} paths."
+                "</div>\n"
+            )
+
+        if graph_store.enabled:
+            if Graph.summary_nodes > 0 and not Graph.summary_warning:
+                node_count = len({node.id for path in paths for node in path.nodes})
+                if node_count > Graph.summary_nodes:
+                    logger.print_warning(
+                        f"Graph of {node_count} nodes not summarized: "
+                        "--graph_summary_nodes is not supported with --graph_store"
+                    )
+                    Graph.summary_warning = True
+            graph_store.writeGraph(self, page_f, paths)
+            return
+
+        for index, path in enumerate(paths):
             for i in range(len(path.nodes)):
 
                 node = path.nodes[i]
@@ -70,72 +266,7 @@ class Graph:
                 else:
                     node_position = "intermediate"
 
-                # Add new labels here. A corresponding svg icon should be defined
-                # dico_icon in the icon.js file.
-                list_labels = [
-                    "User",
-                    "Foreignsecurityprincipal",
-                    "GPO",
-                    "Computer",
-                    "OU",
-                    "Group",
-                    "Domain",
-                    "ADLocalGroup",
-                    "Container",
-                    "Unknown",
-                    "Group_cluster",
-                    "Device",
-                    "AZTenant",
-                    "AZRole",
-                ]
-
-                if node.labels in list_labels:
-                    label_instance = node.labels
-                elif path.nodes[i].labels[2:] in list_labels:
-                    label_instance = node.labels[2:]
-                else:
-                    label_instance = "Unknown"
-
-                node_attributes = []
-
-                # Add DA icon if node is DC, DA or Domain
-                if (
-                    (
-                        label_instance == "Computer"
-                        and self.dc_computer.get(node.name, False)
-                    )
-                    or (label_instance == "User" and self.user_da.get(node.name, False))
-                    or (
-                        label_instance == "Group"
-                        and self.group_da.get(node.name, False)
-                    )
-                    or label_instance == "Domain"
-                ):
-                    node_attributes.append("da")
-
-                # Add ghost icon if ghost
-                if (
-                    label_instance == "User" and self.ghost_user.get(node.name, False)
-                ) or (
-                    label_instance == "Computer"
-                    and self.ghost_computer.get(node.name, False)
-                ):
-                    node_attributes.append("ghost")
-
-                if label_instance == "User" and self.disabled_users_dict.get(
-                    node.name, False
-                ):
-                    node_attributes.append("disabled")
-
-                if label_instance == "User" and self.kerberoastable_users.get(
-                    node.name, False
-                ):
-                    node_attributes.append("kerberoastable")
-
-                # New nodes attributes that should be added to the node icon
-                # should be added here to the node_attributes list.
-                # A corresponding svg icon should the be added to the
-                # dico_icon in icon.js
+                label_instance, node_attributes = self.nodeStyle(node)
 
                 if not self.nodes.get(path.nodes[i].id):
 
@@ -172,5 +303,42 @@ class Graph:
         for n in nodes:  # Sanitize None values (otherwise it creates a bug in JS)
             if n["label"] == None:
                 n["label"] = "???"
-        page_f.write(f'<script type="text/javascript">window.data_nodes = {nodes};\n')
-        page_f.write(f"window.data_edges = {self.relations};</script>\n")
+
+        relations = self.relations
+        summaries = []
+        if 0 < Graph.summary_nodes < len(nodes):
+            nodes, relations, summaries = self.summarize(nodes, relations)
+
+        # Columnar layout (one array per attribute), decoded by graph.js
+        graph_data = {
+            "nodes": {key: [node[key] for node in nodes] for key in NODE_COLUMNS},
+            "edges": {
+                key: [relation[key] for relation in relations] for key in EDGE_COLUMNS
+            },
+        }
+        if summaries:
+            graph_data["summaries"] = summaries
+        if Graph.compute_layout:
+            layers, orders = self.layout(nodes, relations)
+            graph_data["nodes"]["layer"] = layers
+            graph_data["nodes"]["order"] = orders
+        script = b"window.graph_data = " + json_bytes(graph_data) + b";\n"
+
+        page_name = getattr(page_f, "name", None)
+        if not isinstance(page_name, str):
+            # Not a page file, the data is written in the page
+            page_f.write(
+                '<script type="text/javascript">'
+                + script.decode("utf-8").replace("</", "<\\/")
+                + "</script>\n"
+            )
+            return
+
+        # Data file next to the page, loaded with a script tag as
+        # fetch() is not allowed on file:// URLs
+        data_file = Path(page_name)
+        data_file = data_file.with_name(data_file.stem + "_graph.js")
+        page_writer.write(data_file, script)
+        page_f.write(
+            f'<script type="text/javascript" src="{quote(data_file.name)}"></script>\n'
+        )
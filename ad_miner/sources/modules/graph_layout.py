@@ -0,0 +1,111 @@
+import numpy as np
+
+# Barycenter sweeps ordering the nodes of each layer (one sweep goes down
+# the layers, the next one goes back up)
+ORDER_SWEEPS = 8
+
+
+def depth_first_postorder(count, sources, targets):
+    """Rank of each node in the postorder of a depth-first search of the
+    graph, started from the nodes in index order"""
+    by_source = np.argsort(sources, kind="stable")
+    starts = np.searchsorted(sources[by_source], np.arange(count + 1)).tolist()
+    children = targets[by_source].tolist()
+
+    postorder = [0] * count
+    visited = [False] * count
+    counter = 0
+    for root in range(count):
+        if visited[root]:
+            continue
+        visited[root] = True
+        stack = [[root, starts[root]]]
+        while stack:
+            top = stack[-1]
+            if top[1] < starts[top[0] + 1]:
+                child = children[top[1]]
+                top[1] += 1
+                if not visited[child]:
+                    visited[child] = True
+                    stack.append([child, starts[child]])
+            else:
+                stack.pop()
+                postorder[top[0]] = counter
+                counter += 1
+    return np.array(postorder, dtype=np.int64)
+
+
+def layered_layout(count, sources, targets, sweeps=ORDER_SWEEPS):
+    """Layered (Sugiyama) layout of a directed graph of count nodes, with
+    the edges sources[i] -> targets[i] (node indexes).
+
+    Returns the layer of each node (the longest path leading to it, once
+    the cycles are broken) and its order in its layer, which reduces the
+    edge crossings between layers (barycenter heuristic)."""
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+
+    # In a depth-first search, only the edges going back to a node being
+    # explored lead to a node finished later: they are dropped to break
+    # the cycles, and the other edges follow the reverse postorder
+    postorder = depth_first_postorder(count, sources, targets)
+    kept = postorder[sources] > postorder[targets]
+    sources, targets = sources[kept], targets[kept]
+
+    layer = [0] * count
+    by_postorder = np.argsort(-postorder[sources], kind="stable")
+    for source, target in zip(
+        sources[by_postorder].tolist(), targets[by_postorder].tolist()
+    ):
+        if layer[target] <= layer[source]:
+            layer[target] = layer[source] + 1
+    layer = np.array(layer, dtype=np.int64)
+
+    # Nodes of each layer, first ordered as in the paths, with their
+    # position in their layer (between 0 and 1, to compare layers of
+    # different sizes)
+    layer_count = int(layer.max(initial=-1)) + 1
+    layer_nodes = np.lexsort((np.arange(count), layer))
+    layer_bounds = np.searchsorted(layer[layer_nodes], np.arange(layer_count + 1))
+    layer_size = np.diff(layer_bounds)
+    index_in_layer = np.empty(count, dtype=np.int64)
+    index_in_layer[layer_nodes] = np.arange(count) - layer_bounds[layer[layer_nodes]]
+    position = (index_in_layer + 0.5) / np.maximum(layer_size[layer], 1)
+
+    # Edges grouped by the layer of their target (down sweeps) and of their
+    # source (up sweeps)
+    sweep_edges = []
+    for ends, neighbours in [(targets, sources), (sources, targets)]:
+        edges = np.argsort(layer[ends], kind="stable")
+        bounds = np.searchsorted(layer[ends][edges], np.arange(layer_count + 1))
+        sweep_edges.append((ends[edges], neighbours[edges], bounds))
+
+    # Each sweep moves the nodes of each layer to the barycenter of their
+    # neighbours in the previous layer (down sweeps) or in the next layer
+    # (up sweeps) that was just ordered
+    for sweep in range(sweeps):
+        ends, neighbours, bounds = sweep_edges[sweep % 2]
+        if sweep % 2 == 0:
+            layers = range(1, layer_count)
+        else:
+            layers = range(layer_count - 2, -1, -1)
+        for index in layers:
+            if layer_size[index] < 2 or bounds[index] == bounds[index + 1]:
+                continue
+            edges = slice(bounds[index], bounds[index + 1])
+            nodes = layer_nodes[layer_bounds[index] : layer_bounds[index + 1]]
+            local = index_in_layer[ends[edges]]
+            total = np.bincount(
+                local, weights=position[neighbours[edges]], minlength=len(nodes)
+            )
+            degree = np.bincount(local, minlength=len(nodes))
+            # Nodes without neighbours in this direction keep their place
+            barycenter = np.where(
+                degree > 0, total / np.maximum(degree, 1), position[nodes]
+            )
+            moved = nodes[np.lexsort((position[nodes], barycenter))]
+            position[moved] = (np.arange(len(nodes)) + 0.5) / len(nodes)
+
+    # Order in the layer of each node
+    order = np.rint(position * np.maximum(layer_size[layer], 1) - 0.5)
+    return layer, order.astype(np.int64)
@@ -0,0 +1,154 @@
+import base64
+import hashlib
+from pathlib import Path
+
+from ad_miner.sources.modules.utils import json_bytes
+
+# A graph page loads at most MAX_PAGE_CHUNKS data files of previous pages,
+# and only if it uses MIN_CHUNK_USAGE of their records: the other records
+# it needs are copied in its own data file
+MAX_PAGE_CHUNKS = 32
+MIN_CHUNK_USAGE = 0.5
+# Only the last data files containing a record are candidates to be loaded
+# for it (e.g. the domain admins group is in almost every data file)
+MAX_RECORD_CHUNKS = 8
+
+
+def _file_name(content: bytes) -> str:
+    # 72 bits of the hash in 12 characters, usable in file names
+    name = base64.urlsafe_b64encode(hashlib.md5(content).digest()[:9]).decode()
+    return name + ".js"
+
+
+class GraphStore:
+    """Report-wide store of the nodes and paths of the graph pages
+    (--graph_store), to avoid writing the same paths in thousands of pages.
+
+    A node is stored once with its style, and a path is stored as its first
+    node, the relation to the next node and the key of the rest of the path,
+    so paths sharing a suffix (e.g. the paths to domain admins of a computer,
+    prefixed by each of its admins) share its records. The records that are
+    new for a graph page are written in a data file named after the hash of
+    its content (store/<hash>.js), and the page only contains the keys of its
+    paths and the data files to load, resolved by graph.js.
+
+    Keys are numbers given in order: a page only loads the data files of its
+    own process (or of the main process, for forked control workers), so the
+    keys of the data files it loads never conflict."""
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        # Keys of the records already seen
+        self.node_keys = {}
+        self.path_keys = {}
+        # record key -> last data files containing the record
+        self.chunks = {"nodes": {}, "paths": {}}
+        # data file -> number of records
+        self.chunk_sizes = {}
+
+    def start(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.enabled = True
+
+    def nodeKey(self, graph, node, records):
+        instance, attributes = graph.nodeStyle(node)
+        label = node.name if node.name is not None else "???"
+        content = (node.id, label, node.domain, instance, tuple(attributes))
+        key = self.node_keys.get(content)
+        if key is None:
+            key = self.node_keys[content] = len(self.node_keys)
+        records["nodes"][key] = content
+        return key
+
+    def pathKey(self, node_key, relation, tail, records):
+        content = (node_key, relation, tail)
+        key = self.path_keys.get(content)
+        if key is None:
+            key = self.path_keys[content] = len(self.path_keys)
+        records["paths"][key] = content
+        return key
+
+    def writeChunk(self, records) -> str:
+        """Writes records in a data file named after its content,
+        and returns its name"""
+        data = [
+            [[key, *content] for key, content in records[kind].items()]
+            for kind in ["nodes", "paths"]
+        ]
+        content = (
+            b"(window.graph_store_chunks=window.graph_store_chunks||[]).push("
+            + json_bytes(data)
+            + b");\n"
+        )
+        name = _file_name(content)
+        chunk_file = self.directory / name
+        if not chunk_file.exists():
+            chunk_file.write_bytes(content)
+        return name
+
+    def writeGraph(self, graph, page_f, paths):
+        """Writes the new records of the paths of the graph in a data file,
+        and the keys of its paths and its data files in the page"""
+        records = {"nodes": {}, "paths": {}}
+        page_paths = {}
+        for path in paths:
+            tail = None
+            for i in range(len(path.nodes) - 1, -1, -1):
+                node = path.nodes[i]
+                node_key = self.nodeKey(graph, node, records)
+                relation = node.relation_type if tail is not None else None
+                tail = self.pathKey(node_key, relation, tail, records)
+            if tail is not None:
+                page_paths[tail] = True
+
+        # Number of records of the page in the data files of previous pages
+        usage = {}
+        for kind in ["nodes", "paths"]:
+            for key in records[kind]:
+                for name in self.chunks[kind].get(key, []):
+                    usage[name] = usage.get(name, 0) + 1
+        reused = [
+            name
+            for name in usage
+            if usage[name] >= self.chunk_sizes[name] * MIN_CHUNK_USAGE
+        ]
+        reused.sort(key=lambda name: usage[name], reverse=True)
+        chunks = dict.fromkeys(reused[:MAX_PAGE_CHUNKS], True)
+
+        new_records = {
+            kind: {
+                key: content
+                for key, content in records[kind].items()
+                if not any(name in chunks for name in self.chunks[kind].get(key, []))
+            }
+            for kind in ["nodes", "paths"]
+        }
+        if new_records["nodes"] or new_records["paths"]:
+            name = self.writeChunk(new_records)
+            chunks[name] = True
+            self.chunk_sizes[name] = len(new_records["nodes"]) + len(
+                new_records["paths"]
+            )
+            for kind in ["nodes", "paths"]:
+                for key in new_records[kind]:
+                    record_chunks = self.chunks[kind].setdefault(key, [])
+                    record_chunks.append(name)
+                    if len(record_chunks) > MAX_RECORD_CHUNKS:
+                        del record_chunks[0]
+
+        for name in chunks:
+            page_f.write(
+                f'<script type="text/javascript" src="../{self.directory.name}/{name}">'
+                "</script>\n"
+            )
+        page_f.write(
+            '<script type="text/javascript">window.graph_query = '
+            + json_bytes(list(page_paths)).decode("utf-8")
+            + ";</script>\n"
+        )
+
+
+# Shared by the graphs, disabled unless --graph_store is used
+graph_store = GraphStore()
@@ -1,8 +1,35 @@
 # row format : {key1 : {"value": value, "link":link}, key2 : value2}
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+import json
+from pathlib import Path
+from urllib.parse import quote
+
+from ad_miner.sources.modules.page_writer_class import page_writer
+from ad_miner.sources.modules.utils import (
+    HTML_DIRECTORY,
+    escape_script,
+    json_bytes,
+    read_template,
+    script_json,
+)
+
+
+def _sort_key(cell):
+    # Order of customComparator in grid_template.html: values of the links,
+    # numbers before strings
+    if isinstance(cell, dict):
+        cell = cell.get("value")
+    if isinstance(cell, str):
+        return (1, cell)
+    if isinstance(cell, (int, float)):
+        return (0, cell)
+    return (0, 0)
 
 
 class Grid:
+    # Grids with more rows are written in data files of chunk_rows rows,
+    # loaded while scrolling (--grid_chunk_rows, 0 to disable)
+    chunk_rows = 0
+
     def __init__(self, title, template="grid", classes="thead-light"):
         self.template_base_path = HTML_DIRECTORY / "components/grid/"
         self.title = title
@@ -21,48 +48,139 @@ class Grid:
         return self.headers
 
     def setData(self, data):
+        """Rows of the grid: a list of rows, the JSON string of a list of
+        rows, or columns ({key: [value of each row]})"""
         self.data = data
 
     def render(self, page_f):
-        with open(self.template_base_path / (self.template + "_template.html"), "r") as grid_template:
-            # Grid data that will be inserted in the template
-            textToInsert = "var columnDefs = ["
-            for header in self.headers:
-                textToInsert += """{
-                    field:\"%s\",
-                    cellRenderer: function(params) {
-                        if (typeof params.data[params.column.colId] === 'object') {
-                            if (params.data[params.column.colId].value == \"0\") {
-                                return params.data[params.column.colId].value;
-                            }
-                            if (params.data[params.column.colId].link == 'FALSE_LINK') {
-                                params.data[params.column.colId] = '<p>' + params.data[params.column.colId].value + '</p>';
-                                return params.data[params.column.colId];
-                            }
-                            if (params.data[params.column.colId].link != null) {
-                                if (params.data[params.column.colId].before_link != null) {
-                                    var prepend = params.data[params.column.colId].before_link;
-                                }
-                                else {
-                                    var prepend = "";
-                                }
-                                params.data[params.column.colId] = prepend + '<a onMouseOver="this.style.color=#99c3ff" onMouseOut="this.style.color=#000" href="' + params.data[params.column.colId].link + '">'+ params.data[params.column.colId].value + '</a>';
-                                return params.data[params.column.colId];
-                            }
-                            return params.data[params.column.colId];
-                        }
-                        else {
-                            return params.value;
-                        }
-                    },
-                },""" % (
-                    header
-                )
-
-            textToInsert = textToInsert + "];\nvar rowData=%s;\n" % (self.data)
-
-            template_contents = grid_template.read()
-
-            new_contents = template_contents.replace("// DATA PLACEHOLDER", textToInsert)
-
-            page_f.write(new_contents)
+        template_contents = read_template(
+            self.template_base_path / (self.template + "_template.html")
+        )
+        before_data, _, after_data = template_contents.partition("// DATA PLACEHOLDER")
+
+        chunked = self.renderChunks(page_f)
+        page_f.write(before_data)
+        page_f.write("var columnDefs = gridColumnDefs(%s);\n" % script_json(self.headers))
+        page_f.write("var rowData = ")
+        if chunked:
+            # See grid_chunks.html
+            page_f.write("gridAllRows ? gridLoadedRows() : []")
+        else:
+            self.renderRows(page_f)
+        page_f.write(";\n")
+        page_f.write(after_data)
+
+    def renderRows(self, page_f):
+        """Writes the rows, column by column when the rows have the same keys
+        (in the same order, as the template reads the keys by position):
+        the keys are written once instead of once per row, and the JSON of
+        a single column is in memory at a time"""
+        if isinstance(self.data, str):
+            # Rows serialized by the control
+            page_f.write(escape_script(self.data) if self.data else "[]")
+            return
+
+        if isinstance(self.data, dict):
+            keys = list(self.data)
+            columns = self.data.values()
+        else:
+            rows = self.data
+            keys = ()
+            if len(rows) > 0 and isinstance(rows[0], dict):
+                keys = tuple(rows[0])
+            if len(keys) == 0 or any(tuple(row) != keys for row in rows):
+                page_f.write(script_json(rows))
+                return
+            columns = ([row[key] for row in rows] for key in keys)
+
+        page_f.write("gridRows(%s, [" % script_json(keys))
+        for index, column in enumerate(columns):
+            if index > 0:
+                page_f.write(",")
+            page_f.write(script_json(column))
+        page_f.write("])")
+
+    def renderChunks(self, page_f) -> bool:
+        """Writes the rows in data files next to the page if there are more
+        than chunk_rows rows, with the order of the rows sorted by each
+        column. Returns whether the rows were written in data files."""
+        page_name = getattr(page_f, "name", None)
+        if Grid.chunk_rows <= 0 or not isinstance(page_name, str):
+            return False
+
+        data = self.data
+        if isinstance(data, str):
+            # A row takes at least 3 characters ({},)
+            if len(data) <= 3 * Grid.chunk_rows:
+                return False
+            data = json.loads(data)
+        if isinstance(data, dict):
+            keys = list(data)
+            count = len(data[keys[0]]) if len(keys) > 0 else 0
+        else:
+            keys = None
+            count = len(data)
+            if not all(isinstance(row, dict) for row in data):
+                return False
+        if count <= Grid.chunk_rows:
+            return False
+
+        if keys is None:
+            # Written column by column if the rows have the same keys
+            first_keys = tuple(data[0])
+            if all(tuple(row) == first_keys for row in data):
+                keys = list(first_keys)
+                data = {key: [row[key] for row in data] for key in keys}
+
+        def column(key, start, end):
+            if keys is None:
+                return [row.get(key) for row in data[start:end]]
+            return data.get(key, [None] * count)[start:end]
+
+        page_file = Path(page_name)
+        files = []
+        for index, start in enumerate(range(0, count, Grid.chunk_rows)):
+            end = start + Grid.chunk_rows
+            if keys is None:
+                chunk = {"rows": data[start:end]}
+            else:
+                chunk = {
+                    "keys": keys,
+                    "columns": [column(key, start, end) for key in keys],
+                }
+            chunk_file = page_file.with_name(f"{page_file.stem}_grid_{index}.js")
+            page_writer.write(
+                chunk_file,
+                b"window.grid_chunks[%d] = " % index
+                + json_bytes(chunk, default=str)
+                + b";\n",
+            )
+            files.append(quote(chunk_file.name))
+
+        orders = {}
+        for index, header in enumerate(self.headers):
+            values = column(header, 0, count)
+            order = sorted(range(count), key=lambda row: _sort_key(values[row]))
+            order_file = page_file.with_name(f"{page_file.stem}_grid_order_{index}.js")
+            page_writer.write(
+                order_file,
+                b"window.grid_orders[" + json_bytes(header) + b"] = "
+                + json_bytes(order)
+                + b";\n",
+            )
+            orders[header] = quote(order_file.name)
+
+        page_f.write(
+            '<script type="text/javascript">var gridChunks = %s;</script>\n'
+            % script_json(
+                {
+                    "size": Grid.chunk_rows,
+                    "count": count,
+                    "files": files,
+                    "orders": orders,
+                }
+            )
+        )
+        page_f.write(read_template(self.template_base_path / "grid_chunks.html"))
+        return True
+
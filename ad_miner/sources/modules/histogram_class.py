@@ -1,4 +1,4 @@
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, read_template
 
 
 class Histogram:
@@ -21,16 +21,14 @@ class Histogram:
     def render(self, page_f):
 
         # write header
-        with open(
-            self.template_base_path / (self.template + "_header.html"), "r"
-        ) as header_f:
-            html_header = header_f.read()
-            page_f.write(html_header)
-        
-        with open(
-            self.template_base_path / (self.template + "_footer.html"), "r", encoding='utf-8'
-        ) as footer_f:
-            content = footer_f.read() % (self.data1, self.data2)
-            page_f.write(content.encode('utf-8', errors='replace').decode('utf-8'))
+        page_f.write(
+            read_template(self.template_base_path / (self.template + "_header.html"))
+        )
+
+        html_footer = read_template(
+            self.template_base_path / (self.template + "_footer.html")
+        )
+        content = html_footer % (self.data1, self.data2)
+        page_f.write(content.encode('utf-8', errors='replace').decode('utf-8'))
 
         
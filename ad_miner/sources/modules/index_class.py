@@ -0,0 +1,83 @@
+from ad_miner.sources.modules.path_neo4j import Path
+
+
+def _object_name(item):
+    if isinstance(item, Path):
+        return item.nodes[0].name
+    return item["name"]
+
+
+def _object_id(item):
+    if isinstance(item, Path):
+        return item.nodes[0].id
+    return item["id"]
+
+
+def _object_domain(item):
+    # Paths are split by the domain of their target, as in compute_common_cache
+    if isinstance(item, Path):
+        return item.nodes[-1].domain
+    return item["domain"]
+
+
+class ResultsIndex:
+    """Lookups over the requests results, to replace the linear scans of
+    the results in the controls.
+
+    Each index maps a key (name, id, domain, start or end node of the paths,
+    or any field of the rows) to the list of the results with this key.
+    Indexes are built on first use and shared by every control, see
+    compute_common_cache (requests_results["index"])."""
+
+    def __init__(self, requests_results):
+        self.requests_results = requests_results
+        self.indexes = {}
+
+    def build(self, request_key, index_name, key) -> dict:
+        if (request_key, index_name) not in self.indexes:
+            index = {}
+            for item in self.requests_results.get(request_key) or []:
+                try:
+                    item_key = key(item)
+                except (KeyError, IndexError, TypeError, AttributeError):
+                    continue
+                if item_key is None:
+                    continue
+                if item_key not in index:
+                    index[item_key] = []
+                index[item_key].append(item)
+            self.indexes[(request_key, index_name)] = index
+        return self.indexes[(request_key, index_name)]
+
+    def byName(self, request_key) -> dict:
+        """Rows by name, paths by name of their start node"""
+        return self.build(request_key, "name", _object_name)
+
+    def byId(self, request_key) -> dict:
+        """Rows by id, paths by id of their start node"""
+        return self.build(request_key, "id", _object_id)
+
+    def byDomain(self, request_key) -> dict:
+        """Rows by domain, paths by domain of their end node"""
+        return self.build(request_key, "domain", _object_domain)
+
+    def byStartNode(self, request_key) -> dict:
+        """Paths by name of their start node"""
+        return self.build(request_key, "start", lambda path: path.nodes[0].name)
+
+    def byEndNode(self, request_key) -> dict:
+        """Paths by name of their end node"""
+        return self.build(request_key, "end", lambda path: path.nodes[-1].name)
+
+    def byField(self, request_key, field) -> dict:
+        """Rows by the value of one of their fields (key or position)"""
+        return self.build(request_key, ("field", field), lambda row: row[field])
+
+    def __getstate__(self):
+        # Only a cache over the other results: it is not part of the
+        # fingerprints of the results (--check_controls)
+        return {}
+
+    def __setstate__(self, state):
+        self.requests_results = {}
+        self.indexes = {}
@@ -1,6 +1,6 @@
 import re
 
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, read_template
 
 
 class Line:
@@ -38,10 +38,7 @@ class Line:
 
     def render(self, page_f):
 
-        with open(
-            self.template_base_path / (self.template + "_line.html"), "r"
-        ) as line_f:
-            html_line = line_f.read()
+        html_line = read_template(self.template_base_path / (self.template + "_line.html"))
         if self.href:
             self.href = self.href % self.decorateTextNumbers(self.text)
             html_line = html_line % (self.icon, self.color, self.href)
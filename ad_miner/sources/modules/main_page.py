@@ -7,7 +7,9 @@ from numpy import pi, cos, sin, linspace
 from random import randint
 
 from ad_miner.sources.modules import common_analysis
+from ad_miner.sources.modules.report_bundle_class import report_bundle
 from ad_miner.sources.modules.smolcard_class import SmolCard
+from ad_miner.sources.modules.template_class import compile_template
 from ad_miner.sources.modules.utils import TEMPLATES_DIRECTORY
 
 
@@ -620,39 +622,21 @@ def render(
         with (TEMPLATES_DIRECTORY / "main_header.html").open(mode="r") as header_f:
             # This part extracts the {{something}} variables in the html template and replaces them with their value in the getData function
             # Every ` char will be skipped
-            original = header_f.read()
-            content = ""
-
-            i = 0
-            while i < len(original):
-                if original[i] == "{" and original[i + 1] == "{":
-                    j = 2
-                    key = ""
-                    while original[i + j] != "}" and original[i + j + 1] != "}":
-                        key += original[i + j]
-                        j += 1
-                    key += original[i + j]
-                    try:
-                        if "on_premise|" in key:
-                            content += str(
-                                data["on_premise"][key.split("on_premise|")[1]]
-                            )
-
-                        elif "azure|" in key:
-                            content += str(data["azure"][key.split("azure|")[1]])
-                        else:
-                            content += str(data[key])
-
-                    except KeyError:
-                        content += "N/A"
-                    i += len(key) + 4
-                elif original[i] == "`":
-                    i += 1
-                else:
-                    content += original[i]
-                    i += 1
-
-            page_f.write(content)
+            template = compile_template(header_f.read())
+            values = {}
+            for key in template.keys:
+                try:
+                    if "on_premise|" in key:
+                        values[key] = data["on_premise"][key.split("on_premise|")[1]]
+                    elif "azure|" in key:
+                        values[key] = data["azure"][key.split("azure|")[1]]
+                    else:
+                        values[key] = data[key]
+                except KeyError:
+                    # Filled with N/A
+                    pass
+
+            page_f.write(template.render(values))
 
             # secondary = Page(arguments.cache_prefix, "cards", f"{arguments.cache_prefix} - {arguments.extract_date[-2:]}/{arguments.extract_date[-4:-2]}/{arguments.extract_date[:4]}", "Following data provide indicators to measure the cybersecurity risk exposure of your Active Directory infrastructure",include_js=["hide_cards"])
             # descriptions = json.load(open('description.json'))
@@ -670,7 +654,7 @@ def render(
                         cardsHtml += SmolCard(
                             id=vuln,
                             criticity=str(k),
-                            href=f"{vuln}.html",
+                            href=report_bundle.pageLink(f"{vuln}.html"),
                             description=description,
                             details=dico_name_description.get(vuln),
                             evolution_data=data["dico_data_evolution_time"],
@@ -699,6 +683,12 @@ def render(
                 """
 
             page_f.write(modal_header + cardsHtml + modal_footer)
+            if report_bundle.enabled:
+                # Links to the pages of report.html (--single_page)
+                page_f.write(
+                    '<script type="text/javascript" src="../pages/index.js"></script>\n'
+                    '<script type="text/javascript" src="../js/report.js"></script>\n'
+                )
             # html = secondary.returnHtml()
 
     with open(
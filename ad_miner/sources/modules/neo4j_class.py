@@ -13,8 +13,16 @@ import neo4j  # TO REPLACE BY 'from neo4j import GraphDatabase' after neo4j fix
 from urllib.parse import quote
 
 
-from ad_miner.sources.modules import cache_class, logger, generic_computing
+from ad_miner.sources.modules import (
+    cache_class,
+    logger,
+    generic_computing,
+    overlay_class,
+    telemetry_class,
+)
+from ad_miner.sources.modules.profiler_class import profiler
 from ad_miner.sources.modules.graph_class import Graph
+from ad_miner.sources.modules.index_class import ResultsIndex
 from ad_miner.sources.modules.node_neo4j import Node
 from ad_miner.sources.modules.path_neo4j import Path
 from ad_miner.sources.modules.utils import timer_format, grid_data_stringify
@@ -156,7 +164,21 @@ class Neo4j:
 
         self.extract_date = self.set_extract_date(str(extract_date_int))
 
-        self.gds_cost_type_table = {}
+        # Set by the post-processing of check_if_GDS_installed
+        self.gds = False
+
+        # (orientation, relation types) of the gds request being processed,
+        # used to find the real relation types of the GDS paths
+        self.gds_path_relations = None
+
+        # Shared GDS projections, by orientation : {orientation: (name, relation types)}
+        self.gds_projections = {}
+
+        # Flags kept on the client side instead of the database (--read_only)
+        self.overlay = overlay_class.Overlay()
+
+        # Execution statistics of the requests, exported to perf.json
+        self.telemetry = telemetry_class.Telemetry()
 
         recursive_level = arguments.level
         self.password_renewal = int(arguments.renewal_password)
@@ -183,6 +205,20 @@ class Neo4j:
 
             del self.all_requests["template"]
 
+            fields_to_replace = [
+                "request",
+                "scope_query",
+                "create_gds_graph",
+                "gds_request",
+                "gds_scope_query",
+                "gds_relationships",
+                "drop_gds_graph",
+                "reverse_bfs_targets",
+                "reverse_bfs_sources",
+                "reverse_bfs_edges",
+                "reverse_bfs_write",
+            ]
+
             for request_key in self.all_requests.keys():
                 # Replace methods with python methods
                 self.all_requests[request_key]["output_type"] = {
@@ -202,14 +238,16 @@ class Neo4j:
                     "$inbound_control_edges$": inbound_control_edges,
                 }
 
-                fields_to_replace = [
-                    "request",
-                    "scope_query",
-                    "create_gds_graph",
-                    "gds_request",
-                    "gds_scope_query",
-                    "drop_gds_graph",
-                ]
+                # Use the read-only versions of the requests
+                if arguments.read_only:
+                    request = self.all_requests[request_key]
+                    for field in fields_to_replace:
+                        if "read_only_" + field in request:
+                            request[field] = request["read_only_" + field]
+                    flags, flag_columns, value_columns = self.overlay.requestProperties(
+                        request
+                    )
+                    self.overlay.declare(flags + flag_columns, value_columns)
 
                 for variable in variables_to_replace.keys():
                     for field in fields_to_replace:
@@ -249,6 +287,25 @@ class Neo4j:
 
         else:  # Deep version of GPO requests
             del self.all_requests["unpriv_users_to_GPO"]
+
+        if arguments.read_only:
+            # Flags computed by AD Miner are read from the overlay
+            for request in self.all_requests.values():
+                read_only_cache = "is_a_write_request" in request
+                for field in fields_to_replace:
+                    if field in request:
+                        query = self.overlay.rewrite(request[field])
+                        read_only_cache = (
+                            read_only_cache
+                            or query != request[field]
+                            or "read_only_" + field in request
+                            or self.overlay.isWriteQuery(query)
+                        )
+                        request[field] = query
+                # The results of these requests differ from the results of
+                # a normal run (overlay IDs instead of writes, skipped writes)
+                # and are cached apart
+                request["read_only_cache"] = read_only_cache
         try:
             self.edges_rating = json.loads(
                 (MODULES_DIRECTORY / "exploitability_ratings.json").read_text(
@@ -284,17 +341,124 @@ class Neo4j:
             sys.exit(-1)
 
     def close(self):
+        self.dropGdsProjections()
         self.driver.close()
 
+    def getGdsProjection(self, request):
+        """Returns the name of the shared GDS projection used by a gds request,
+        and the relation types the request should be filtered on.
+        There is one native projection per orientation, built on first use
+        with the relations of every gds request, and reused by all of them."""
+        orientation = request.get("gds_orientation", "REVERSE")
+
+        if orientation not in self.gds_projections:
+            with self.driver.session() as session:
+                with session.begin_transaction() as tx:
+                    database_relation_types = set(
+                        tx.run(
+                            "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+                        ).value()
+                    )
+
+            # Relations needed by every gds request sharing this orientation
+            projected_types = []
+            for other_request in self.all_requests.values():
+                if other_request.get("gds_orientation", "REVERSE") != orientation:
+                    continue
+                for relation_type in other_request.get("gds_relationships", "").split(
+                    "|"
+                ):
+                    if (
+                        relation_type in database_relation_types
+                        and relation_type not in projected_types
+                    ):
+                        projected_types.append(relation_type)
+
+            graph_name = "ad_miner_" + orientation.lower()
+            relationship_projection = {
+                relation_type: {
+                    "type": relation_type,
+                    "orientation": orientation,
+                    "properties": {
+                        "cost": {
+                            "property": "cost",
+                            "defaultValue": self.edges_rating.get(relation_type, 100),
+                        }
+                    },
+                }
+                for relation_type in projected_types
+            }
+
+            starting_time = time.time()
+            if len(projected_types) > 0:
+                # Projections live in the memory of each neo4j server
+                # running gds requests
+                self.writeWithParameters(
+                    self,
+                    "CALL gds.graph.project($name, '*', $relationships) YIELD graphName",
+                    {"name": graph_name, "relationships": relationship_projection},
+                    all_cluster_nodes=True,
+                )
+            logger.print_debug(
+                f"GDS projection {graph_name} created with {len(projected_types)} relation types in {round(time.time() - starting_time, 2)}s"
+            )
+            self.gds_projections[orientation] = (graph_name, projected_types)
+
+        graph_name, projected_types = self.gds_projections[orientation]
+        relationship_types = [
+            relation_type
+            for relation_type in request["gds_relationships"].split("|")
+            if relation_type in projected_types
+        ]
+        return graph_name, relationship_types
+
+    def dropGdsProjections(self):
+        """Drop the shared GDS projections created by getGdsProjection()"""
+        for graph_name, projected_types in self.gds_projections.values():
+            if len(projected_types) == 0:
+                continue
+            self.writeWithParameters(
+                self,
+                "CALL gds.graph.drop($name, false) YIELD graphName",
+                {"name": graph_name},
+                all_cluster_nodes=True,
+            )
+            logger.print_debug("GDS projection " + graph_name + " dropped")
+        self.gds_projections = {}
+
+    def getGdsConcurrency(self, parallel_calls):
+        """Returns the number of threads of each GDS call, so that the
+        parallel calls share the cores instead of competing for them"""
+        if self.arguments.gds_concurrency > 0:
+            return self.arguments.gds_concurrency
+        if len(self.arguments.cluster) > 0:
+            nb_cores = sum(self.cluster.values())
+        else:
+            nb_cores = mp.cpu_count()
+        simultaneous_calls = max(1, min(parallel_calls, nb_cores))
+        # GDS community edition refuses a concurrency higher than 4
+        return max(1, min(4, nb_cores // simultaneous_calls))
+
     @staticmethod
     def executeParallelRequest(
-        value, identifier, query, arguments, output_type, server, gds_cost_type_table
+        value,
+        identifier,
+        query,
+        arguments,
+        output_type,
+        server,
+        gds_path_relations,
+        parameters=None,
     ):
         """This function is used in multiprocessing pools
-        to execute multiple query parts in parallel"""
+        to execute multiple query parts in parallel.
+        It returns the result and the telemetry of the query part"""
         q = query.replace("PARAM1", str(value)).replace("PARAM2", str(identifier))
         result = []
         bolt = server if server.startswith("bolt://") else "bolt://" + server
+        chunk = telemetry_class.ChunkTelemetry(
+            server, int(value), int(identifier), arguments.profile
+        )
         driver = GraphDatabase.driver(
             bolt,
             auth=(arguments.username, arguments.password),
@@ -303,14 +467,18 @@ class Neo4j:
         with driver.session() as session:
             with session.begin_transaction() as tx:
                 if output_type is Graph:
-                    for record in tx.run(q):
+                    records = tx.run(q, parameters)
+                    for record in records:
                         result.append(record["p"])
                         # Quick way to handle multiple records
                         # (e.g., RETURN p, p2)
                         if "p2" in record:
                             result.append(record["p2"])
+                    chunk.setSummary(records.consume())
                     try:
-                        result = Neo4j.computePathObject(result, gds_cost_type_table)
+                        result = Neo4j.computePathObject(
+                            result, gds_path_relations, tx
+                        )
                     except Exception as e:
                         logger.print_error(
                             "An error while computing path object of this query:\n" + q
@@ -318,18 +486,20 @@ class Neo4j:
                         logger.print_error(e)
 
                 else:
-                    result = tx.run(q)
+                    records = tx.run(q, parameters)
                     if output_type is list:
-                        result = result.values()
+                        result = records.values()
                     else:  # then it should be dict ?
-                        result = result.data()
+                        result = records.data()
+                    chunk.setSummary(records.consume())
 
-        return result
+        return result, chunk.toDict(result)
 
     @staticmethod
     def process_request(self, request_key):
+        self.telemetry.startRequest(request_key, self.all_requests[request_key]["name"])
         if self.cache_enabled:  # If cache enable, try to retrieve from cache
-            result = self.cache.retrieveCacheEntry(request_key)
+            result = self.cache.retrieveCacheEntry(self.cacheKey(request_key))
             if result is None:
                 result = []
             if result is not False:  # Sometimes result = []
@@ -339,35 +509,102 @@ class Neo4j:
                 )
                 self.all_requests[request_key]["result"] = result
                 if "postProcessing" in self.all_requests[request_key]:
-                    self.all_requests[request_key]["postProcessing"](self, result)
+                    with profiler.phase("postProcessing." + request_key):
+                        self.all_requests[request_key]["postProcessing"](self, result)
+                self.updateOverlay(self.all_requests[request_key], result)
+                self.telemetry.endRequest(result, "cache")
                 return result
 
         request = self.all_requests[request_key]
         logger.print_debug("Requesting : %s" % request["name"])
         start = time.time()
         result = []
+        self.gds_path_relations = None
+        # Query (and its parameters) profiled if the request is slow
+        profiled_query = None
+        profiled_sample = False
 
-        # Create neo4j GDS graph if plugin installed and request adapted
+        # Use the shared neo4j GDS projection (or create the legacy dedicated
+        # GDS graph) if plugin installed and request adapted
         # Also replace the classic request and scope query with the GDS ones
-        if "is_a_gds_request" in request and self.gds:
+        gds_used = "is_a_gds_request" in request and self.gds
+        if gds_used and "gds_relationships" in request:
+            graph_name, relationship_types = self.getGdsProjection(request)
+            if len(relationship_types) == 0:
+                # Dijkstra cannot be filtered on an empty list of relations,
+                # the classic request is cheap as there is nothing to traverse
+                logger.print_warning(
+                    "None of the relations of this request exist, GDS is not used."
+                )
+                gds_used = False
+            else:
+                request["request"] = (
+                    request["gds_request"]
+                    .replace("$gds_graph$", graph_name)
+                    .replace("$gds_relationship_types$", json.dumps(relationship_types))
+                )
+                self.gds_path_relations = (
+                    request.get("gds_orientation", "REVERSE"),
+                    relationship_types,
+                    {t: self.edges_rating.get(t, 100) for t in relationship_types},
+                )
+        elif gds_used:
             q = request["create_gds_graph"]
             with self.driver.session() as session:
                 with session.begin_transaction() as tx:
                     tx.run(q)
 
             request["request"] = request["gds_request"]
+            # Relation types of the dedicated graph are unknown, any is allowed
+            self.gds_path_relations = (
+                request.get("gds_orientation", "REVERSE"),
+                None,
+                self.edges_rating,
+            )
 
+        if gds_used:
             if "gds_scope_query" in request:
                 request["scope_query"] = request["gds_scope_query"]
-            elif "scope_query" in request:
-                del request["scope_query"]
+            else:
+                request["request"] = request["request"].replace(
+                    "$gds_concurrency$", str(self.getGdsConcurrency(1))
+                )
+                if "scope_query" in request:
+                    del request["scope_query"]
+
+        # In read-only mode, requests that write to the database are skipped
+        if self.arguments.read_only and self.overlay.isWriteQuery(request["request"]):
+            logger.print_warning("Read-only mode : write request skipped")
+            request["result"] = []
+            self.telemetry.endRequest([], "skipped")
+            return []
+
+        # Read-only versions of the write requests are executed as reads, as
+        # well as the gds requests whose writes are done by gds_write (a
+        # write request would be executed on every node of the cluster)
+        is_a_write_request = (
+            "is_a_write_request" in request
+            and not self.arguments.read_only
+            and not (gds_used and "gds_write" in request)
+        )
 
-        if "scope_query" in request:
+        # Without GDS, paths can be computed with one backward traversal
+        # from all the targets instead of one shortestPath per source
+        use_reverse_bfs = (
+            self.arguments.reverse_bfs
+            and "reverse_bfs_targets" in request
+            and not gds_used
+        )
+
+        if use_reverse_bfs:
+            result = self.reverseBfsRequest(self, request_key)
+        elif "scope_query" in request:
             with self.driver.session() as session:
                 with session.begin_transaction() as tx:
                     scopeQuery = request["scope_query"]
-                    if tx.run(scopeQuery).value() != []:
-                        scopeSize = tx.run(scopeQuery).value()[0]
+                    parameters = self.overlay.parameters(scopeQuery)
+                    if tx.run(scopeQuery, parameters).value() != []:
+                        scopeSize = tx.run(scopeQuery, parameters).value()[0]
                     else:
                         scopeSize = 0
 
@@ -379,81 +616,311 @@ class Neo4j:
             space = np.linspace(0, scopeSize, part_number + 1, dtype=int)
             output_type = self.all_requests[request_key]["output_type"]
 
+            query = request["request"]
+            if gds_used:
+                # Each part streams Dijkstra from its own subset of targets
+                query = query.replace(
+                    "$gds_concurrency$", str(self.getGdsConcurrency(part_number))
+                )
+
+            parameters = self.overlay.parameters(query)
+            if len(space) > 1:
+                profiled_query = query.replace("PARAM1", "0").replace(
+                    "PARAM2", str(space[1] - space[0])
+                )
+                profiled_sample = True
+
             # Divide the request with SKIP & LIMIT
             for i in range(len(space) - 1):
                 items.append(
                     [
                         space[i],
                         space[i + 1] - space[i],
-                        request["request"],
+                        query,
                         self.arguments,
                         output_type,
-                        self.gds_cost_type_table,
+                        self.gds_path_relations,
+                        parameters,
                     ]
                 )
 
-            if "is_a_write_request" in request:
+            if is_a_write_request:
                 result = self.parallelWriteRequest(self, items)
             else:
                 result = self.parallelRequest(self, items)
 
-        elif "is_a_write_request" in request:  # Not parallelized write request
+        elif is_a_write_request:  # Not parallelized write request
             result = self.writeRequest(self, request_key)
+            profiled_query = request["request"]
         else:  # Simple not parallelized read request
             result = self.simpleRequest(self, request_key)
+            profiled_query = request["request"]
 
         if result is None:
             result = []
 
-        if (
-            "is_a_gds_request" in request
-            and self.gds
-            and "reverse_path" in request
-            and request["reverse_path"]
-        ):
+        if gds_used and "reverse_path" in request and request["reverse_path"]:
             for path in result:
                 path.reverse()
 
+        # The parts of a split gds request share start nodes: they are only
+        # written once every part is done, as reverse_bfs_write does
+        if gds_used and "gds_write" in request and not self.arguments.read_only:
+            self.writeWithParameters(
+                self,
+                request["gds_write"],
+                {"ids": list({path.nodes[0].id for path in result})},
+            )
+
         if "postProcessing" in request:
-            request["postProcessing"](self, result)
+            with profiler.phase("postProcessing." + request_key):
+                request["postProcessing"](self, result)
+
+        self.updateOverlay(request, result)
+
+        slow_query_time = self.arguments.profile_slow_queries
+        if (
+            profiled_query is not None
+            and slow_query_time > 0
+            and time.time() - start > slow_query_time
+        ):
+            self.telemetry.addPlan(
+                self.profileRequest(
+                    self, profiled_query, profiled_sample, is_a_write_request
+                )
+            )
 
-        # If GDS installed and request adapted, dropping previously created graph
-        if "is_a_gds_request" in request and self.gds:
+        # Dropping the legacy dedicated GDS graph. Shared projections
+        # are dropped at the end of the requests by dropGdsProjections()
+        if gds_used and "drop_gds_graph" in request:
             q = request["drop_gds_graph"]
             with self.driver.session() as session:
                 with session.begin_transaction() as tx:
                     tx.run(q)
 
-        self.cache.createCacheEntry(request_key, result)
+        self.cache.createCacheEntry(self.cacheKey(request_key), result)
         logger.print_warning(
             timer_format(time.time() - start) + " - %d objects" % len(result)
         )
         request["result"] = result
+        self.telemetry.endRequest(result)
         return result
 
+    def cacheKey(self, request_key):
+        """Name of the cache entry of a request, with the _ro suffix for the
+        requests executed differently in read-only mode (--read_only)"""
+        if self.all_requests[request_key].get("read_only_cache"):
+            return request_key + "_ro"
+        return request_key
+
+    @staticmethod
+    def profileRequest(self, query, sample, write=False):
+        """Returns the query plan of a slow request with the rows and db hits
+        of each operator. Parallelized requests are profiled on their first
+        chunk (sample). The write requests are only explained, to avoid
+        executing their writes a second time."""
+        if not write and not self.overlay.isWriteQuery(query):
+            mode = "PROFILE"
+        else:
+            mode = "EXPLAIN"
+        logger.print_warning(f"Slow request, capturing its query plan ({mode})")
+        starting_time = time.time()
+        try:
+            with self.driver.session() as session:
+                with session.begin_transaction() as tx:
+                    summary = tx.run(
+                        mode + " " + query, self.overlay.parameters(query)
+                    ).consume()
+        except Exception as e:
+            logger.print_error("Query plan capture failed :")
+            logger.print_error(e)
+            return {"mode": mode, "query": query, "error": str(e)}
+
+        operators = telemetry_class.flatten_plan(
+            summary.profile if mode == "PROFILE" else summary.plan
+        )
+        db_hits = [o["db_hits"] for o in operators if o["db_hits"] is not None]
+        for operator in sorted(
+            operators, key=lambda o: o["db_hits"] or 0, reverse=True
+        )[:3]:
+            if operator["db_hits"]:
+                logger.print_debug(
+                    f"{operator['operator']} : {operator['db_hits']} db hits, {operator['rows']} rows"
+                )
+        return {
+            "mode": mode,
+            "query": query,
+            "sample": sample,
+            "time": round(time.time() - starting_time, 3),
+            "db_hits": sum(db_hits) if len(db_hits) > 0 else None,
+            "operators": operators,
+        }
+
+    def updateOverlay(self, request, result):
+        """In read-only mode, add the nodes returned by the request
+        to the overlay instead of setting a flag in the database"""
+        if self.arguments.read_only and any(self.overlay.requestProperties(request)):
+            self.overlay.update(request, result)
+
     @staticmethod
     def simpleRequest(self, request_key):
         request = self.all_requests[request_key]
         output_type = request["output_type"]
+        parameters = self.overlay.parameters(request["request"])
         result = []
+        chunk = telemetry_class.ChunkTelemetry(
+            self.arguments.bolt, measure_size=self.arguments.profile
+        )
         with self.driver.session() as session:
             with session.begin_transaction() as tx:
                 if output_type is Graph:
-                    for record in tx.run(request["request"]):
+                    records = tx.run(request["request"], parameters)
+                    for record in records:
                         result.append(record["p"])
                         # Quick way to handle multiple records
                         # (e.g., RETURN p, p2)
                         if "p2" in record:
                             result.append(record["p2"])
-                    result = self.computePathObject(result, self.gds_cost_type_table)
+                    chunk.setSummary(records.consume())
+                    result = self.computePathObject(
+                        result, self.gds_path_relations, tx
+                    )
                 else:
-                    result = tx.run(request["request"])
+                    records = tx.run(request["request"], parameters)
                     if output_type is list:
-                        result = result.values()
+                        result = records.values()
                     else:
-                        result = result.data()
+                        result = records.data()
+                    chunk.setSummary(records.consume())
+        self.telemetry.addChunk(chunk.toDict(result))
         return result
 
+    @staticmethod
+    def reverseBfsRequest(self, request_key):
+        """reverseBfsRequest computes a breadth first search backwards from
+        every target at once, and returns one shortest path per reachable
+        source. It replaces the SKIP/LIMIT shortestPath requests when GDS
+        is not installed (--reverse_bfs)"""
+        request = self.all_requests[request_key]
+        max_depth = int(self.arguments.level)
+
+        with self.driver.session() as session:
+            with session.begin_transaction() as tx:
+                targets, sources = [
+                    [r[0] for r in tx.run(q, self.overlay.parameters(q))]
+                    for q in (
+                        request["reverse_bfs_targets"],
+                        request["reverse_bfs_sources"],
+                    )
+                ]
+
+                # Relations are stored reversed: end node -> [(start node, type)]
+                reverse_adjacency = {}
+                nb_edges = 0
+                for start, end, relation_type in tx.run(
+                    request["reverse_bfs_edges"],
+                    self.overlay.parameters(request["reverse_bfs_edges"]),
+                ):
+                    reverse_adjacency.setdefault(end, []).append((start, relation_type))
+                    nb_edges += 1
+
+        logger.print_debug(
+            f"Reverse BFS : {len(targets)} targets, {len(sources)} sources, {nb_edges} relations"
+        )
+
+        # next_hop[node] = (next node towards the closest target, relation type)
+        next_hop = {target: None for target in targets}
+        frontier = targets
+        depth = 0
+        while frontier and depth < max_depth:
+            depth += 1
+            new_frontier = []
+            for node in frontier:
+                for predecessor, relation_type in reverse_adjacency.get(node, ()):
+                    if predecessor not in next_hop:
+                        next_hop[predecessor] = (node, relation_type)
+                        new_frontier.append(predecessor)
+            frontier = new_frontier
+        reverse_adjacency = None
+
+        raw_paths = []
+        for source in sources:
+            if next_hop.get(source) is None:  # No path, or source is a target
+                continue
+            raw_path = []
+            node = source
+            while next_hop[node] is not None:
+                following_node, relation_type = next_hop[node]
+                raw_path.append((node, relation_type))
+                node = following_node
+            raw_path.append((node, ""))
+            raw_paths.append(raw_path)
+
+        # Retrieve the attributes of the nodes that are part of a path
+        node_ids = list({node for raw_path in raw_paths for node, _ in raw_path})
+        nodes_attributes = {}
+        with self.driver.session() as session:
+            with session.begin_transaction() as tx:
+                for i in range(0, len(node_ids), 10000):
+                    for record in tx.run(
+                        "MATCH (n) WHERE ID(n) IN $ids RETURN ID(n) AS id, labels(n) AS labels, n.name AS name, n.domain AS domain, n.tenantid AS tenantid",
+                        ids=node_ids[i : i + 10000],
+                    ):
+                        nodes_attributes[record["id"]] = record
+
+        final_paths = []
+        for raw_path in raw_paths:
+            nodes = []
+            for node_id, relation_type in raw_path:
+                attributes = nodes_attributes[node_id]
+                nodes.append(
+                    Node(
+                        node_id,
+                        [i for i in attributes["labels"] if "Base" not in i][0],
+                        attributes["name"],
+                        attributes["domain"],
+                        attributes["tenantid"],
+                        relation_type,
+                    )
+                )
+            final_paths.append(Path(nodes))
+
+        if "reverse_bfs_write" in request and not self.arguments.read_only:
+            self.writeWithParameters(
+                self,
+                request["reverse_bfs_write"],
+                {"ids": [raw_path[0][0] for raw_path in raw_paths]},
+            )
+
+        return final_paths
+
+    @staticmethod
+    def writeWithParameters(self, query, parameters, all_cluster_nodes=False):
+        """Execute a parametrized write query on the main database,
+        or on every node of the cluster if there is more than one
+        (or if all_cluster_nodes is set, e.g. for GDS projections)"""
+        if len(self.arguments.cluster) > 0 and (
+            len(self.cluster) > 1 or all_cluster_nodes
+        ):
+            servers = list(self.cluster.keys())
+        else:
+            servers = [None]
+
+        for server in servers:
+            if server is None:
+                driver = self.driver
+            else:
+                driver = GraphDatabase.driver(
+                    "bolt://" + server,
+                    auth=(self.arguments.username, self.arguments.password),
+                    encrypted=False,
+                )
+            with driver.session() as session:
+                with session.begin_transaction() as tx:
+                    tx.run(query, **parameters)
+            if server is not None:
+                driver.close()
+
     @staticmethod
     def ClusterWriteRequest(self, request_key):
         """This function ensure that simple write
@@ -469,7 +936,7 @@ class Neo4j:
                 self.arguments,
                 self.all_requests[request_key]["output_type"],
                 server,
-                self.gds_cost_type_table,
+                self.gds_path_relations,
             )
             for server in self.cluster.keys()
         ]
@@ -491,7 +958,11 @@ class Neo4j:
                             + str(round(time.time() - starting_time, 2))
                             + "s."
                         )
-            temp_results = [task.get() for task in tasks.values()]
+            temp_results = []
+            for task in tasks.values():
+                temporary_result, chunk = task.get()
+                self.telemetry.addChunk(chunk)
+                temp_results.append(temporary_result)
             result = temp_results[0]
             # Same request executed on every node, we only need the result once
         return result
@@ -516,7 +987,8 @@ class Neo4j:
         def process_completed_task(
             number_of_retrieved_objects, task, active_jobs, jobs_done, pbar
         ):
-            temporary_result = task.get()
+            temporary_result, chunk = task.get()
+            self.telemetry.addChunk(chunk)
             # Update displayed number of retrieved objects
             if output_type == list:
                 if len(temporary_result) > 0:
@@ -590,7 +1062,8 @@ class Neo4j:
                             query,
                             arguments,
                             output_type,
-                            self.gds_cost_type_table,
+                            self.gds_path_relations,
+                            parameters,
                         ) = item
 
                         task = pool.apply_async(
@@ -602,7 +1075,8 @@ class Neo4j:
                                 arguments,
                                 output_type,
                                 server,
-                                self.gds_cost_type_table,
+                                self.gds_path_relations,
+                                parameters,
                             ),
                         )
                         temp_results.append(task)
@@ -624,7 +1098,7 @@ class Neo4j:
                                 pbar,
                             )
             for r in temp_results:
-                result += r.get()
+                result += r.get()[0]
         pbar.close()
         return result
 
@@ -640,23 +1114,27 @@ class Neo4j:
                 arguments,
                 output_type,
                 self.arguments.bolt,
-                gds_cost_type_table,
+                gds_path_relations,
+                parameters,
             )
-            for value, identifier, query, arguments, output_type, gds_cost_type_table in items
+            for value, identifier, query, arguments, output_type, gds_path_relations, parameters in items
         ]
 
         with mp.Pool(mp.cpu_count()) as pool:
             result = []
-            for _ in tqdm.tqdm(
+            for temporary_result, chunk in tqdm.tqdm(
                 pool.istarmap(self.executeParallelRequest, items),
                 total=len(items),
             ):
-                result += _
+                result += temporary_result
+                self.telemetry.addChunk(chunk)
         return result
 
     @staticmethod
     def setDangerousInboundOnGPOs(self, data):
         print("Entering Post processing")
+        if self.arguments.read_only:  # dangerous_inbound is in the overlay
+            return
         ids = []
         for d in data:
             ids.append(d.nodes[-1].id)
@@ -758,8 +1236,8 @@ class Neo4j:
 
         small_requests_to_do = {
             server: [
-                (value, identifier, query, arguments, output_type, server)
-                for value, identifier, query, arguments, output_type in items
+                (value, identifier, query, arguments, output_type, server, parameters)
+                for value, identifier, query, arguments, output_type, _, parameters in items
             ]
             for server in self.cluster.keys()
         }
@@ -787,6 +1265,7 @@ class Neo4j:
                         break
                     for task in active_jobs[server]:
                         if task.ready():
+                            self.telemetry.addChunk(task.get()[1])
                             active_jobs[server].remove(task)
                             pbar.update(1)
                     if (
@@ -814,6 +1293,7 @@ class Neo4j:
                             arguments,
                             output_type,
                             server,
+                            parameters,
                         ) = item
 
                         task = pool.apply_async(
@@ -825,7 +1305,8 @@ class Neo4j:
                                 arguments,
                                 output_type,
                                 server,
-                                self.gds_cost_type_table,
+                                self.gds_path_relations,
+                                parameters,
                             ),
                         )
                         if server == next(iter(self.cluster)):
@@ -840,6 +1321,7 @@ class Neo4j:
                 for server, max_jobs in self.cluster.items():
                     for task in active_jobs[server]:
                         if task.ready():
+                            self.telemetry.addChunk(task.get()[1])
                             active_jobs[server].remove(task)
                             pbar.update(1)
                     if (
@@ -856,14 +1338,20 @@ class Neo4j:
                             + "s."
                         )
             for r in temp_results:
-                result += r.get()
+                result += r.get()[0]
         pbar.close()
         return result
 
     @classmethod
-    def computePathObject(self, Paths, gds_cost_type_table):
+    def computePathObject(self, Paths, gds_path_relations=None, tx=None):
         """computePathObject allows object to be serialized and should
         be used when output_type == Graph"""
+        gds_relation_types = {}
+        if gds_path_relations is not None and tx is not None:
+            gds_relation_types = self.getGdsRelationTypes(
+                tx, Paths, gds_path_relations
+            )
+
         final_paths = []
         for path in Paths:
             if path is not None:
@@ -871,10 +1359,9 @@ class Neo4j:
                 for relation in path.relationships:
                     rtype = relation.type
                     if "PATH_" in rtype:
-                        gds_identifier = round(float(relation.get("cost")), 3)
-                        gds_identifier = round(1000 * (gds_identifier % 1))
-
-                        rtype = gds_cost_type_table[gds_identifier]
+                        rtype = gds_relation_types.get(
+                            (relation.start_node.id, relation.end_node.id), rtype
+                        )
 
                     for node in relation.nodes:
                         label = [i for i in node.labels if "Base" not in i][
@@ -907,6 +1394,52 @@ class Neo4j:
 
         return final_paths
 
+    @staticmethod
+    def getGdsRelationTypes(tx, Paths, gds_path_relations):
+        """GDS paths are made of virtual PATH_x relations. Returns the real
+        relation type of every step of the paths, {(start ID, end ID): type},
+        with a single lookup of the database relations between these nodes.
+        As Dijkstra does, the cheapest relation allowed by the request is kept."""
+        orientation, relationship_types, default_costs = gds_path_relations
+        pairs = set()
+        for path in Paths:
+            if path is None:
+                continue
+            for relation in path.relationships:
+                if "PATH_" in relation.type:
+                    pairs.add((relation.start_node.id, relation.end_node.id))
+        if len(pairs) == 0:
+            return {}
+
+        # The projection may reverse the database relations
+        pattern = {
+            "NATURAL": "(a)-[r]->(b)",
+            "REVERSE": "(a)<-[r]-(b)",
+        }.get(orientation, "(a)-[r]-(b)")
+        q = "UNWIND $pairs AS pair MATCH " + pattern
+        q += " WHERE ID(a) = pair[0] AND ID(b) = pair[1]"
+        q += " RETURN pair[0], pair[1], type(r), r.cost"
+
+        relation_types = {}
+        best_costs = {}
+        for start, end, rtype, cost in tx.run(
+            q, pairs=[list(pair) for pair in pairs]
+        ).values():
+            if relationship_types is None:
+                rank = 0
+            elif rtype in relationship_types:
+                rank = relationship_types.index(rtype)
+            else:
+                continue
+            # Relations without cost use the default rating of the projection
+            if cost is None:
+                cost = default_costs.get(rtype, 100)
+            cost = (cost, rank)
+            if (start, end) not in best_costs or cost < best_costs[(start, end)]:
+                best_costs[(start, end)] = cost
+                relation_types[(start, end)] = rtype
+        return relation_types
+
     @staticmethod
     def check_gds_plugin(self, result):
         """Verify if graph data science plugin installed
@@ -935,7 +1468,11 @@ class Neo4j:
 
     @staticmethod
     def check_unkown_relations(self, result):
-        if self.gds:
+        if self.gds and self.arguments.read_only:
+            logger.print_warning(
+                "Read-only mode : exploitability ratings are used as default costs of the GDS projections."
+            )
+        elif self.gds:
             logger.print_warning("Setting exploitability ratings to edges.")
             with self.driver.session() as session:
                 with session.begin_transaction() as tx:
@@ -948,23 +1485,12 @@ class Neo4j:
 
                         tx.run(q)
 
-            relation_list = [r[0] for r in result]
-
-            with self.driver.session() as session:
-                with session.begin_transaction() as tx:
-                    for i in range(len(relation_list)):
-                        r = relation_list[i]
-                        if r not in self.edges_rating.keys():
-                            logger.print_warning(
-                                r
-                                + " relation type is unknown and will use default exploitability rating."
-                            )
-                        q = "MATCH ()-[r:"
-                        q += str(r)
-                        q += "]->() SET r.cost=r.cost + "
-                        q += str(round(i / 1000, 3))
-                        tx.run(q)
-                        self.gds_cost_type_table[i] = r
+            for r in [r[0] for r in result]:
+                if r not in self.edges_rating.keys():
+                    logger.print_warning(
+                        r
+                        + " relation type is unknown and will use default exploitability rating."
+                    )
 
     def compute_common_cache(self, requests_results):
         """
@@ -972,6 +1498,10 @@ class Neo4j:
         It adds it to the requests_results dictionnary
         It is mainly populated with legacy code from domains.py, computers.py, etc
         """
+        # Lookups by name, id, domain, start or end node over every result,
+        # built on first use by the controls
+        requests_results["index"] = ResultsIndex(requests_results)
+
         computers_with_last_connection_date = requests_results[
             "computers_not_connected_since"
         ]
@@ -0,0 +1,306 @@
+import re
+
+
+# Clauses that end a MATCH pattern or a WHERE condition
+CLAUSE_KEYWORDS = [
+    "MATCH",
+    "OPTIONAL",
+    "WHERE",
+    "WITH",
+    "RETURN",
+    "UNWIND",
+    "CALL",
+    "SET",
+    "DELETE",
+    "DETACH",
+    "REMOVE",
+    "MERGE",
+    "CREATE",
+    "UNION",
+    "FOREACH",
+]
+
+WRITE_KEYWORDS = re.compile(r"\b(SET|DELETE|MERGE|REMOVE|CREATE)\b", re.IGNORECASE)
+
+NODE_WITH_PROPERTIES = re.compile(
+    r"\(\s*(\w*)\s*((?::\s*\w+\s*)*)\{([^{}]*)\}\s*\)"
+)
+
+OVERLAY_PARAMETER = re.compile(r"\$overlay_(\w+)")
+
+
+class Overlay:
+    """The overlay keeps on the client side the flags (is_da, is_dc,
+    path_candidate, ...) and the other properties (da_types, ...) AD Miner
+    usually writes to the neo4j database. In read-only mode, the requests
+    are rewritten to use them as parameters instead of node properties:
+    flags as ID sets ($overlay_<flag>), other properties as maps of the
+    values by node ID ($overlay_<property>)."""
+
+    def __init__(self):
+        # {flag: set of node IDs for which the flag is true}
+        self.flags = {}
+        # {property: {node ID: value}}
+        self.values = {}
+
+    def declare(self, flags, values=()):
+        for flag in flags:
+            self.flags.setdefault(flag, set())
+        for value in values:
+            self.values.setdefault(value, {})
+
+    @staticmethod
+    def requestProperties(request):
+        """Flags and values set by the read-only version of a request:
+        read_only_overlay (flags set for every node returned),
+        read_only_overlay_flags (flags set if their column is true) and
+        read_only_overlay_values (values of their column)"""
+        flags = request.get("read_only_overlay", [])
+        if isinstance(flags, str):
+            flags = [flags]
+        return (
+            flags,
+            request.get("read_only_overlay_flags", []),
+            request.get("read_only_overlay_values", []),
+        )
+
+    def update(self, request, result):
+        """Add to the overlay the nodes returned by a read-only request.
+        The node ID is read from the start (or end) node of Graph results,
+        from the read_only_overlay_id column of list and dict results.
+        The flag and value columns follow the ID column in list results,
+        and are named after their property in dict results."""
+        flags, flag_columns, value_columns = self.requestProperties(request)
+        node = request.get("read_only_overlay_id")
+
+        ids = set()
+        for row in result:
+            if hasattr(row, "nodes"):  # Graph
+                ids.add(row.nodes[-1 if node == "end" else 0].id)
+                continue
+            if isinstance(row, dict):
+                node_id = row[node]
+                columns = row
+            else:
+                node_id = row[node or 0]
+                columns = dict(zip(flag_columns + value_columns, row[1:]))
+            ids.add(node_id)
+            for flag in flag_columns:
+                if columns[flag] is True:
+                    self.flags.setdefault(flag, set()).add(node_id)
+            for name in value_columns:
+                value = columns[name]
+                if value is None:
+                    continue
+                values = self.values.setdefault(name, {})
+                if isinstance(value, list) and isinstance(values.get(node_id), list):
+                    # e.g. da_types, extended by several requests
+                    values[node_id] = values[node_id] + value
+                else:
+                    values[node_id] = value
+
+        for flag in flags:
+            self.flags.setdefault(flag, set()).update(ids)
+
+    def parameters(self, query):
+        """Returns the overlay ID sets and values used by a request"""
+        parameters = {}
+        for name in set(OVERLAY_PARAMETER.findall(query)):
+            if name in self.values:
+                parameters["overlay_" + name] = {
+                    str(node_id): value for node_id, value in self.values[name].items()
+                }
+            else:
+                parameters["overlay_" + name] = list(self.flags.get(name, ()))
+        return parameters
+
+    @staticmethod
+    def mask(query):
+        """Returns the query with strings and escaped names replaced by
+        underscores, so that keywords and patterns are only searched in code"""
+        masked = list(query)
+        quote = None
+        for i, char in enumerate(query):
+            if quote is None:
+                if char in "'\"`":
+                    quote = char
+            elif char == quote and query[i - 1] != "\\":
+                quote = None
+            else:
+                masked[i] = "_"
+        return "".join(masked)
+
+    @staticmethod
+    def isWriteQuery(query):
+        return WRITE_KEYWORDS.search(Overlay.mask(query)) is not None
+
+    @staticmethod
+    def nextClause(masked, position, keywords):
+        """Returns the position of the next clause keyword at the same depth
+        (or of the end of the enclosing block)"""
+        depth = 0
+        i = position
+        while i < len(masked):
+            char = masked[i]
+            if char in "([{":
+                depth += 1
+            elif char in ")]}":
+                depth -= 1
+                if depth < 0:
+                    return i
+            elif depth == 0 and (i == 0 or not (masked[i - 1].isalnum() or masked[i - 1] in "_.$")):
+                match = re.match(r"[A-Za-z]+", masked[i:])
+                if match and match.group(0).upper() in keywords:
+                    previous_word = masked[:i].split()[-1:]
+                    # STARTS WITH and ENDS WITH are not WITH clauses
+                    if not (
+                        match.group(0).upper() == "WITH"
+                        and previous_word
+                        and previous_word[0].upper() in ["STARTS", "ENDS"]
+                    ):
+                        return i
+                if match:
+                    i += len(match.group(0))
+                    continue
+            i += 1
+        return len(masked)
+
+    def predicate(self, variable, flag, value):
+        if value:
+            return f"ID({variable}) IN $overlay_{flag}"
+        return f"NOT ID({variable}) IN $overlay_{flag}"
+
+    def rewriteNodeProperties(self, query):
+        """Moves the overlay flags of a node pattern, e.g. (n:User{is_da:false}),
+        to the WHERE condition of the MATCH clause of the pattern"""
+        anonymous_nodes = 0
+        start = 0
+        while True:
+            masked = self.mask(query)
+            for node in NODE_WITH_PROPERTIES.finditer(masked, start):
+                entries = node.group(3).split(",")
+                overlay_entries = []
+                for entry in entries:
+                    key, _, value = entry.partition(":")
+                    if (
+                        key.strip() in self.flags
+                        and value.strip().lower() in ["true", "false"]
+                    ):
+                        overlay_entries.append(entry)
+                if len(overlay_entries) > 0:
+                    break
+            else:
+                return query
+
+            match_clauses = [
+                m
+                for m in re.finditer(r"\bMATCH\b", masked[: node.start()], re.I)
+            ]
+            pattern_end = None
+            if len(match_clauses) > 0:
+                match_clause = match_clauses[-1]
+                pattern_end = self.nextClause(
+                    masked, match_clause.end(), CLAUSE_KEYWORDS
+                )
+            if pattern_end is None or pattern_end < node.end():
+                # The node is not part of a MATCH pattern (e.g. in a WHERE
+                # pattern predicate), the flags are read from the database
+                start = node.end()
+                continue
+
+            variable = node.group(1)
+            if variable == "":
+                anonymous_nodes += 1
+                variable = f"overlay_node_{anonymous_nodes}"
+            predicates = []
+            # Other properties keep their original text (e.g. strings)
+            remaining_entries = []
+            offset = node.start(3)
+            for entry in node.group(3).split(","):
+                if entry in overlay_entries:
+                    key, _, value = entry.partition(":")
+                    predicates.append(
+                        self.predicate(
+                            variable, key.strip(), value.strip().lower() == "true"
+                        )
+                    )
+                else:
+                    remaining_entries.append(query[offset : offset + len(entry)])
+                offset += len(entry) + 1
+            properties = ",".join(remaining_entries).strip()
+            new_node = "(" + variable + query[node.start(2) : node.end(2)].strip()
+            if properties:
+                new_node += "{" + properties + "}"
+            new_node += ")"
+
+            condition = " AND ".join(predicates)
+            if masked[pattern_end : pattern_end + 5].upper() == "WHERE":
+                condition_start = pattern_end + 5
+                condition_end = self.nextClause(
+                    masked,
+                    condition_start,
+                    [k for k in CLAUSE_KEYWORDS if k != "WHERE"],
+                )
+                existing_condition = query[condition_start:condition_end].strip()
+                query = (
+                    query[: node.start()]
+                    + new_node
+                    + query[node.end() : pattern_end]
+                    + "WHERE "
+                    + condition
+                    + " AND ("
+                    + existing_condition
+                    + ") "
+                    + query[condition_end:]
+                )
+            else:
+                query = (
+                    query[: node.start()]
+                    + new_node
+                    + query[node.end() : pattern_end].rstrip()
+                    + " WHERE "
+                    + condition
+                    + " "
+                    + query[pattern_end:]
+                )
+            start = node.start()
+
+    def rewrite(self, query):
+        """Replaces the overlay flags of the nodes in a read request by
+        ID sets parameters, and the other overlay properties by the values
+        of maps parameters. A flag is true if the node is in the set, a
+        missing flag (IS NULL) is handled as false. A missing value is null."""
+        if len(self.flags) == 0 and len(self.values) == 0:
+            return query
+        if len(self.flags) > 0:
+            query = self.rewriteNodeProperties(query)
+
+        names = sorted(list(self.flags) + list(self.values), key=len, reverse=True)
+        expression = re.compile(
+            r"\b(\w+)\.(" + "|".join(names) + r")\b(\s+IS\s+(NOT\s+)?NULL\b)?",
+            re.IGNORECASE,
+        )
+        masked = self.mask(query)
+        rewritten = ""
+        position = 0
+        for match in expression.finditer(masked):
+            variable, name = match.group(1), match.group(2)
+            if name in self.values:
+                # IS NULL applies to the value as to the property
+                rewritten += (
+                    query[position : match.start()]
+                    + f"$overlay_{name}[toString(ID({variable}))]"
+                )
+                position = match.end(2)
+                continue
+            if name not in self.flags:  # Flags are case sensitive
+                continue
+            if match.group(3) is None:
+                replacement = f"(ID({variable}) IN $overlay_{name})"
+            elif match.group(4) is None:  # IS NULL
+                replacement = f"(NOT ID({variable}) IN $overlay_{name})"
+            else:  # IS NOT NULL
+                replacement = f"(ID({variable}) IN $overlay_{name})"
+            rewritten += query[position : match.start()] + replacement
+            position = match.end()
+        return rewritten + query[position:]
@@ -1,9 +1,15 @@
 from ad_miner.sources.modules.utils import (
     TEMPLATES_DIRECTORY,
     JS_DIRECTORY,
+    read_template,
 )
+import io
 from os.path import sep
 
+from ad_miner.sources.modules.page_writer_class import PageBuffer, page_writer
+from ad_miner.sources.modules.profiler_class import profiler
+from ad_miner.sources.modules.report_bundle_class import report_bundle
+
 
 class Page:
     def __init__(
@@ -29,38 +35,55 @@ class Page:
 
     # TODO remove magic string foldername
     def render(self):
+        with profiler.phase("Page.render"):
+            self.renderPage()
+
+    def renderPage(self):
+        if report_bundle.enabled:
+            body = io.StringIO()
+            self.renderComponents(body)
+            report_bundle.addPage(
+                self.name.replace(sep, "_")[: -len(".html")],
+                {
+                    "template": self.template,
+                    "title": str(self.title),
+                    "description": str(self.dico_description["description"]),
+                    "risk": str(self.dico_description["risk"]),
+                    "poa": str(self.dico_description["poa"]),
+                    "body": body.getvalue(),
+                },
+            )
+            return
 
         # shutil.copyfile(self.template + "_header", "./render/" +  os.path.basename(self.template + ))
 
-        with open(
-            "./render_%s/html/%s" % (self.render_prefix, self.name.replace(sep, "_")),
-            "w",
-            encoding="utf-8",
-        ) as page_f:
-            with open(
-                TEMPLATES_DIRECTORY / (self.template + "_header.html"),
-                "r",
-                encoding="utf-8",
-            ) as header_f:
-                page_f.write(
-                    header_f.read()
-                    % (
-                        self.title,
-                        self.dico_description["description"],
-                        self.dico_description["risk"],
-                        self.dico_description["poa"],
-                    )
-                )
+        # The page is written by page_writer while the next pages are rendered
+        page_f = PageBuffer(
+            "./render_%s/html/%s" % (self.render_prefix, self.name.replace(sep, "_"))
+        )
+        page_f.write(
+            read_template(TEMPLATES_DIRECTORY / (self.template + "_header.html"))
+            % (
+                self.title,
+                self.dico_description["description"],
+                self.dico_description["risk"],
+                self.dico_description["poa"],
+            )
+        )
+
+        self.renderComponents(page_f)
 
-            for component in self.components:
-                component.render(page_f)
+        page_f.write(
+            read_template(TEMPLATES_DIRECTORY / (self.template + "_footer.html"))
+        )
+        page_writer.write(page_f.name, page_f.getvalue())
 
-            for jsFile in self.include_js:
-                # open jsFile and write content to page_f in a <script> block
-                with open(JS_DIRECTORY / (jsFile + ".js"), "r") as js_f:
-                    page_f.write("<script>%s</script>" % js_f.read())
+    def renderComponents(self, page_f):
+        for component in self.components:
+            component.render(page_f)
 
-            with open(
-                TEMPLATES_DIRECTORY / (self.template + "_footer.html"), "r"
-            ) as footer_f:
-                page_f.write(footer_f.read())
+        for jsFile in self.include_js:
+            # write the content of jsFile to page_f in a <script> block
+            page_f.write(
+                "<script>%s</script>" % read_template(JS_DIRECTORY / (jsFile + ".js"))
+            )
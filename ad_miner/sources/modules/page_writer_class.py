@@ -0,0 +1,65 @@
+import io
+import os
+import queue
+import threading
+from pathlib import Path
+
+from ad_miner.sources.modules import logger
+
+# Files waiting to be written: rendering waits when the writer is late, to
+# bound the memory used by the rendered pages
+MAX_PENDING_WRITES = 16
+
+
+class PageBuffer(io.StringIO):
+    """Content of a page file, given to page_writer once rendered. Like a
+    page file, it has the name of the file (see Graph.render)."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+
+class PageWriter:
+    """Writes the rendered pages and their data files in a background thread,
+    so that the controls keep running while their pages are written.
+
+    The thread is started on the first write of each process: forked control
+    workers start their own thread, and wait for their writes (join) before
+    returning the result of a control."""
+
+    def __init__(self):
+        self.pid = None
+        self.queue = None
+        self.thread = None
+
+    def write(self, path, content):
+        """Writes content (str or bytes) in the file path"""
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.queue = queue.Queue(MAX_PENDING_WRITES)
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.queue.put((path, content))
+
+    def run(self):
+        while True:
+            path, content = self.queue.get()
+            try:
+                if isinstance(content, bytes):
+                    Path(path).write_bytes(content)
+                else:
+                    Path(path).write_text(content, encoding="utf-8")
+            except OSError as error:
+                logger.print_error(f"Failed to write {path}: {error}")
+            finally:
+                self.queue.task_done()
+
+    def join(self):
+        """Waits for the files written by the current process"""
+        if self.pid == os.getpid():
+            self.queue.join()
+
+
+# Shared by the pages and the graphs
+page_writer = PageWriter()
@@ -0,0 +1,182 @@
+import contextlib
+import cProfile
+import hashlib
+import html
+import io
+import json
+import pstats
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+from ad_miner.sources.modules import logger
+
+
+class Profiler:
+    """Profiler of the Python phases of AD Miner (--profile).
+
+    Each top level phase (request post-processing, control __init__ or run,
+    main page, ...) is profiled with cProfile, and a sampling thread records
+    the stacks of the main thread, prefixed with the current phases, to draw
+    an aggregated flame graph. Nested phases (e.g. Page.render in a control)
+    are only timed and shown in the flame graph, as cProfile cannot nest."""
+
+    def __init__(self, interval=0.005):
+        self.enabled = False
+        self.interval = interval
+        self.directory = None
+        self.stack = []
+        self.phases = {}
+        self.profiles = {}
+        self.samples = {}
+        self.main_thread_id = None
+        self.stop_event = threading.Event()
+        self.sampler = None
+
+    def start(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.enabled = True
+        self.main_thread_id = threading.get_ident()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        profile = None
+        if len(self.stack) == 0:
+            profile = cProfile.Profile()
+        self.stack.append(name)
+        starting_time = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                if name in self.profiles:
+                    self.profiles[name].add(profile)
+                else:
+                    self.profiles[name] = pstats.Stats(profile)
+            self.stack.pop()
+            phase = self.phases.setdefault(name, {"calls": 0, "time": 0})
+            phase["calls"] += 1
+            phase["time"] += time.perf_counter() - starting_time
+
+    def sample(self):
+        """Records the stack of the main thread every interval"""
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            phases = list(self.stack) or ["other"]
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != __file__:
+                    frames.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            stack = ";".join(phases + frames[::-1])
+            self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.stop_event.set()
+        self.sampler.join()
+        self.enabled = False
+
+        for name, stats in self.profiles.items():
+            file_name = re.sub(r"[^\w.-]", "_", name)
+            stats.dump_stats(self.directory / (file_name + ".prof"))
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats("cumulative").print_stats(40)
+            (self.directory / (file_name + ".txt")).write_text(
+                summary.getvalue(), encoding="utf-8"
+            )
+
+        phases = {
+            name: {"calls": phase["calls"], "time": round(phase["time"], 3)}
+            for name, phase in sorted(
+                self.phases.items(), key=lambda item: item[1]["time"], reverse=True
+            )
+        }
+        (self.directory / "phases.json").write_text(
+            json.dumps(phases, indent=1), encoding="utf-8"
+        )
+
+        # Folded stacks, readable by flamegraph.pl or speedscope
+        (self.directory / "flamegraph.folded").write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.samples.items()),
+            encoding="utf-8",
+        )
+        (self.directory / "flamegraph.svg").write_text(
+            self.flameGraph(), encoding="utf-8"
+        )
+        logger.print_success(f"Profiles written in {self.directory}")
+
+    def flameGraph(self, width=1600, row_height=16):
+        """Returns an SVG flame graph (root at the top) of the samples"""
+        root = {"name": "all", "count": 0, "children": {}}
+        for stack, count in self.samples.items():
+            node = root
+            node["count"] += count
+            for frame in stack.split(";"):
+                node = node["children"].setdefault(
+                    frame, {"name": frame, "count": 0, "children": {}}
+                )
+                node["count"] += count
+
+        rectangles = []
+        max_depth = 0
+
+        def draw(node, x, depth):
+            nonlocal max_depth
+            max_depth = max(max_depth, depth)
+            node_width = width * node["count"] / max(root["count"], 1)
+            if node_width < 0.5:
+                return
+            hue = int(hashlib.md5(node["name"].encode()).hexdigest()[:2], 16) % 60
+            name = html.escape(node["name"])
+            share = round(100 * node["count"] / max(root["count"], 1), 2)
+            rectangle = (
+                f'<g><title>{name} ({node["count"]} samples, {share}%)</title>'
+                f'<rect x="{x:.1f}" y="{depth * row_height}" width="{node_width:.1f}" '
+                f'height="{row_height - 1}" fill="hsl({hue}, 85%, 60%)"/>'
+            )
+            # Approximate width of the characters of the labels
+            characters = int(node_width / 7)
+            if characters > 3:
+                label = node["name"]
+                if len(label) > characters:
+                    label = label[: characters - 2] + ".."
+                rectangle += (
+                    f'<text x="{x + 3:.1f}" y="{depth * row_height + row_height - 4}">'
+                    f"{html.escape(label)}</text>"
+                )
+            rectangles.append(rectangle + "</g>")
+            child_x = x
+            for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+                draw(child, child_x, depth + 1)
+                child_x += width * child["count"] / max(root["count"], 1)
+
+        draw(root, 0, 0)
+        height = (max_depth + 1) * row_height
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'font-family="monospace" font-size="11">'
+            + "".join(rectangles)
+            + "</svg>"
+        )
+
+
+# Shared by the modules, disabled unless --profile is used
+profiler = Profiler()
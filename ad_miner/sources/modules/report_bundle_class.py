@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import quote
+
+from ad_miner.sources.modules.utils import TEMPLATES_DIRECTORY, json_bytes
+
+# A data file is closed once it reaches this size: report.html loads the
+# whole data file of the page it displays
+MAX_DATA_FILE_SIZE = 4 * 1024 * 1024
+
+INDEX_FILE = "index.js"
+INDEX_PREFIX = b"window.report_index = "
+
+REPORT_PAGE = "report.html"
+
+
+class ReportBundle:
+    """Pages of the report stored in a few data files (--single_page),
+    displayed by a single html page instead of one html file per page.
+
+    A page is stored as its template, its descriptions and the html of its
+    components, in data files of a few MB (render_<prefix>/pages/<hash>.js).
+    index.js maps each page to its data file and contains the templates:
+    html/report.html?page=<name> loads the data file of the page and writes
+    the page (see report.js), which rewrites the links to <name>.html when
+    they are followed.
+
+    Data files are named after the hash of their content, so forked control
+    workers write their own data files: the pages they write are returned
+    with the result of their controls (see flush)."""
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        # page name -> data file
+        self.index = {}
+        # Templates of the pages (see Page.template)
+        self.templates = {}
+        # Data file being written and its pages
+        self.file = None
+        self.file_hash = None
+        self.file_pages = {}
+        # Pages written since the last flush
+        self.flushed = {}
+
+    def start(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index_file = self.directory / INDEX_FILE
+        if index_file.exists():
+            # Report updated by --only_controls / --only_requests
+            index = json.loads(
+                index_file.read_bytes()[len(INDEX_PREFIX) :].rstrip().rstrip(b";")
+            )
+            self.index = index["pages"]
+            self.templates = dict.fromkeys(index["templates"])
+        self.enabled = True
+
+    def openFile(self):
+        self.file = open(self.directory / f".{os.getpid()}.tmp", "wb")
+        self.file_hash = hashlib.md5()
+        self.file_pages = {}
+        self.write(b"window.report_pages = window.report_pages || {};\n")
+
+    def write(self, content: bytes):
+        self.file.write(content)
+        self.file_hash.update(content)
+
+    def closeFile(self):
+        """Names the data file being written after its content"""
+        if self.file is None:
+            return
+        self.file.close()
+        name = self.file_hash.hexdigest()[:16] + ".js"
+        os.replace(self.file.name, self.directory / name)
+        for page in self.file_pages:
+            self.index[page] = name
+            self.flushed[page] = name
+        self.file = None
+
+    def addPage(self, name, page):
+        if self.file is None:
+            self.openFile()
+        self.write(
+            b"report_pages[" + json_bytes(name) + b"] = " + json_bytes(page) + b";\n"
+        )
+        self.file_pages[name] = True
+        self.templates.setdefault(page["template"])
+        if self.file.tell() >= MAX_DATA_FILE_SIZE:
+            self.closeFile()
+
+    def flush(self) -> dict:
+        """Closes the data file being written, and returns the pages written
+        since the last flush ({page name: data file})"""
+        self.closeFile()
+        pages = self.flushed
+        self.flushed = {}
+        return pages
+
+    def pageLink(self, href) -> str:
+        """Link to a page of the report, for the links that report.js cannot
+        rewrite (e.g. location.href in onclick handlers)"""
+        if not self.enabled:
+            return href
+        file_name, separator, query = href.partition("?")
+        name = file_name[: -len(".html")]
+        if not file_name.endswith(".html") or (
+            name not in self.index and name not in self.file_pages
+        ):
+            return href
+        return f"{REPORT_PAGE}?page={quote(name)}" + ("&" + query if separator else "")
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.closeFile()
+        self.enabled = False
+
+        templates = {}
+        for template in self.templates:
+            templates[template] = [
+                (TEMPLATES_DIRECTORY / f"{template}_{part}.html").read_text(
+                    encoding="utf-8"
+                )
+                for part in ["header", "footer"]
+            ]
+        (self.directory / INDEX_FILE).write_bytes(
+            INDEX_PREFIX
+            + json_bytes({"pages": self.index, "templates": templates})
+            + b";\n"
+        )
+
+        # Data files of previous runs whose pages were all written again
+        data_files = set(self.index.values())
+        for data_file in self.directory.glob("*.js"):
+            if data_file.name != INDEX_FILE and data_file.name not in data_files:
+                data_file.unlink()
+
+        shutil.copyfile(
+            TEMPLATES_DIRECTORY / REPORT_PAGE,
+            self.directory.parent / "html" / REPORT_PAGE,
+        )
+
+
+# Shared by the pages, disabled unless --single_page is used
+report_bundle = ReportBundle()
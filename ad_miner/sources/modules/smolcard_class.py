@@ -3,7 +3,8 @@ import json
 from hashlib import md5
 
 
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+from ad_miner.sources.modules.template_class import compile_template
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, read_template
 
 old_dico_category = {
     "passwords": [],
@@ -54,28 +55,7 @@ class SmolCard:
         It extracts the {{something}} variables in the html template and replaces them with their value in the dict_of_value dictionnary.
         Every ` char will be skipped.
         """
-        original = template_raw
-        content = ""
-        i = 0
-        while i < len(original):
-            if original[i] == "{" and original[i + 1] == "{":
-                j = 2
-                key = ""
-                while original[i + j] != "}" and original[i + j + 1] != "}":
-                    key += original[i + j]
-                    j += 1
-                key += original[i + j]
-                try:
-                    content += str(dict_of_value[key])
-                except KeyError:
-                    content += "N/A"
-                i += len(key) + 4
-            elif original[i] == "`":
-                i += 1
-            else:
-                content += original[i]
-                i += 1
-        return content
+        return compile_template(template_raw).render(dict_of_value)
 
     def render(self, page_f, return_html=False):
         color = ""
@@ -111,10 +91,7 @@ class SmolCard:
             color = "secondary"
             rgb_color = "50, 50, 50"
 
-        with open(
-            self.template_base_path / (self.template + "_header.html"), "r"
-        ) as line_f:
-            html_raw = line_f.read()
+        html_raw = read_template(self.template_base_path / (self.template + "_header.html"))
 
         startedDollars = False
         startedDigits = False
@@ -1,7 +1,7 @@
 import random
 import string
 
-from ad_miner.sources.modules.utils import HTML_DIRECTORY
+from ad_miner.sources.modules.utils import HTML_DIRECTORY, read_template
 
 class Table:
     def __init__(
@@ -38,17 +38,14 @@ class Table:
     def render(self, page_f):
 
         # write header
-        with open(
-            self.template_base_path / (self.template + "_header.html"), "r"
-        ) as header_f:
-            page_f.write(header_f.read() % (self.id, self.id, self.title, self.id))
+        html_header = read_template(
+            self.template_base_path / (self.template + "_header.html")
+        )
+        page_f.write(html_header % (self.id, self.id, self.title, self.id))
 
         page_f.write('<thead class=" ' + self.class_css + ' ">\n<tr>\n')
 
-        with open(
-            self.template_base_path / (self.template + "_col.html"), "r"
-        ) as row_header_f:
-            line = row_header_f.read()
+        line = read_template(self.template_base_path / (self.template + "_col.html"))
 
         for header in self.headers:
             page_f.write(line % ("th", 'scope="col"', header, "th"))
@@ -67,7 +64,6 @@ class Table:
             page_f.write("</tr>\n")
 
         page_f.write("</tbody>\n")
-        with open(
-            self.template_base_path / (self.template + "_footer.html"), "r"
-        ) as footer_f:
-            page_f.write(footer_f.read())
+        page_f.write(
+            read_template(self.template_base_path / (self.template + "_footer.html"))
+        )
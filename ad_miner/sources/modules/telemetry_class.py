@@ -0,0 +1,175 @@
+import json
+import pickle
+import sys
+import time
+
+from ad_miner.sources.modules import logger
+
+try:  # Not available on Windows
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss():
+    """Returns the peak resident memory of the current process in MB
+    (None if it cannot be measured on this platform)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        rss = rss / 1024
+    return round(rss / 1024, 1)
+
+
+def flatten_plan(plan, depth=0):
+    """Returns the operators of a neo4j query plan (summary.profile or
+    summary.plan) as a list, with their rows and db hits if profiled"""
+    if not plan:
+        return []
+    arguments = plan.get("args", {})
+    operators = [
+        {
+            "operator": plan.get("operatorType"),
+            "depth": depth,
+            "rows": plan.get("rows", arguments.get("Rows")),
+            "estimated_rows": arguments.get("EstimatedRows"),
+            "db_hits": plan.get("dbHits", arguments.get("DbHits")),
+            "details": arguments.get("Details"),
+        }
+    ]
+    for child in plan.get("children", []):
+        operators += flatten_plan(child, depth + 1)
+    return operators
+
+
+class ChunkTelemetry:
+    """Measures one execution of a query (a whole request or one of its
+    SKIP/LIMIT chunks). It is created in the process running the query
+    and its dict is sent back with the result. The size of the result is
+    only measured if measure_size is set (--profile), as it is serialized
+    to be measured."""
+
+    def __init__(self, server, skip=None, limit=None, measure_size=False):
+        self.server = server
+        self.skip = skip
+        self.limit = limit
+        self.measure_size = measure_size
+        self.start = time.time()
+        self.server_time = None
+
+    def setSummary(self, summary):
+        """Keeps the server side timings (in ms) of the neo4j result summary"""
+        available = summary.result_available_after or 0
+        consumed = summary.result_consumed_after or 0
+        self.server_time = (available + consumed) / 1000
+
+    def toDict(self, result):
+        wall_time = time.time() - self.start
+        size = None
+        if self.measure_size:
+            try:
+                size = len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                pass
+        chunk = {
+            "server": self.server,
+            "skip": self.skip,
+            "limit": self.limit,
+            "wall_time": round(wall_time, 3),
+            "server_time": None,
+            # Time not spent by the server: driver connection, transfer and
+            # decoding of the records, computation of the path objects
+            "client_time": None,
+            "rows": len(result),
+            "bytes": size,
+            "peak_rss_mb": peak_rss(),
+        }
+        if self.server_time is not None:
+            chunk["server_time"] = round(self.server_time, 3)
+            chunk["client_time"] = round(max(0, wall_time - self.server_time), 3)
+        return chunk
+
+
+class Telemetry:
+    """Telemetry keeps the execution statistics of every request
+    and of its chunks, exported to render_<prefix>/perf.json"""
+
+    def __init__(self):
+        self.requests = []
+        self.current = None
+
+    def startRequest(self, request_key, name):
+        self.current = {
+            "key": request_key,
+            "name": name,
+            "source": "neo4j",
+            "start": time.time(),
+            "chunks": [],
+        }
+
+    def addChunk(self, chunk):
+        if self.current is not None and chunk is not None:
+            self.current["chunks"].append(chunk)
+
+    def addPlan(self, plan):
+        if self.current is not None:
+            self.current["plan"] = plan
+
+    def endRequest(self, result, source=None):
+        if self.current is None:
+            return
+        request = self.current
+        self.current = None
+        if source is not None:
+            request["source"] = source
+        chunks = request["chunks"]
+
+        def total(field):
+            values = [c[field] for c in chunks if c[field] is not None]
+            return round(sum(values), 3) if len(values) > 0 else None
+
+        request["wall_time"] = round(time.time() - request.pop("start"), 3)
+        request["rows"] = len(result) if result is not None else 0
+        request["nb_chunks"] = len(chunks)
+        request["server_time"] = total("server_time")
+        request["client_time"] = total("client_time")
+        request["bytes"] = total("bytes")
+        rss = [c["peak_rss_mb"] for c in chunks if c["peak_rss_mb"] is not None]
+        if peak_rss() is not None:
+            rss.append(peak_rss())
+        request["peak_rss_mb"] = max(rss) if len(rss) > 0 else None
+        request["servers"] = sorted({c["server"] for c in chunks if c["server"]})
+        self.requests.append(request)
+
+    def write(self, path):
+        data = {
+            "total_wall_time": round(sum(r["wall_time"] for r in self.requests), 3),
+            "peak_rss_mb": peak_rss(),
+            "requests": self.requests,
+        }
+        with open(path, "w", encoding="utf-8") as perf_file:
+            json.dump(data, perf_file, indent=1, default=str)
+
+    def summary(self, top=10):
+        """Prints the requests that took the most time"""
+        requests = sorted(self.requests, key=lambda r: r["wall_time"], reverse=True)
+        total_time = sum(r["wall_time"] for r in requests)
+        logger.print_magenta(
+            f"Requests took {round(total_time, 2)}s, slowest requests :"
+        )
+        for request in requests[:top]:
+            share = 100 * request["wall_time"] / total_time if total_time > 0 else 0
+            details = f"{request['rows']} rows"
+            if request["server_time"] is not None:
+                details += f", server {request['server_time']}s"
+            if request["client_time"] is not None:
+                details += f", client {request['client_time']}s"
+            if request["bytes"] is not None:
+                details += f", {round(request['bytes'] / 1024 / 1024, 1)} MB"
+            if request["nb_chunks"] > 1:
+                details += f", {request['nb_chunks']} chunks"
+            logger.print_debug(
+                f"{request['wall_time']}s ({round(share)}%) {request['key']} : {details}"
+            )
@@ -0,0 +1,35 @@
+import functools
+import re
+
+# {{key}}: the first character after {{ always belongs to the key
+PLACEHOLDER = re.compile(r"\{\{(.[^}]*)\}\}", re.DOTALL)
+
+
+class Template:
+    """Template with {{key}} placeholders (main page, smolcards).
+
+    The template is split once into its literal parts and the keys of its
+    placeholders, so filling it is a single join. Every ` character outside
+    the placeholders is skipped, and the placeholders without value are
+    filled with N/A."""
+
+    def __init__(self, source: str):
+        parts = PLACEHOLDER.split(source)
+        self.literals = [literal.replace("`", "") for literal in parts[0::2]]
+        self.keys = parts[1::2]
+
+    def render(self, values) -> str:
+        content = [self.literals[0]]
+        for key, literal in zip(self.keys, self.literals[1:]):
+            try:
+                content.append(str(values[key]))
+            except KeyError:
+                content.append("N/A")
+            content.append(literal)
+        return "".join(content)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_template(source: str) -> Template:
+    """Template of source, compiled once per run"""
+    return Template(source)
@@ -1,4 +1,5 @@
 import argparse
+import functools
 from pathlib import Path
 import multiprocessing as mp
 import json
@@ -6,6 +7,11 @@ import json
 from datetime import date
 from os.path import sep
 
+try:  # Faster JSON encoder, optional
+    import orjson
+except ImportError:
+    orjson = None
+
 today = date.today()
 current_date = today.strftime("%Y%m%d")
 
@@ -119,7 +125,107 @@ def args():
         default="",
         help="Nodes of the cluster to run parallel neo4j queries. ex : host1:port1:nCore1,host2:port2:nCore2,...",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--reverse_bfs",
+        default=False,
+        help="Without GDS, compute paths to domain admins with a single backward traversal from the targets (one shortest path per object, much faster on large databases)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--gds_concurrency",
+        type=int,
+        default=0,
+        help="Number of threads used by each GDS Dijkstra call. Default: automatic, depending on the number of parallel calls (max 4)",
+    )
+    parser.add_argument(
+        "--read_only",
+        default=False,
+        help="Never write to the neo4j database: flags computed by AD Miner (is_da, is_dc, path_candidate, has_path_to_da, ...) are kept on the client side and injected in the requests, and relation costs come from the GDS projections. Cleanup and other write requests are skipped. Their cache entries are kept apart from the ones of normal runs (<request>_ro)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile_slow_queries",
+        type=float,
+        default=0,
+        help="Capture the query plan of the requests slower than this number of seconds and save it in perf.json (PROFILE, of the first chunk for parallelized requests, EXPLAIN for write requests). Default: disabled",
+    )
+    parser.add_argument(
+        "--profile",
+        default=False,
+        help="Profile the Python phases (requests post-processing, controls, pages) and write cProfile files and a flame graph in render_<prefix>/profile, and measure the size of the requests results in perf.json",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--control_workers",
+        type=int,
+        default=1,
+        help="Number of processes running the controls in parallel (needs the fork start method, e.g. on Linux). Default: 1 (serial)",
+    )
+    parser.add_argument(
+        "--check_controls",
+        default=False,
+        help="Report the controls that modify the requests results they consume, or read requests they do not declare in consumed_requests (slower)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--only_controls",
+        type=lambda value: value.split(","),
+        default=None,
+        help="Update an existing report: only generate again these controls (comma separated control keys) and the main page. The requests come from the cache",
+    )
+    parser.add_argument(
+        "--only_requests",
+        type=lambda value: value.split(","),
+        default=None,
+        help="Update an existing report: only run again these requests (comma separated request keys, the others come from the cache), and generate again the general pages, the controls consuming them and the main page",
+    )
+    parser.add_argument(
+        "--graph_store",
+        default=False,
+        help="Write the nodes and paths of the graph pages once for the whole report (render_<prefix>/store), graph pages only reference their paths. Much smaller reports with many graph pages",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--single_page",
+        default=False,
+        help="Write the pages in a few data files (render_<prefix>/pages) displayed by a single html page (html/report.html), instead of one html file per page",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--grid_chunk_rows",
+        type=int,
+        default=0,
+        help="Write the rows of the grids with more rows in data files of this many rows, loaded while scrolling (with --single_page, grids are not split). Default: 0 (rows in the page)",
+    )
+    parser.add_argument(
+        "--graph_summary_nodes",
+        type=int,
+        default=1000,
+        help="In the graphs with more nodes, display the start nodes with the same type, domain and next hops as a single node, expanded with a double click (not supported with --graph_store). Default: 1000 (0 to disable)",
+    )
+    parser.add_argument(
+        "--graph_layout",
+        default=False,
+        help="Compute the layout of the graphs (layers of the paths) when generating the report, instead of when opening the graph pages (not supported with --graph_store). Faster graph pages for large graphs",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--assets_dir",
+        default=None,
+        help="Shared directory of the report assets (bootstrap, icons, fonts, js): the assets of each AD Miner version are copied once in a sub-directory named after their content, and taken from there for the reports. Default: assets taken from AD Miner",
+    )
+    parser.add_argument(
+        "--assets_link",
+        default="copy",
+        choices=["copy", "hardlink", "symlink"],
+        help="How the assets are put in the render folder (copied when the link cannot be created). Assets already up to date are kept on reruns. Default: copy",
+    )
+    arguments = parser.parse_args()
+    if arguments.graph_layout and arguments.graph_store:
+        # Graph pages of the store only reference their paths, graph.js
+        # builds and lays out their graphs
+        parser.error("--graph_layout is not supported with --graph_store")
+    return arguments
 
 
 def timer_format(delta_time):
@@ -161,6 +267,43 @@ def days_format(nb_days: int, critical_time=90) -> str:
         return f"<i class='{sortClass} bi bi-calendar3' style='color: {color};'></i> {d} day{'s' if d > 1 else ''}"
 
 
+@functools.lru_cache(maxsize=None)
+def read_template(path) -> str:
+    """Content of a template (or js) file, read once per run as the same
+    templates are used by thousands of pages"""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def json_bytes(data, default=None) -> bytes:
+    """Compact UTF-8 JSON encoding of data, with orjson if it is installed.
+    default converts the objects that are not serializable (see json.dumps)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=default)
+        except TypeError:
+            # Not supported by orjson (e.g. integer keys, very large integers)
+            pass
+    return json.dumps(
+        data, separators=(",", ":"), ensure_ascii=False, default=default
+    ).encode("utf-8")
+
+
+def escape_script(script: str) -> str:
+    """Escapes the sequences of a script that would end a <script> block
+    (</) or a JavaScript string in older browsers (line separators)"""
+    return (
+        script.replace("</", "<\\/")
+        .replace("\u2028", "\\u2028")
+        .replace("\u2029", "\\u2029")
+    )
+
+
+def script_json(data) -> str:
+    """JSON of data to write in a <script> block. Objects that are not
+    serializable are written as strings."""
+    return escape_script(json_bytes(data, default=str).decode("utf-8"))
+
+
 def grid_data_stringify(raw_data: dict) -> str:
     """
     Transform a dict to a string for the grid formating. This is a dumb fix for the sorting with hyperlink.
@@ -0,0 +1,14 @@
+# compute_common_cache precomputes the dictionaries shared by the controls
+
+
+from ad_miner.sources.modules.neo4j_class import Neo4j
+
+
+def bench_compute_common_cache(benchmark, requests_results):
+    neo4j = Neo4j.__new__(Neo4j)
+
+    def setup():
+        # compute_common_cache adds its keys to the requests results
+        return (dict(requests_results),), {}
+
+    benchmark.pedantic(neo4j.compute_common_cache, setup=setup, rounds=3)
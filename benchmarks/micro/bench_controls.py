@@ -0,0 +1,37 @@
+# Controls are run one by one on a stored dataset, after compute_common_cache,
+# in the order of the report generation
+
+
+import pytest
+
+from ad_miner.sources.modules import controls
+from ad_miner.sources.modules.neo4j_class import Neo4j
+from ad_miner.sources.modules.page_writer_class import page_writer
+
+
+# Results shared by the controls of a dataset, as in a report generation
+_controls_results = {}
+
+
+@pytest.fixture
+def controls_results(size, requests_results):
+    if size not in _controls_results:
+        Neo4j.__new__(Neo4j).compute_common_cache(requests_results)
+        _controls_results[size] = requests_results
+    return _controls_results[size]
+
+
+@pytest.mark.parametrize(
+    "control_class",
+    controls.control_list,
+    ids=[control_class.__name__ for control_class in controls.control_list],
+)
+def bench_control(benchmark, control_class, controls_results, render_directory):
+    def run():
+        control = control_class(render_directory, controls_results)
+        control.run()
+        page_writer.join()
+        return control
+
+    # Controls write their pages, a single round keeps the report realistic
+    benchmark.pedantic(run, rounds=1, iterations=1)
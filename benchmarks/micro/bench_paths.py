@@ -0,0 +1,72 @@
+# computePathObject converts the neo4j paths of Graph requests,
+# Graph.render writes the graph pages of the controls
+
+
+from ad_miner.sources.modules.graph_class import Graph
+from ad_miner.sources.modules.neo4j_class import Neo4j
+from ad_miner.sources.modules.page_writer_class import page_writer
+
+
+class RawNode(dict):
+    """Node as returned by the neo4j driver (properties and labels)"""
+
+    def __init__(self, node):
+        super().__init__(name=node.name, domain=node.domain, tenantid=node.tenant_id)
+        self.id = node.id
+        self.labels = frozenset([node.labels, "Base"])
+
+
+class RawRelationship:
+    def __init__(self, relation_type, start_node, end_node):
+        self.type = relation_type
+        self.start_node = start_node
+        self.end_node = end_node
+        self.nodes = (start_node, end_node)
+
+
+class RawPath:
+    def __init__(self, path):
+        nodes = [RawNode(node) for node in path.nodes]
+        self.relationships = [
+            RawRelationship(path.nodes[i].relation_type, nodes[i], nodes[i + 1])
+            for i in range(len(nodes) - 1)
+        ]
+        self.end_node = nodes[-1]
+
+
+def bench_compute_path_object(benchmark, paths):
+    raw_paths = [RawPath(path) for path in paths if len(path.nodes) > 1]
+    result = benchmark(Neo4j.computePathObject, raw_paths)
+    assert len(result) == len(raw_paths)
+
+
+def bench_graph_render(benchmark, paths, tmp_path):
+    page_file = tmp_path / "graph.html"
+
+    def render():
+        graph = Graph()
+        graph.setPaths(paths)
+        with open(page_file, "w", encoding="utf-8") as page:
+            graph.render(page)
+        page_writer.join()
+
+    benchmark(render)
+    assert (tmp_path / "graph_graph.js").stat().st_size > 0
+
+
+def bench_graph_render_layout(benchmark, paths, tmp_path):
+    page_file = tmp_path / "graph.html"
+
+    def render():
+        graph = Graph()
+        graph.setPaths(paths)
+        with open(page_file, "w", encoding="utf-8") as page:
+            graph.render(page)
+        page_writer.join()
+
+    Graph.compute_layout = True
+    try:
+        benchmark(render)
+    finally:
+        Graph.compute_layout = False
+    assert b'"layer":' in (tmp_path / "graph_graph.js").read_bytes()
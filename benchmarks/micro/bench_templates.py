@@ -0,0 +1,50 @@
+# SmolCard.fillTemplate fills the cards of the main page, main_page.render
+# fills main_header.html
+
+
+from ad_miner.sources.modules.smolcard_class import SmolCard
+from ad_miner.sources.modules.template_class import Template
+from ad_miner.sources.modules.utils import TEMPLATES_DIRECTORY
+
+# Approximate number of cards of a report
+NUMBER_OF_CARDS = 120
+
+
+def bench_smolcard_fill_template(benchmark):
+    card = SmolCard()
+    with open(card.template_base_path / (card.template + "_header.html"), "r") as f:
+        template = f.read()
+    values = {
+        "category": "permissions",
+        "hexa_color": "red",
+        "color": "danger",
+        "href": "kerberoastables.html",
+        "title": "Kerberoastable accounts",
+        "description": "Some accounts are vulnerable to a Kerberoasting attack.",
+        "description_reduced": "Some accounts are vulnerable.",
+        "details": "<b class='number-in-details'>42</b> kerberoastable accounts",
+        "id": "0123abcd",
+        "rgb_color": "245, 75, 75",
+        "evolution_chart_data": [12, 20, 42],
+        "evolution_labels": ["2024-01-01", "2024-06-01", "2025-01-01"],
+        "evolution_sign": "+",
+        "evolution_percent": "110.0%",
+        "evolution_color": "red",
+        "arrow_dir": "caret-up-fill",
+        "width_evolution_big": 9,
+        "width_evolution_small": 3,
+    }
+
+    def fill_cards():
+        return [card.fillTemplate(template, values) for _ in range(NUMBER_OF_CARDS)]
+
+    cards = benchmark(fill_cards)
+    assert "N/A" not in cards[0]
+
+
+def bench_main_header_template(benchmark):
+    source = (TEMPLATES_DIRECTORY / "main_header.html").read_text(encoding="utf-8")
+    values = {key: "42" for key in Template(source).keys}
+
+    content = benchmark(lambda: Template(source).render(values))
+    assert "N/A" not in content
@@ -0,0 +1,147 @@
+# Fixtures of the micro-benchmarks of the Python post-processing.
+#
+# Datasets are replayed from the cache files of previous AD Miner runs
+# (cache_neo4j/<prefix>_<request>), one prefix per size :
+#     pytest benchmarks/micro --small customer_a --huge customer_b
+# Sizes without cache prefix are skipped, except for the benchmarks of the
+# path functions which use synthetic paths instead.
+
+
+import os
+import pickle
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY_DIRECTORY = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(REPOSITORY_DIRECTORY))
+
+from ad_miner.sources.modules.node_neo4j import Node  # noqa: E402
+from ad_miner.sources.modules.path_neo4j import Path as ADPath  # noqa: E402
+
+SIZES = ["small", "medium", "huge"]
+
+# Number of synthetic paths when no cache prefix is given for a size
+SYNTHETIC_PATHS = {"small": 1000, "medium": 20000, "huge": 200000}
+
+_datasets = {}
+
+
+def pytest_addoption(parser):
+    for size in SIZES:
+        parser.addoption(
+            "--" + size,
+            default=None,
+            help=f"Cache prefix of the {size} dataset",
+        )
+    parser.addoption(
+        "--cache_dir",
+        default="cache_neo4j",
+        help="Directory of the cache files (default: ./cache_neo4j)",
+    )
+
+
+def load_dataset(config, size):
+    """Returns the requests results stored in the cache files of a prefix
+    ({request key: result}), or None if there is no prefix for this size"""
+    prefix = config.getoption(size)
+    if prefix is None:
+        return None
+    if prefix not in _datasets:
+        cache_dir = Path(config.getoption("cache_dir"))
+        files = list(cache_dir.glob(prefix + "_*"))
+        if len(files) == 0:
+            raise pytest.UsageError(f"No cache file {cache_dir / prefix}_*")
+        requests_results = {}
+        for cache_file in files:
+            with open(cache_file, "rb") as f:
+                requests_results[cache_file.name[len(prefix) + 1 :]] = pickle.load(f)
+        _datasets[prefix] = requests_results
+    return _datasets[prefix]
+
+
+@pytest.fixture(params=SIZES)
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def requests_results(request, size):
+    """Requests results of a stored dataset, copied so that benchmarks
+    can add keys to it (as compute_common_cache does)"""
+    dataset = load_dataset(request.config, size)
+    if dataset is None:
+        pytest.skip(f"No cache prefix given for the {size} dataset (--{size})")
+    return dict(dataset)
+
+
+def synthetic_paths(number, seed=0):
+    """Paths to domain admins shaped like the ones of AD Miner requests"""
+    r = random.Random(seed)
+    labels = ["User", "Group", "Computer", "OU", "GPO"]
+    relations = ["MemberOf", "AdminTo", "HasSession", "GenericAll", "Contains"]
+    targets = [
+        Node(
+            1000000 + i,
+            "Group",
+            f"DOMAIN ADMINS@DOMAIN{i}.LOCAL",
+            f"DOMAIN{i}.LOCAL",
+            None,
+            "",
+        )
+        for i in range(3)
+    ]
+    paths = []
+    for i in range(number):
+        nodes = []
+        for j in range(r.randint(1, 6)):
+            node_id = r.randint(0, number * 2)
+            label = r.choice(labels)
+            nodes.append(
+                Node(
+                    node_id,
+                    label,
+                    f"{label.upper()}{node_id}@DOMAIN0.LOCAL",
+                    "DOMAIN0.LOCAL",
+                    None,
+                    r.choice(relations),
+                )
+            )
+        target = r.choice(targets)
+        nodes.append(
+            Node(target.id, target.labels, target.name, target.domain, None, "")
+        )
+        paths.append(ADPath(nodes))
+    return paths
+
+
+@pytest.fixture
+def paths(request, size):
+    """Paths of the Graph results of a stored dataset, or synthetic paths"""
+    dataset = load_dataset(request.config, size)
+    if dataset is None:
+        return synthetic_paths(SYNTHETIC_PATHS[size])
+    return [
+        path
+        for result in dataset.values()
+        if isinstance(result, list)
+        for path in result
+        if isinstance(path, ADPath)
+    ]
+
+
+@pytest.fixture
+def render_directory(tmp_path, monkeypatch):
+    """Temporary working directory with a render folder, as controls and
+    pages write their files in render_<prefix>/"""
+    from ad_miner.__main__ import prepare_render
+    from ad_miner.sources.modules import utils
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["AD-miner", "-cf", "benchmark"])
+    arguments = utils.args()
+    arguments.extract_date = os.environ.get("AD_MINER_EXTRACT_DATE", "20250101")
+    prepare_render(arguments)
+    return arguments
@@ -0,0 +1,336 @@
+# Runs AD Miner on a (synthetic) neo4j database and records the timings
+# and memory usage into a JSON file, to compare versions of requests.json
+# and of the controls before a release.
+#
+# Full pipeline (AD Miner runs in a subprocess, requests timings come from
+# its perf.json) :
+#     python benchmarks/run_benchmark.py --size medium --load --wipe -o new.json
+# Selected requests and/or controls (in process, with per control timings) :
+#     python benchmarks/run_benchmark.py --requests set_da,dormant_accounts
+#     python benchmarks/run_benchmark.py --controls kerberoastables,anomaly_acl
+# Comparison with a previous run (exit code 1 if a regression is found) :
+#     python benchmarks/run_benchmark.py -o new.json --compare old.json
+#
+# Arguments after "--" are passed to AD Miner (e.g. -- --gpo_low --rdp)
+
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+
+try:  # Not available on Windows
+    import resource
+except ImportError:
+    resource = None
+
+from neo4j import GraphDatabase
+
+import synthetic_graph
+
+REPOSITORY_DIRECTORY = Path(__file__).parent.parent
+sys.path.insert(0, str(REPOSITORY_DIRECTORY))
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPOSITORY_DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def children_peak_rss():
+    """Peak resident memory (MB) of the terminated subprocesses"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    if sys.platform == "darwin":
+        rss = rss / 1024
+    return round(rss / 1024, 1)
+
+
+def ad_miner_arguments(arguments):
+    return [
+        "-cf",
+        arguments.cache_prefix,
+        "-b",
+        arguments.bolt,
+        "-u",
+        arguments.username,
+        "-p",
+        arguments.password,
+    ] + arguments.ad_miner_arguments
+
+
+def requests_telemetry(perf):
+    """Keeps the main figures of the requests of a perf.json"""
+    return {
+        request["key"]: {
+            "wall_time": request["wall_time"],
+            "server_time": request["server_time"],
+            "rows": request["rows"],
+            "bytes": request["bytes"],
+        }
+        for request in perf["requests"]
+    }
+
+
+def run_full_pipeline(arguments, results):
+    """Runs AD Miner as a user would, in a subprocess"""
+    environment = dict(os.environ)
+    python_path = [str(REPOSITORY_DIRECTORY)]
+    if environment.get("PYTHONPATH"):
+        python_path.append(environment["PYTHONPATH"])
+    environment["PYTHONPATH"] = os.pathsep.join(python_path)
+
+    starting_time = time.time()
+    process = subprocess.run(
+        [sys.executable, "-m", "ad_miner"] + ad_miner_arguments(arguments),
+        cwd=arguments.work_directory,
+        env=environment,
+    )
+    results["phases"]["pipeline"] = round(time.time() - starting_time, 3)
+    results["exit_code"] = process.returncode
+    results["peak_rss_mb"] = children_peak_rss()
+
+    perf_file = (
+        Path(arguments.work_directory)
+        / f"render_{arguments.cache_prefix}"
+        / "perf.json"
+    )
+    if perf_file.exists():
+        results["requests"] = requests_telemetry(
+            json.loads(perf_file.read_text(encoding="utf-8"))
+        )
+
+
+def run_selection(arguments, results):
+    """Runs the selected requests (with the write requests setting the flags
+    they rely on, and the requests with a post-processing, e.g. the check of
+    the GDS plugin) and the selected controls, in this process"""
+    os.chdir(arguments.work_directory)
+
+    from ad_miner.__main__ import prepare_render
+    from ad_miner.sources.modules import controls, utils
+    from ad_miner.sources.modules.neo4j_class import Neo4j, pre_request
+    from ad_miner.sources.modules.telemetry_class import peak_rss
+
+    sys.argv = ["AD-miner"] + ad_miner_arguments(arguments)
+    ad_miner_args = utils.args()
+    prepare_render(ad_miner_args)
+    _, extract_date, _, _, boolean_azure = pre_request(ad_miner_args)
+    ad_miner_args.boolean_azure = boolean_azure
+    if ad_miner_args.extract_date:
+        extract_date = ad_miner_args.extract_date
+    ad_miner_args.extract_date = extract_date
+    neo4j = Neo4j(ad_miner_args, extract_date, boolean_azure)
+
+    # Controls need every request, unless some requests were selected
+    selected_requests = arguments.requests
+
+    results["failed_requests"] = []
+    starting_time = time.time()
+    for request_key, request in neo4j.all_requests.items():
+        if (
+            selected_requests is None
+            or request_key in selected_requests
+            or "is_a_write_request" in request
+            or "postProcessing" in request
+        ):
+            try:
+                neo4j.process_request(neo4j, request_key)
+            except Exception:
+                traceback.print_exc()
+                results["failed_requests"].append(request_key)
+        else:
+            request["result"] = None
+    neo4j.dropGdsProjections()
+    results["phases"]["requests"] = round(time.time() - starting_time, 3)
+    results["requests"] = requests_telemetry(
+        {"requests": neo4j.telemetry.requests}
+    )
+    if selected_requests:
+        results["requests"] = {
+            key: value
+            for key, value in results["requests"].items()
+            if key in selected_requests
+        }
+
+    # Controls would run on incomplete results
+    if arguments.controls is not None and not results["failed_requests"]:
+        requests_results = {
+            key: request.get("result") for key, request in neo4j.all_requests.items()
+        }
+        starting_time = time.time()
+        neo4j.compute_common_cache(requests_results)
+        results["phases"]["common_cache"] = round(time.time() - starting_time, 3)
+
+        results["controls"] = {}
+        starting_time = time.time()
+        for control_class in controls.control_list:
+            control = control_class(ad_miner_args, requests_results)
+            if arguments.controls and control.control_key not in arguments.controls:
+                continue
+            control_start = time.time()
+            try:
+                control.run()
+                error = None
+            except Exception as e:
+                traceback.print_exc()
+                error = str(e)
+            results["controls"][control.control_key] = {
+                "wall_time": round(time.time() - control_start, 3),
+                "peak_rss_mb": peak_rss(),
+                "error": error,
+            }
+        results["phases"]["controls"] = round(time.time() - starting_time, 3)
+
+    neo4j.close()
+    results["peak_rss_mb"] = peak_rss()
+
+
+def compare(results, baseline, tolerance, minimum_time):
+    """Returns the timings of results that are slower than the baseline
+    by more than the tolerance ratio (and more than minimum_time seconds)"""
+    regressions = []
+    for section in ["phases", "requests", "controls"]:
+        for key, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(key)
+            if previous is None:
+                continue
+            if isinstance(current, dict):
+                current, previous = current["wall_time"], previous["wall_time"]
+            if current > previous * tolerance and current - previous > minimum_time:
+                regressions.append(
+                    {
+                        "section": section,
+                        "key": key,
+                        "baseline": previous,
+                        "current": current,
+                        "ratio": round(current / previous, 2) if previous else None,
+                    }
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark AD Miner on a synthetic BloodHound graph"
+    )
+    synthetic_graph.add_graph_arguments(parser)
+    synthetic_graph.add_neo4j_arguments(parser)
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Generate the synthetic graph and load it into neo4j before the run",
+    )
+    parser.add_argument(
+        "--wipe",
+        action="store_true",
+        help="Delete all the data of the neo4j database before loading the graph",
+    )
+    parser.add_argument(
+        "--requests",
+        type=lambda value: value.split(","),
+        default=None,
+        help="Comma separated requests to run (with the write requests and the requests with a post-processing)",
+    )
+    parser.add_argument(
+        "--controls",
+        type=lambda value: value.split(","),
+        default=None,
+        help="Comma separated controls to run, 'all' for every control",
+    )
+    parser.add_argument("-cf", "--cache_prefix", default="benchmark")
+    parser.add_argument(
+        "--work_directory",
+        default=".",
+        help="Directory where the render and cache folders are created",
+    )
+    parser.add_argument("-o", "--output", default="benchmark.json")
+    parser.add_argument("--compare", default=None, help="Baseline JSON results")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio reported as a regression (default: 1.25)",
+    )
+    parser.add_argument(
+        "--minimum_time",
+        type=float,
+        default=0.5,
+        help="Slowdowns of less than this number of seconds are ignored (default: 0.5)",
+    )
+    parser.add_argument("ad_miner_arguments", nargs="*", default=[])
+    arguments = parser.parse_args()
+    if arguments.controls == ["all"]:
+        arguments.controls = []
+    # The selection runs in the work directory
+    output = Path(arguments.output).resolve()
+    baseline_file = Path(arguments.compare).resolve() if arguments.compare else None
+
+    config = synthetic_graph.config_from_arguments(arguments)
+    results = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ad_miner_arguments": arguments.ad_miner_arguments,
+        "graph": None,
+        "phases": {},
+    }
+
+    if arguments.load:
+        starting_time = time.time()
+        graph = synthetic_graph.SyntheticGraph(config, arguments.seed)
+        results["phases"]["generation"] = round(time.time() - starting_time, 3)
+        results["graph"] = {"config": config, "seed": arguments.seed, **graph.counts()}
+
+        starting_time = time.time()
+        with GraphDatabase.driver(
+            arguments.bolt, auth=(arguments.username, arguments.password)
+        ) as driver:
+            synthetic_graph.load(driver, graph, wipe=arguments.wipe)
+        results["phases"]["load"] = round(time.time() - starting_time, 3)
+        graph = None
+
+    if arguments.requests is None and arguments.controls is None:
+        run_full_pipeline(arguments, results)
+    else:
+        run_selection(arguments, results)
+
+    output.write_text(json.dumps(results, indent=1), encoding="utf-8")
+    print(f"Benchmark results written in {output}")
+
+    if results.get("failed_requests"):
+        print("Failed requests : " + ", ".join(results["failed_requests"]))
+        sys.exit(1)
+
+    if baseline_file is not None:
+        baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+        regressions = compare(
+            results, baseline, arguments.tolerance, arguments.minimum_time
+        )
+        for regression in regressions:
+            print(
+                f"Regression in {regression['section']} {regression['key']} : "
+                f"{regression['baseline']}s -> {regression['current']}s"
+            )
+        if regressions:
+            sys.exit(1)
+        print("No regression found")
+
+
+if __name__ == "__main__":
+    main()
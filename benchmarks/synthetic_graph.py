@@ -0,0 +1,495 @@
+# Generates synthetic BloodHound-shaped Active Directory graphs and loads
+# them into a neo4j database, to benchmark AD Miner on reproducible data.
+#
+# The generated objects carry the properties and relations AD Miner requests
+# rely on (well-known group RIDs, lastlogon dates, ACLs, sessions, GPO links,
+# trusts, Azure tenants synced with the on-premise users, ...).
+#
+# Usage : python benchmarks/synthetic_graph.py --size medium --wipe
+
+
+import argparse
+import random
+import time
+
+from neo4j import GraphDatabase
+
+
+# Number of objects of each preset. Every parameter can be overridden
+# from the command line (e.g. --users 200000)
+PRESETS = {
+    "small": {
+        "domains": 1,
+        "trusts": 0,
+        "users": 1000,
+        "computers": 500,
+        "groups": 200,
+        "ous": 20,
+        "gpos": 10,
+        "nesting_depth": 3,
+        "acl_density": 1.0,
+        "sessions_per_computer": 1.0,
+        "azure_tenants": 0,
+        "azure_users": 0,
+    },
+    "medium": {
+        "domains": 3,
+        "trusts": 2,
+        "users": 20000,
+        "computers": 10000,
+        "groups": 3000,
+        "ous": 300,
+        "gpos": 150,
+        "nesting_depth": 5,
+        "acl_density": 2.0,
+        "sessions_per_computer": 2.0,
+        "azure_tenants": 1,
+        "azure_users": 5000,
+    },
+    "large": {
+        "domains": 8,
+        "trusts": 10,
+        "users": 200000,
+        "computers": 100000,
+        "groups": 30000,
+        "ous": 3000,
+        "gpos": 1000,
+        "nesting_depth": 8,
+        "acl_density": 3.0,
+        "sessions_per_computer": 3.0,
+        "azure_tenants": 2,
+        "azure_users": 50000,
+    },
+}
+
+# RID of the well-known groups created in every domain
+WELL_KNOWN_GROUPS = {
+    "DOMAIN ADMINS": "512",
+    "DOMAIN USERS": "513",
+    "DOMAIN COMPUTERS": "515",
+    "DOMAIN CONTROLLERS": "516",
+    "ENTERPRISE ADMINS": "519",
+    "ACCOUNT OPERATORS": "548",
+}
+
+ACL_TYPES = [
+    "GenericAll",
+    "GenericWrite",
+    "WriteDacl",
+    "WriteOwner",
+    "Owns",
+    "AllExtendedRights",
+    "ForceChangePassword",
+    "AddKeyCredentialLink",
+]
+
+OPERATING_SYSTEMS = [
+    "Windows 10 Enterprise",
+    "Windows 11 Enterprise",
+    "Windows Server 2019 Standard",
+    "Windows Server 2016 Standard",
+    "Windows Server 2012 R2 Standard",
+    "Windows Server 2008 R2 Standard",
+    "Windows 7 Professional",
+]
+
+DAY = 86400
+
+
+class SyntheticGraph:
+    """In-memory synthetic graph : nodes by labels and relations by
+    (type, start base label, end base label)"""
+
+    def __init__(self, config, seed=0, reference_date=None):
+        self.config = config
+        self.random = random.Random(seed)
+        # Dates are relative to a fixed reference so that runs are comparable
+        self.now = reference_date or 1735689600  # 2025-01-01
+        self.nodes = {}
+        self.relations = {}
+        self.generate()
+
+    def addNode(self, labels, properties):
+        self.nodes.setdefault(labels, []).append(properties)
+        return properties["objectid"]
+
+    def addRelation(
+        self, relation_type, start, end, azure=(False, False), isacl=False
+    ):
+        key = (
+            relation_type,
+            "AZBase" if azure[0] else "Base",
+            "AZBase" if azure[1] else "Base",
+        )
+        self.relations.setdefault(key, []).append((start, end, isacl))
+
+    def date(self, max_days):
+        return self.now - self.random.randint(0, max_days) * DAY
+
+    def split(self, total, domain_index):
+        """Number of objects of a domain, the first domain gets the rest"""
+        count = total // self.config["domains"]
+        if domain_index == 0:
+            count += total % self.config["domains"]
+        return count
+
+    def generate(self):
+        domains = [self.generateDomain(i) for i in range(self.config["domains"])]
+
+        # Trusts between random domains
+        if len(domains) > 1:
+            for _ in range(self.config["trusts"]):
+                trusting, trusted = self.random.sample(domains, 2)
+                self.addRelation("TrustedBy", trusted["sid"], trusting["sid"])
+
+        for i in range(self.config["azure_tenants"]):
+            self.generateTenant(i, domains)
+
+    def generateDomain(self, index):
+        r = self.random
+        name = f"DOMAIN{index}.LOCAL"
+        sid = f"S-1-5-21-{1000 + index}-{2000 + index}-{3000 + index}"
+        self.addNode(
+            ("Domain",),
+            {
+                "objectid": sid,
+                "name": name,
+                "domain": name,
+                "functionallevel": r.choice(["2012 R2", "2016"]),
+                "distinguishedname": f"DC=DOMAIN{index},DC=LOCAL",
+            },
+        )
+
+        well_known = {}
+        for group_name, rid in WELL_KNOWN_GROUPS.items():
+            well_known[rid] = self.addNode(
+                ("Group",),
+                {
+                    "objectid": f"{sid}-{rid}",
+                    "name": f"{group_name}@{name}",
+                    "domain": name,
+                    "highvalue": rid in ["512", "516", "519"],
+                    "admincount": rid in ["512", "519", "548"],
+                },
+            )
+        administrators = self.addNode(
+            ("Group",),
+            {
+                "objectid": f"{name}-S-1-5-32-544",
+                "name": f"ADMINISTRATORS@{name}",
+                "domain": name,
+                "highvalue": True,
+                "admincount": True,
+            },
+        )
+        self.addRelation("MemberOf", well_known["512"], administrators)
+        self.addRelation("MemberOf", well_known["519"], administrators)
+
+        rid = 1000
+
+        # Groups, nested on nesting_depth levels
+        groups = []
+        levels = [[] for _ in range(max(1, self.config["nesting_depth"]))]
+        for i in range(self.split(self.config["groups"], index)):
+            rid += 1
+            group = self.addNode(
+                ("Group",),
+                {
+                    "objectid": f"{sid}-{rid}",
+                    "name": f"GROUP{i}@{name}",
+                    "domain": name,
+                    "description": f"Synthetic group {i}",
+                    "whencreated": self.date(3000),
+                },
+            )
+            level = i % len(levels)
+            if level > 0 and levels[level - 1]:
+                self.addRelation("MemberOf", group, r.choice(levels[level - 1]))
+            levels[level].append(group)
+            groups.append(group)
+        # A few top level groups are administrators of the domain
+        for group in levels[0][: max(1, len(levels[0]) // 50)]:
+            self.addRelation("MemberOf", group, administrators)
+
+        # Users
+        users = []
+        for i in range(self.split(self.config["users"], index)):
+            rid += 1
+            enabled = r.random() < 0.9
+            lastlogon = self.date(900)
+            has_spn = r.random() < 0.03
+            user = self.addNode(
+                ("User",),
+                {
+                    "objectid": f"{sid}-{rid}",
+                    "name": f"USER{i}@{name}",
+                    "domain": name,
+                    "samaccountname": f"user{i}",
+                    "displayname": f"User {i}",
+                    "enabled": enabled,
+                    "lastlogon": lastlogon,
+                    "lastlogontimestamp": lastlogon,
+                    "pwdlastset": self.date(1500),
+                    "whencreated": self.date(3000),
+                    "pwdneverexpires": r.random() < 0.1,
+                    "dontreqpreauth": r.random() < 0.01,
+                    "hasspn": has_spn,
+                    "serviceprincipalnames": (
+                        [f"MSSQLSvc/srv{i}.{name.lower()}:1433"] if has_spn else []
+                    ),
+                    "admincount": False,
+                    "sensitive": False,
+                },
+            )
+            self.addRelation("MemberOf", user, well_known["513"])
+            if groups:
+                for group in r.sample(groups, min(len(groups), r.randint(1, 3))):
+                    self.addRelation("MemberOf", user, group)
+            users.append(user)
+        for user in users[:5]:
+            self.addRelation("MemberOf", user, well_known["512"])
+
+        # Computers, the first ones are domain controllers
+        computers = []
+        for i in range(self.split(self.config["computers"], index)):
+            rid += 1
+            is_dc = i < 2
+            lastlogon = self.date(400)
+            computer = self.addNode(
+                ("Computer",),
+                {
+                    "objectid": f"{sid}-{rid}",
+                    "name": f"{'DC' if is_dc else 'COMP'}{i}.{name}",
+                    "domain": name,
+                    "samaccountname": f"COMP{i}$",
+                    "enabled": r.random() < 0.95,
+                    "operatingsystem": (
+                        "Windows Server 2019 Standard"
+                        if is_dc
+                        else r.choice(OPERATING_SYSTEMS)
+                    ),
+                    "lastlogon": lastlogon,
+                    "lastlogontimestamp": lastlogon,
+                    "pwdlastset": lastlogon,
+                    "whencreated": self.date(3000),
+                    "haslaps": r.random() < 0.7,
+                    "unconstraineddelegation": is_dc or r.random() < 0.005,
+                },
+            )
+            self.addRelation(
+                "MemberOf", computer, well_known["516" if is_dc else "515"]
+            )
+            if not is_dc:
+                if groups and r.random() < 0.5:
+                    self.addRelation("AdminTo", r.choice(groups), computer)
+                if users and r.random() < 0.05:
+                    self.addRelation("AdminTo", r.choice(users), computer)
+                if groups and r.random() < 0.1:
+                    self.addRelation("CanRDP", r.choice(groups), computer)
+                # Sessions of users on the computer
+                if users:
+                    nb_sessions = int(self.config["sessions_per_computer"])
+                    if r.random() < self.config["sessions_per_computer"] % 1:
+                        nb_sessions += 1
+                    for user in r.sample(users, min(len(users), nb_sessions)):
+                        self.addRelation("HasSession", computer, user)
+            computers.append(computer)
+        self.addRelation("GetChanges", well_known["516"], sid)
+        self.addRelation("GetChangesAll", well_known["516"], sid)
+
+        # OUs contain the users and computers
+        ous = []
+        for i in range(self.split(self.config["ous"], index)):
+            ou = self.addNode(
+                ("OU",),
+                {
+                    "objectid": f"{sid}-OU-{i}",
+                    "name": f"OU{i}@{name}",
+                    "domain": name,
+                    "blocksinheritance": r.random() < 0.05,
+                    "distinguishedname": f"OU=OU{i},DC=DOMAIN{index},DC=LOCAL",
+                },
+            )
+            parent = r.choice(ous) if ous and r.random() < 0.5 else sid
+            self.addRelation("Contains", parent, ou)
+            ous.append(ou)
+        if ous:
+            for member in users + computers:
+                self.addRelation("Contains", r.choice(ous), member)
+
+        # GPOs linked to the domain and the OUs
+        for i in range(self.split(self.config["gpos"], index)):
+            gpo = self.addNode(
+                ("GPO",),
+                {
+                    "objectid": f"{sid}-GPO-{i}",
+                    "name": f"GPO{i}@{name}",
+                    "domain": name,
+                },
+            )
+            self.addRelation("GPLink", gpo, r.choice(ous) if ous else sid)
+            if users and r.random() < 0.2:
+                self.addRelation("GenericWrite", r.choice(users), gpo, isacl=True)
+
+        # ACLs between random principals and objects
+        principals = users + groups
+        targets = users + groups + computers
+        if principals and targets:
+            for _ in range(int(self.config["acl_density"] * len(targets))):
+                target = r.choice(targets)
+                if target in groups and r.random() < 0.3:
+                    relation_type = "AddMember"
+                else:
+                    relation_type = r.choice(ACL_TYPES)
+                self.addRelation(
+                    relation_type, r.choice(principals), target, isacl=True
+                )
+
+        return {"name": name, "sid": sid, "users": users}
+
+    def generateTenant(self, index, domains):
+        r = self.random
+        tenant_id = f"00000000-0000-0000-0000-{index:012d}"
+        tenant = self.addNode(
+            ("AZTenant",),
+            {"objectid": tenant_id, "name": f"TENANT{index}", "tenantid": tenant_id},
+        )
+        global_admin = self.addNode(
+            ("AZRole",),
+            {
+                "objectid": f"{tenant_id}-GA",
+                "name": f"GLOBAL ADMINISTRATOR@TENANT{index}",
+                "displayname": "Global Administrator",
+                "tenantid": tenant_id,
+            },
+        )
+        on_premise_users = [user for domain in domains for user in domain["users"]]
+        azure_users = []
+        for i in range(self.config["azure_users"] // self.config["azure_tenants"]):
+            synced = len(on_premise_users) > 0 and r.random() < 0.6
+            on_premise_sid = r.choice(on_premise_users) if synced else None
+            user = self.addNode(
+                ("AZUser",),
+                {
+                    "objectid": f"{tenant_id}-U-{i}",
+                    "name": f"AZUSER{i}@TENANT{index}.ONMICROSOFT.COM",
+                    "tenantid": tenant_id,
+                    "enabled": r.random() < 0.9,
+                    "onpremisesecurityidentifier": on_premise_sid,
+                    "onpremisesyncenabled": synced,
+                },
+            )
+            self.addRelation("AZContains", tenant, user, azure=(True, True))
+            if on_premise_sid is not None:
+                self.addRelation(
+                    "SyncedToADUser", user, on_premise_sid, azure=(True, False)
+                )
+            azure_users.append(user)
+        for user in azure_users[:3]:
+            self.addRelation("AZHasRole", user, global_admin, azure=(True, True))
+            self.addRelation("AZGlobalAdmin", user, tenant, azure=(True, True))
+
+    def counts(self):
+        return {
+            "nodes": sum(len(nodes) for nodes in self.nodes.values()),
+            "relations": sum(len(relations) for relations in self.relations.values()),
+        }
+
+
+def load(driver, graph, batch_size=10000, wipe=False):
+    """Loads the synthetic graph into neo4j. The database must be empty
+    unless wipe is set, in which case all its data is deleted first"""
+    with driver.session() as session:
+        if session.run("MATCH (n) RETURN count(n) > 0").single()[0]:
+            if not wipe:
+                raise RuntimeError(
+                    "The neo4j database is not empty, use --wipe to delete its data"
+                )
+            print("Deleting the existing data of the database")
+            deleted = batch_size
+            while deleted > 0:
+                deleted = session.run(
+                    "MATCH (n) WITH n LIMIT $limit DETACH DELETE n RETURN count(n)",
+                    limit=batch_size,
+                ).single()[0]
+
+        for label in ["Base", "AZBase"]:
+            session.run(f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.objectid)")
+        session.run("CALL db.awaitIndexes()")
+
+        for labels, nodes in graph.nodes.items():
+            base = "AZBase" if labels[0].startswith("AZ") else "Base"
+            query = f"UNWIND $rows AS row CREATE (n:{base}:{':'.join(labels)}) SET n = row"
+            for i in range(0, len(nodes), batch_size):
+                session.run(query, rows=nodes[i : i + batch_size])
+
+        for (relation_type, start_base, end_base), relations in graph.relations.items():
+            query = (
+                f"UNWIND $rows AS row MATCH (a:{start_base} {{objectid: row[0]}}) "
+                f"MATCH (b:{end_base} {{objectid: row[1]}}) "
+                f"CREATE (a)-[r:{relation_type}]->(b) SET r.isacl = row[2]"
+            )
+            for i in range(0, len(relations), batch_size):
+                session.run(query, rows=relations[i : i + batch_size])
+
+
+def config_from_arguments(arguments):
+    config = dict(PRESETS[arguments.size])
+    for key in config:
+        value = getattr(arguments, key, None)
+        if value is not None:
+            config[key] = value
+    return config
+
+
+def add_graph_arguments(parser):
+    parser.add_argument(
+        "--size",
+        choices=list(PRESETS),
+        default="small",
+        help="Preset of the number of objects (default: small)",
+    )
+    for key, value in PRESETS["small"].items():
+        parser.add_argument(
+            "--" + key,
+            type=type(value),
+            default=None,
+            help=f"Override the {key.replace('_', ' ')} of the preset",
+        )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+
+def add_neo4j_arguments(parser):
+    parser.add_argument("-b", "--bolt", default="bolt://127.0.0.1:7687")
+    parser.add_argument("-u", "--username", default="neo4j")
+    parser.add_argument("-p", "--password", default="bloodhoundcommunityedition")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic BloodHound graph and load it into neo4j"
+    )
+    add_graph_arguments(parser)
+    add_neo4j_arguments(parser)
+    parser.add_argument(
+        "--wipe",
+        action="store_true",
+        help="Delete all the data of the neo4j database before loading the graph",
+    )
+    arguments = parser.parse_args()
+
+    config = config_from_arguments(arguments)
+    starting_time = time.time()
+    graph = SyntheticGraph(config, arguments.seed)
+    print(f"Graph generated in {round(time.time() - starting_time, 2)}s : {graph.counts()}")
+
+    starting_time = time.time()
+    with GraphDatabase.driver(
+        arguments.bolt, auth=(arguments.username, arguments.password)
+    ) as driver:
+        load(driver, graph, wipe=arguments.wipe)
+    print(f"Graph loaded in {round(time.time() - starting_time, 2)}s")
+
+
+if __name__ == "__main__":
+    main()
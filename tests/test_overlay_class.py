@@ -0,0 +1,100 @@
+# Rewriting of the read requests in read-only mode (--read_only)
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ad_miner.sources.modules.overlay_class import Overlay  # noqa: E402
+
+
+def overlay():
+    overlay = Overlay()
+    overlay.declare(["is_da", "is_group_account_operator"], ["da_types"])
+    return overlay
+
+
+def test_flag_read():
+    query = "MATCH (n:User) WHERE n.is_da = TRUE RETURN n.name"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (n:User) WHERE (ID(n) IN $overlay_is_da) = TRUE RETURN n.name"
+    )
+
+
+def test_flag_is_null():
+    query = "MATCH (s) WHERE s.is_group_account_operator IS NULL RETURN s"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (s) WHERE (NOT ID(s) IN $overlay_is_group_account_operator) RETURN s"
+    )
+
+
+def test_flag_is_not_null():
+    query = "MATCH (s) WHERE s.is_group_account_operator IS NOT NULL RETURN s"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (s) WHERE (ID(s) IN $overlay_is_group_account_operator) RETURN s"
+    )
+
+
+def test_flag_in_node_pattern():
+    query = "MATCH (g:Group{is_da:false, name:'A,B'}) RETURN g"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (g:Group{name:'A,B'}) WHERE NOT ID(g) IN $overlay_is_da RETURN g"
+    )
+
+
+def test_value_read():
+    query = "MATCH (n) RETURN n.da_types AS `admin type`"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (n) RETURN $overlay_da_types[toString(ID(n))] AS `admin type`"
+    )
+
+
+def test_value_is_null():
+    query = "MATCH (n) WHERE n.da_types IS NULL RETURN n"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (n) WHERE $overlay_da_types[toString(ID(n))] IS NULL RETURN n"
+    )
+
+
+def test_strings_and_other_properties_unchanged():
+    query = "MATCH (n) WHERE n.name = 'n.is_da' AND n.is_dag RETURN n.is_da_dc"
+    assert (
+        overlay().rewrite(query)
+        == "MATCH (n) WHERE n.name = 'n.is_da' AND n.is_dag RETURN n.is_da_dc"
+    )
+
+
+def test_update_and_parameters():
+    overlay = Overlay()
+    request = {
+        "read_only_overlay": "is_operator_member",
+        "read_only_overlay_flags": ["is_account_operator"],
+        "read_only_overlay_values": ["is_type_operator", "da_types"],
+    }
+    overlay.declare(
+        ["is_operator_member", "is_account_operator"], ["is_type_operator", "da_types"]
+    )
+    overlay.update(
+        request,
+        [[1, True, "ACCOUNT OPERATOR", ["Domain Admin"]], [2, False, None, None]],
+    )
+    overlay.update(request, [[1, False, None, ["Schema Admin"]]])
+
+    query = (
+        "MATCH (o) WHERE o.is_operator_member AND o.is_account_operator "
+        "RETURN o.is_type_operator, o.da_types"
+    )
+    parameters = overlay.parameters(overlay.rewrite(query))
+    parameters["overlay_is_operator_member"].sort()
+    assert parameters == {
+        "overlay_is_operator_member": [1, 2],
+        "overlay_is_account_operator": [1],
+        "overlay_is_type_operator": {"1": "ACCOUNT OPERATOR"},
+        "overlay_da_types": {"1": ["Domain Admin", "Schema Admin"]},
+    }